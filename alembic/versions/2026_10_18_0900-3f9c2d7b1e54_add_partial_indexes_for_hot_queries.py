@@ -0,0 +1,56 @@
+"""add partial indexes for hot queries
+
+Revision ID: 3f9c2d7b1e54
+Revises: a9a2e5eab193
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2d7b1e54"
+down_revision: Union[str, Sequence[str], None] = "a9a2e5eab193"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL y SQLite soportan índices parciales con la misma cláusula WHERE
+ACTIVE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_post_created_at_id_active",
+        "post",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+    op.create_index(
+        "ix_post_user_id_created_at_active",
+        "post",
+        ["user_id", "created_at"],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+    op.create_index(
+        "ix_comment_post_id_created_at_active",
+        "comment",
+        ["post_id", sa.text("created_at DESC")],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+    op.create_index("ix_post_tag_tag_id_post_id", "post_tag", ["tag_id", "post_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_post_tag_tag_id_post_id", table_name="post_tag")
+    op.drop_index("ix_comment_post_id_created_at_active", table_name="comment")
+    op.drop_index("ix_post_user_id_created_at_active", table_name="post")
+    op.drop_index("ix_post_created_at_id_active", table_name="post")
@@ -0,0 +1,50 @@
+"""add comment_count to post and post_count to tag
+
+Revision ID: 7c1e4a9d2b60
+Revises: 3f9c2d7b1e54
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1e4a9d2b60"
+down_revision: Union[str, Sequence[str], None] = "3f9c2d7b1e54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("post", sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("tag", sa.Column("post_count", sa.Integer(), server_default="0", nullable=False))
+
+    # Rellenar los contadores con los datos existentes (sólo filas no eliminadas)
+    op.execute(
+        """
+        UPDATE post SET comment_count = (
+            SELECT count(comment.id) FROM comment
+            WHERE comment.post_id = post.id AND comment.deleted_at IS NULL
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE tag SET post_count = (
+            SELECT count(post_tag.post_id) FROM post_tag
+            JOIN post ON post.id = post_tag.post_id
+            WHERE post_tag.tag_id = tag.id AND post.deleted_at IS NULL
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tag", "post_count")
+    op.drop_column("post", "comment_count")
@@ -0,0 +1,49 @@
+"""add full-text search over post title and content
+
+Revision ID: b84e2f61c3d9
+Revises: 7c1e4a9d2b60
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b84e2f61c3d9"
+down_revision: Union[str, Sequence[str], None] = "7c1e4a9d2b60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        # Columna generada: la base de datos la mantiene al insertar o actualizar el post
+        op.execute(
+            """
+            ALTER TABLE post ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+            ) STORED
+            """
+        )
+        op.execute("CREATE INDEX ix_post_search_vector ON post USING gin (search_vector) WHERE deleted_at IS NULL")
+    else:
+        # SQLite: tabla FTS5 que mantiene el repositorio de posts (rowid = post.id)
+        op.execute(
+            "CREATE VIRTUAL TABLE post_fts USING fts5(title, content, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO post_fts (rowid, title, content) SELECT id, title, content FROM post WHERE deleted_at IS NULL"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX ix_post_search_vector")
+        op.execute("ALTER TABLE post DROP COLUMN search_vector")
+    else:
+        op.execute("DROP TABLE post_fts")
@@ -0,0 +1,48 @@
+"""add tag prefix and popularity indexes
+
+Revision ID: d2a7c5e90f14
+Revises: b84e2f61c3d9
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a7c5e90f14"
+down_revision: Union[str, Sequence[str], None] = "b84e2f61c3d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # text_pattern_ops permite usar el índice con LIKE 'prefijo%' en PostgreSQL
+    op.create_index(
+        "ix_tag_name_lower_active",
+        "tag",
+        [sa.text("lower(name) text_pattern_ops")]
+        if op.get_bind().dialect.name == "postgresql"
+        else [sa.text("lower(name)")],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+    op.create_index(
+        "ix_tag_post_count_id_active",
+        "tag",
+        [sa.text("post_count DESC"), sa.text("id DESC")],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tag_post_count_id_active", table_name="tag")
+    op.drop_index("ix_tag_name_lower_active", table_name="tag")
@@ -0,0 +1,74 @@
+"""add post_count and comment_count to user_account and per-user timeline indexes
+
+Revision ID: 5e1b9a3f7c28
+Revises: d2a7c5e90f14
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e1b9a3f7c28"
+down_revision: Union[str, Sequence[str], None] = "d2a7c5e90f14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("user_account", sa.Column("post_count", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("user_account", sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False))
+
+    # Rellenar los contadores con los datos existentes (sólo filas no eliminadas)
+    op.execute(
+        """
+        UPDATE user_account SET
+            post_count = (
+                SELECT count(post.id) FROM post
+                WHERE post.user_id = user_account.id AND post.deleted_at IS NULL
+            ),
+            comment_count = (
+                SELECT count(comment.id) FROM comment
+                WHERE comment.user_id = user_account.id AND comment.deleted_at IS NULL
+            )
+        """
+    )
+
+    # (user_id, created_at, id) permite continuar la página de un usuario desde el cursor
+    op.drop_index("ix_post_user_id_created_at_active", table_name="post")
+    op.create_index(
+        "ix_post_user_id_created_at_id_active",
+        "post",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+    op.create_index(
+        "ix_comment_user_id_created_at_id_active",
+        "comment",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comment_user_id_created_at_id_active", table_name="comment")
+    op.drop_index("ix_post_user_id_created_at_id_active", table_name="post")
+    op.create_index(
+        "ix_post_user_id_created_at_active",
+        "post",
+        ["user_id", "created_at"],
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+    op.drop_column("user_account", "comment_count")
+    op.drop_column("user_account", "post_count")
@@ -0,0 +1,68 @@
+"""add user/tag follows, follower counters and the materialized feed
+
+Revision ID: 9a4d6c2e8b15
+Revises: 5e1b9a3f7c28
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4d6c2e8b15"
+down_revision: Union[str, Sequence[str], None] = "5e1b9a3f7c28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("user_account", sa.Column("follower_count", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("tag", sa.Column("follower_count", sa.Integer(), server_default="0", nullable=False))
+
+    op.create_table(
+        "user_follow",
+        sa.Column("follower_id", sa.Integer(), sa.ForeignKey("user_account.id"), primary_key=True),
+        sa.Column("followee_id", sa.Integer(), sa.ForeignKey("user_account.id"), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "tag_follow",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user_account.id"), primary_key=True),
+        sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tag.id"), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "feed_item",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user_account.id"), primary_key=True),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("post.id"), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    # Seguidores de un usuario o una tag (fan-out al publicar) y página del feed de un lector
+    op.create_index("ix_user_follow_followee_id_follower_id", "user_follow", ["followee_id", "follower_id"])
+    op.create_index("ix_tag_follow_tag_id_user_id", "tag_follow", ["tag_id", "user_id"])
+    op.create_index(
+        "ix_feed_item_user_id_created_at_post_id",
+        "feed_item",
+        ["user_id", sa.text("created_at DESC"), sa.text("post_id DESC")],
+    )
+
+    # Cada usuario ve sus propios posts en el feed
+    op.execute("INSERT INTO feed_item (user_id, post_id, created_at) SELECT user_id, id, created_at FROM post")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_feed_item_user_id_created_at_post_id", table_name="feed_item")
+    op.drop_index("ix_tag_follow_tag_id_user_id", table_name="tag_follow")
+    op.drop_index("ix_user_follow_followee_id_follower_id", table_name="user_follow")
+    op.drop_table("feed_item")
+    op.drop_table("tag_follow")
+    op.drop_table("user_follow")
+    op.drop_column("tag", "follower_count")
+    op.drop_column("user_account", "follower_count")
@@ -0,0 +1,33 @@
+"""add updated_at indexes for the HTTP cache watermarks
+
+Revision ID: e4b7a1c9d352
+Revises: c7e1f0a4d293
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7a1c9d352"
+down_revision: Union[str, Sequence[str], None] = "c7e1f0a4d293"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("post", "comment", "tag", "user_account")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # max(updated_at) de la marca de agua se resuelve leyendo el último valor del índice.
+    # No son parciales: el borrado lógico también cambia la marca de agua
+    for table in TABLES:
+        op.create_index(f"ix_{table}_updated_at", table, ["updated_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
@@ -5,20 +5,31 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.exception_handlers import register_repository_exception_handlers
+from src.api.http_cache import cache_public_responses
 from src.api.routers.comment_router import comment_router
+from src.api.routers.events_router import events_router
+from src.api.routers.feed_router import feed_router
+from src.api.routers.metrics_router import metrics_router
 from src.api.routers.post_router import post_router
 from src.api.routers.register_login import app_security
 from src.api.routers.tag_router import tag_router
 from src.api.routers.user_router import user_router
-from src.core.database import create_db_and_tables
+from src.api.security import password_executor
+from src.core.cache import cache
+from src.core.database import create_db_and_tables, replica_router
+from src.core.jobs import job_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
     await create_db_and_tables()
+    job_queue.start()
     yield
     print("Shutting down...")
+    await job_queue.stop()
+    password_executor.shutdown()
+    await cache.close()
 
 
 app = FastAPI(
@@ -44,6 +55,9 @@ CORS_CONFIG = {
 
 app.add_middleware(CORSMiddleware, **CORS_CONFIG)
 
+# ETag / 304 y caché de cuerpos para los GET públicos
+app.middleware("http")(cache_public_responses)
+
 
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -55,8 +69,20 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def track_writes_for_read_replicas(request: Request, call_next):
+    response = await call_next(request)
+    # Tras una escritura, las lecturas de ese cliente van al primario durante un tiempo
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        replica_router.mark_write(request.headers.get("Authorization"))
+    return response
+
+
 app.include_router(user_router)
 app.include_router(post_router)
 app.include_router(comment_router)
 app.include_router(tag_router)
+app.include_router(feed_router)
+app.include_router(events_router)
 app.include_router(app_security)
+app.include_router(metrics_router)
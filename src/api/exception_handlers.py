@@ -3,6 +3,7 @@ from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
+from src.core.executor import ExecutorSaturatedException
 from src.repositories.exceptions import RepositoryAlreadyExistsException, RepositoryNotFoundException
 
 
@@ -20,6 +21,14 @@ async def repository_already_exists_handler(request: Request, exc: RepositoryAlr
     )
 
 
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedException):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 async def validation_error_handler(request: Request, exc: ValidationError):
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,6 +42,9 @@ def register_repository_exception_handlers(app):
     app.add_exception_handler(RepositoryNotFoundException, repository_not_found_handler)
     app.add_exception_handler(RepositoryAlreadyExistsException, repository_already_exists_handler)
 
+    # Errores 503 - Service Unavailable (back-pressure)
+    app.add_exception_handler(ExecutorSaturatedException, executor_saturated_handler)
+
     # Errores 400 - Bad Request (validaciones)
     for exc_type in [
         ValidationError,
@@ -0,0 +1,122 @@
+import re
+from functools import partial
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.core.database import replica_router
+from src.core.http_cache import HTTP_CACHE_MAX_AGE, response_cache
+from src.core.single_flight import SingleFlight
+from src.models.models import Comment, Post, Tag, User
+
+# Endpoints GET públicos que se cachean y los recursos de los que depende su respuesta
+CACHEABLE_ROUTES: list[tuple[re.Pattern[str], tuple[str, ...]]] = [
+    (re.compile(r"^/posts/$"), ("posts", "tags", "users", "comments")),
+    (re.compile(r"^/posts/search$"), ("posts", "tags", "users")),
+    (re.compile(r"^/posts/\d+$"), ("posts", "tags", "users", "comments")),
+    (re.compile(r"^/users/\d+/posts$"), ("posts", "tags", "users")),
+    (re.compile(r"^/users/\d+/comments$"), ("comments", "users")),
+    (re.compile(r"^/tags/$"), ("tags", "posts")),
+    (re.compile(r"^/comments/$"), ("comments", "users")),
+]
+
+WATERMARK_MODELS = {"posts": Post, "tags": Tag, "comments": Comment, "users": User}
+
+watermark_reads = SingleFlight("watermarks")
+
+
+def match_resources(path: str) -> tuple[str, ...] | None:
+    for pattern, resources in CACHEABLE_ROUTES:
+        if pattern.match(path):
+            return resources
+    return None
+
+
+async def get_watermark(session: AsyncSession, resource: str) -> Any:
+    """
+    Cambios de otros procesos en la tabla del recurso: max(updated_at) y max(id) se leen del
+    final de ix_<tabla>_updated_at y de la clave primaria, sin recorrer filas. Las escrituras de
+    este proceso ya cambian el ETag en el acto con su generación (ResponseCache.invalidate).
+    """
+    # Incluye las filas eliminadas: el borrado lógico también actualiza updated_at
+    model = WATERMARK_MODELS[resource]
+    # Un agregado por subconsulta: SQLite sólo resuelve max() con el índice si va solo
+    updated_at, max_id = (
+        await session.execute(
+            select(select(func.max(model.updated_at)).scalar_subquery(), select(func.max(model.id)).scalar_subquery())
+        )
+    ).one()
+    return (updated_at.isoformat() if updated_at else None, max_id)
+
+
+def engine_scope(engine: AsyncEngine) -> str:
+    return engine.url.render_as_string(hide_password=True)
+
+
+async def load_watermark(engine: AsyncEngine, resource: str) -> Any:
+    async with replica_router.sessionmaker(engine)() as session:
+        watermark = await get_watermark(session, resource)
+    response_cache.watermarks.set((engine_scope(engine), resource), watermark)
+    return watermark
+
+
+async def get_watermarks(engine: AsyncEngine, resources: tuple[str, ...]) -> tuple[Any, ...]:
+    """Marcas de agua de `resources` leídas de `engine`, con la generación local de cada una."""
+    scope = engine_scope(engine)
+    watermarks = {resource: response_cache.watermarks.get((scope, resource)) for resource in resources}
+    for resource, watermark in watermarks.items():
+        if watermark is None:
+            # Cuando caduca, muchas peticiones a la vez necesitan la misma marca de agua
+            watermarks[resource] = await watermark_reads.do(
+                (scope, resource), partial(load_watermark, engine, resource)
+            )
+    return tuple((watermarks[resource], response_cache.generations.get(resource, 0)) for resource in resources)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Comparación débil (RFC 9110): se ignora el prefijo W/
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+async def cache_public_responses(request: Request, call_next):
+    """
+    Middleware de ETag / If-None-Match para los GET públicos de CACHEABLE_ROUTES.
+
+    Con el ETag del cliente vigente responde 304 sin tocar el endpoint; si el cuerpo de ese ETag
+    está en memoria lo devuelve sin consultar ni serializar; si no, lo genera y lo guarda.
+    """
+    resources = match_resources(request.url.path) if request.method == "GET" else None
+    if resources is None:
+        return await call_next(request)
+
+    # El endpoint lee de la misma base de datos que las marcas de agua (get_async_read_session)
+    engine = replica_router.choose_engine(request.headers.get("Authorization"))
+    request.state.read_engine = engine
+    url = str(request.url)
+    etag = response_cache.etag(url, engine_scope(engine), await get_watermarks(engine, resources))
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}"}
+
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get_body(resources, url, etag)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    response_cache.set_body(resources, url, etag, body)
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers={**response.headers, **headers},
+        media_type=response.media_type,
+    )
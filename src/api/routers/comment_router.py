@@ -1,14 +1,15 @@
-import math
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.security import get_current_user
-from src.core.database import get_async_session
+from src.api.streaming import EXPORT_FORMATS, export_response
+from src.core.database import get_async_read_session, get_async_session
 from src.repositories.comment.repository_comment_postgres import RepositoryCommentPostgres
+from src.repositories.counting import CountMode
 from src.schemas.comment import CommentIn, CommentOut, CommentPut
-from src.schemas.pagination import PaginatedResponse
+from src.schemas.pagination import PaginatedResponse, count_pages
 from src.schemas.security import User
 from src.services.use_cases_comment import UseCasesComment
 
@@ -21,6 +22,12 @@ async def get_use_cases_comment(session: AsyncSession = Depends(get_async_sessio
     return UseCasesComment(repository=repository)
 
 
+# Igual que get_use_cases_comment pero con una sesión de solo lectura (réplica si existe)
+async def get_use_cases_comment_read(session: AsyncSession = Depends(get_async_read_session)) -> UseCasesComment:
+    repository = RepositoryCommentPostgres(session=session)
+    return UseCasesComment(repository=repository)
+
+
 @comment_router.post("/", response_model=CommentOut)
 async def create_comment(
     comment: CommentIn,
@@ -39,33 +46,49 @@ async def get_all_comments(
     post_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Items per page"),
-    use_cases_comment: UseCasesComment = Depends(get_use_cases_comment),
+    count: CountMode = Query("exact", description="How to compute total: exact, estimate or none"),
+    use_cases_comment: UseCasesComment = Depends(get_use_cases_comment_read),
 ):
     """
     Get all comments of one post
 
     - **page**: Number of page (starts at 1)
     - **size**: Number of items per page (maximum 100)
+    - **count**: `exact` (may be served from a short-lived cache), `estimate` (planner statistics) or `none`
     """
-    comments, total = await use_cases_comment.get_all_comments(post_id)
+    comments, total, count = await use_cases_comment.get_all_comments(post_id, page, size, count)
     return PaginatedResponse(
         items=comments,
         total=total,
         page=page,
         size=size,
-        pages=math.ceil(total / size) if total > 0 else 0,
+        pages=count_pages(total, size),
+        count=count,
     )
 
 
+@comment_router.get("/export")
+async def export_comments(
+    post_id: int | None = Query(None, description="Only the comments of this post"),
+    format: EXPORT_FORMATS = Query("ndjson", description="Output format"),
+    fetch_size: int = Query(1000, ge=1, le=10000, description="Rows fetched from the database per round-trip"),
+    use_cases_comment: UseCasesComment = Depends(get_use_cases_comment_read),
+):
+    """
+    Export comments as NDJSON or CSV, streamed with constant memory
+    """
+    return export_response(use_cases_comment.export_comments(post_id, fetch_size), format, "comments")
+
+
 @comment_router.get("/{id}", response_model=CommentOut)
 async def get_comment(
     id: int,
-    use_cases_comment: UseCasesComment = Depends(get_use_cases_comment),
+    use_cases_comment: UseCasesComment = Depends(get_use_cases_comment_read),
 ):
     """
     Get the comment by id
     """
-    return await use_cases_comment.get_comment(id)
+    return await use_cases_comment.get_comment_out(id)
 
 
 @comment_router.put("/{id}", response_model=CommentOut)
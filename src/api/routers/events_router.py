@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import StreamingResponse
+
+from src.api.streaming import SSE_MEDIA_TYPE, sse_comment, sse_message
+from src.core.config import env_float
+from src.core.database import get_async_session
+from src.repositories.outbox import RepositoryOutboxPostgres
+from src.schemas.events import EventPageOut
+from src.services.use_cases_events import UseCasesEvents
+
+events_router = APIRouter(prefix="/events", tags=["events"])
+
+# Máximo que puede esperar una petición de long-poll
+OUTBOX_MAX_WAIT_SECONDS = env_float("OUTBOX_MAX_WAIT_SECONDS", 30)
+
+
+# Lee del primario: una réplica con retraso haría esperar a los consumidores sin necesidad
+async def get_use_cases_events(session: AsyncSession = Depends(get_async_session)) -> UseCasesEvents:
+    return UseCasesEvents(repository=RepositoryOutboxPostgres(session=session))
+
+
+@events_router.get("", response_model=EventPageOut)
+async def get_events(
+    after: int = Query(0, ge=0, description="Return the events after this id (next_after of the previous page)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of events"),
+    wait: float = Query(
+        0, ge=0, le=OUTBOX_MAX_WAIT_SECONDS, description="Seconds to wait for new events when there are none"
+    ),
+    use_cases_events: UseCasesEvents = Depends(get_use_cases_events),
+):
+    """
+    Get the create/update/delete events of posts, comments and tags in commit order
+
+    - **after**: Start after this event id; `0` replays the whole log
+    - **wait**: Long-poll: if there are no events yet, hold the request until one arrives or the wait expires
+    """
+    return await use_cases_events.get_events(after, limit, wait)
+
+
+@events_router.get("/stream")
+async def stream_events(
+    request: Request,
+    after: int = Query(0, ge=0, description="Start after this event id"),
+    last_event_id: str | None = Header(None, description="Sent by EventSource when it reconnects"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of events read per query"),
+    use_cases_events: UseCasesEvents = Depends(get_use_cases_events),
+):
+    """
+    Stream the same events as `GET /events` with Server-Sent Events
+
+    Each message has the event id as `id`, `<entity>.<action>` as `event` and the event as JSON `data`.
+    A reconnecting client resumes after its `Last-Event-ID`.
+    """
+    if last_event_id is not None:
+        try:
+            after = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+
+    async def messages():
+        async for events in use_cases_events.stream_events(after, limit):
+            if await request.is_disconnected():
+                break
+            if not events:
+                yield sse_comment("keep-alive")
+            for event in events:
+                yield sse_message(event.id, f"{event.entity}.{event.action}", event.model_dump(mode="json"))
+
+    return StreamingResponse(
+        messages(), media_type=SSE_MEDIA_TYPE, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,40 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.routers.user_router import decode_timeline_cursor
+from src.api.security import get_current_user
+from src.core.database import get_async_read_session
+from src.repositories.feed.repository_feed_postgres import RepositoryFeedPostgres
+from src.schemas.pagination import CursorPaginatedResponse, encode_cursor
+from src.schemas.post import PostOut
+from src.schemas.security import User
+from src.services.use_cases_feed import UseCasesFeed
+
+feed_router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+# Lectura del feed con una sesión de solo lectura (réplica si existe)
+async def get_use_cases_feed_read(session: AsyncSession = Depends(get_async_read_session)) -> UseCasesFeed:
+    return UseCasesFeed(repository=RepositoryFeedPostgres(session=session))
+
+
+@feed_router.get("", response_model=CursorPaginatedResponse[PostOut])
+async def get_feed(
+    current_user: Annotated[User, Depends(get_current_user)],
+    size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    use_cases_feed: UseCasesFeed = Depends(get_use_cases_feed_read),
+):
+    """
+    Get the posts of the users and tags followed by the current user (and their own), newest first
+
+    - **cursor**: If present, the page after the cursor is returned
+    """
+    posts, has_more = await use_cases_feed.get_feed(current_user.id, size, decode_timeline_cursor(cursor))
+    return CursorPaginatedResponse[PostOut](
+        items=[PostOut.model_validate(post, from_attributes=True) for post in posts],
+        size=size,
+        next_cursor=encode_cursor(posts[-1].created_at, posts[-1].id) if has_more else None,
+    )
@@ -0,0 +1,68 @@
+from fastapi import APIRouter
+
+from src.api.http_cache import watermark_reads
+from src.api.security import password_executor, user_cache, user_versions
+from src.core.cache import cache
+from src.core.database import async_engine, get_pool_stats, replica_engines, replica_router
+from src.core.http_cache import response_cache
+from src.core.jobs import job_queue
+from src.core.single_flight import comment_reads, post_reads, tag_reads
+from src.repositories.tag.tag_name_index import tag_name_index
+
+metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@metrics_router.get("/database")
+async def get_database_metrics():
+    """
+    Get the connection pool stats of the database engine
+    """
+    return {
+        "primary": get_pool_stats(async_engine),
+        "replicas": [get_pool_stats(engine) for engine in replica_engines],
+        "routing": replica_router.stats(),
+    }
+
+
+@metrics_router.get("/caches")
+async def get_cache_metrics():
+    """
+    Get the size and hit/miss counters of the in-process caches
+    """
+    return {
+        "users": user_cache.stats(),
+        "user_versions": user_versions.stats(),
+        "http_responses": response_cache.stats(),
+        "read_models": cache.stats(),
+        "tag_names": tag_name_index.stats(),
+    }
+
+
+@metrics_router.get("/executors")
+async def get_executor_metrics():
+    """
+    Get the queue depth and rejections of the worker pools
+    """
+    return {"password_hashing": password_executor.stats()}
+
+
+@metrics_router.get("/coalescing")
+async def get_coalescing_metrics():
+    """
+    Get how many identical concurrent reads were served by a single query
+    """
+    return {
+        "posts": post_reads.stats(),
+        "comments": comment_reads.stats(),
+        "tags": tag_reads.stats(),
+        "read_models": cache.single_flight.stats(),
+        "http_watermarks": watermark_reads.stats(),
+    }
+
+
+@metrics_router.get("/jobs")
+async def get_job_metrics():
+    """
+    Get the depth and lag of the background job queue and the outcome counters of its workers
+    """
+    return {"background": {**job_queue.stats(), **await job_queue.depth()}}
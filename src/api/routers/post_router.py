@@ -1,14 +1,30 @@
-import math
-from typing import Annotated, List
+from datetime import datetime
+from typing import Annotated, List, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.security import get_current_user
-from src.core.database import get_async_session
-from src.repositories.post.repository_post_postgres import RepositoryPostPostgres
-from src.schemas.pagination import PaginatedResponse
-from src.schemas.post import PostIn, PostOut, PostPut
+from src.api.streaming import (
+    EXPORT_FORMATS,
+    NDJSON_MEDIA_TYPE,
+    DuplexStreamingResponse,
+    export_response,
+    iter_ndjson_lines,
+    ndjson_line,
+)
+from src.core.database import get_async_read_session, get_async_session
+from src.core.jobs import job_queue
+from src.repositories.counting import CountMode
+from src.repositories.post.repository_post_postgres import RepositoryPostPostgres, TagMatchMode
+from src.schemas.pagination import (
+    CursorPaginatedResponse,
+    PaginatedResponse,
+    count_pages,
+    decode_cursor,
+    encode_cursor,
+)
+from src.schemas.post import PostDetailOut, PostIn, PostOut, PostPut, PostSearchOut
 from src.schemas.security import User
 from src.services.use_cases_post import UseCasesPost
 
@@ -17,10 +33,29 @@ post_router = APIRouter(prefix="/posts", tags=["posts"])
 
 # Dependencia para obtener una instancia de UseCasesPost
 async def get_use_cases_post(session: AsyncSession = Depends(get_async_session)) -> UseCasesPost:
+    repository = RepositoryPostPostgres(session=session)
+    return UseCasesPost(repository=repository, jobs=job_queue)
+
+
+# Igual que get_use_cases_post pero con una sesión de solo lectura (réplica si existe)
+async def get_use_cases_post_read(session: AsyncSession = Depends(get_async_read_session)) -> UseCasesPost:
     repository = RepositoryPostPostgres(session=session)
     return UseCasesPost(repository=repository)
 
 
+MAX_FILTER_TAGS = 10
+
+
+def parse_tag_names(value: str | None, param: str) -> list[str]:
+    """Nombres de tags separados por comas, sin vacíos ni repetidos."""
+    names = list(dict.fromkeys(name.strip() for name in (value or "").split(",") if name.strip()))
+    if len(names) > MAX_FILTER_TAGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {MAX_FILTER_TAGS} tags allowed in {param}"
+        )
+    return names
+
+
 @post_router.post("/", response_model=PostOut)
 async def create_post(
     post: PostIn,
@@ -33,47 +68,148 @@ async def create_post(
     return await use_cases_post.create_post(post, current_user.id)
 
 
-@post_router.get("/", response_model=PaginatedResponse[PostOut])
+@post_router.post("/bulk")
+async def import_posts(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    batch_size: int = Query(100, ge=1, le=1000, description="Posts inserted per batch"),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post),
+):
+    """
+    Create posts in bulk from a NDJSON body (one post per line, same fields as `POST /posts/`)
+
+    The response is NDJSON too, with one result per input line:
+    `{"line": 1, "status": "created", "id": 42}` or `{"line": 2, "status": "error", "detail": ...}`
+    """
+    results = use_cases_post.import_posts(iter_ndjson_lines(request.stream()), current_user.id, batch_size)
+    return DuplexStreamingResponse((ndjson_line(result) async for result in results), media_type=NDJSON_MEDIA_TYPE)
+
+
+@post_router.get("/", response_model=PaginatedResponse[PostOut] | CursorPaginatedResponse[PostOut])
 async def get_all_posts(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Items per page"),
-    use_cases_post: UseCasesPost = Depends(get_use_cases_post),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    with_total: bool = Query(False, description="Include the total count when paginating by cursor"),
+    count: CountMode = Query("exact", description="How to compute total: exact, estimate or none"),
+    tags: str | None = Query(None, description="Comma-separated tag names the posts must have"),
+    mode: TagMatchMode = Query("all", description="all: posts with every tag in `tags`; any: with at least one"),
+    exclude: str | None = Query(None, description="Comma-separated tag names the posts must not have"),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post_read),
 ):
     """
     Get all posts
 
     - **page**: Number of page (starts at 1)
     - **size**: Number of items per page (maximum 100)
+    - **cursor**: If present, `page` is ignored and the page after the cursor is returned
+    - **with_total**: Only with `cursor`, also compute the total number of posts
+    - **count**: `exact` (may be served from a short-lived cache), `estimate` (planner statistics) or `none`
+    - **tags**, **mode**, **exclude**: Filter by tags, e.g. `?tags=python,fastapi&mode=all&exclude=draft`.
+      A filter without matches returns an empty page
     """
-    posts, total = await use_cases_post.get_all_posts(page=page, size=size)
-
+    tag_filter = {
+        "tags": parse_tag_names(tags, "tags"),
+        "mode": mode,
+        "exclude": parse_tag_names(exclude, "exclude"),
+    }
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, datetime, int)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        posts, total, has_more = await use_cases_post.get_all_posts_keyset(
+            size=size, after=after, with_total=with_total, **tag_filter
+        )
+        return CursorPaginatedResponse(
+            items=posts,
+            size=size,
+            next_cursor=encode_cursor(posts[-1].created_at, posts[-1].id) if has_more else None,
+            total=total,
+        )
+
+    posts, total, count = await use_cases_post.get_all_posts(page=page, size=size, count=count, **tag_filter)
+
+    # Sin total exacto, una página completa indica que puede haber más
+    has_more = page * size < total if count == "exact" else len(posts) == size
     return PaginatedResponse(
         items=posts,
         total=total,
         page=page,
         size=size,
-        pages=math.ceil(total / size) if total > 0 else 0,
+        pages=count_pages(total, size),
+        next_cursor=encode_cursor(posts[-1].created_at, posts[-1].id) if posts and has_more else None,
+        count=count,
+    )
+
+
+@post_router.get("/search", response_model=CursorPaginatedResponse[PostSearchOut])
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search in the title and content"),
+    size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post_read),
+):
+    """
+    Search posts containing all the words of `q`, most relevant first
+
+    - **q**: Words to search (title matches weigh more than content matches)
+    - **cursor**: If present, the page after the cursor is returned
+
+    Each result includes its `rank` and a `snippet` of the content with the matches wrapped in `<mark>`
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, float, int)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    posts, has_more = await use_cases_post.search_posts(q, size, after)
+    return CursorPaginatedResponse(
+        items=posts,
+        size=size,
+        next_cursor=encode_cursor(posts[-1].rank, posts[-1].id) if has_more else None,
     )
 
 
-@post_router.get("/{id}", response_model=PostOut)
+@post_router.get("/export")
+async def export_posts(
+    format: EXPORT_FORMATS = Query("ndjson", description="Output format"),
+    fetch_size: int = Query(1000, ge=1, le=10000, description="Rows fetched from the database per round-trip"),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post_read),
+):
+    """
+    Export all posts as NDJSON or CSV, streamed with constant memory
+    """
+    return export_response(use_cases_post.export_posts(fetch_size), format, "posts")
+
+
+@post_router.get("/{id}", response_model=PostDetailOut | PostOut)
 async def get_post(
     id: int,
-    use_cases_post: UseCasesPost = Depends(get_use_cases_post),
+    include: Literal["comments"] | None = Query(None, description="Embed the latest comments of the post"),
+    comments_size: int = Query(10, ge=1, le=100, description="Number of comments to embed"),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post_read),
 ):
     """
     Get the post by id
+
+    - **include**: `comments` to also return the latest `comments_size` comments with their authors
     """
-    return await use_cases_post.get_post(id)
+    if include == "comments":
+        return await use_cases_post.get_post_with_comments(id, comments_size)
+    return await use_cases_post.get_cached_post(id)
 
 
-@post_router.get("/user/{user_id}", response_model=List[PostOut])
+@post_router.get("/user/{user_id}", response_model=List[PostOut], deprecated=True)
 async def get_posts_by_user(
     user_id: int,
-    use_cases_post: UseCasesPost = Depends(get_use_cases_post),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post_read),
 ):
     """
     Get the posts by user id
+
+    Deprecated: returns every post of the user at once, use the paginated `GET /users/{id}/posts`
     """
     return await use_cases_post.get_posts_by_user(user_id)
 
@@ -81,7 +217,7 @@ async def get_posts_by_user(
 @post_router.get("/tag/{tag}", response_model=List[PostOut])
 async def get_posts_by_tag(
     tag: str,
-    use_cases_post: UseCasesPost = Depends(get_use_cases_post),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post_read),
 ):
     """
     Get the posts by tag
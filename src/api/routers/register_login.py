@@ -37,5 +37,7 @@ async def authenticate_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     access_token_expires = timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))
-    access_token = create_access_token(data={"sub": user.username}, expires_delta=access_token_expires)
+    access_token = create_access_token(
+        data={"sub": user.username, "uid": user.id, "ver": user.version}, expires_delta=access_token_expires
+    )
     return Token(access_token=access_token, token_type="bearer")
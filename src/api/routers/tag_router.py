@@ -1,13 +1,16 @@
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.security import get_current_user
-from src.core.database import get_async_session
-from src.repositories.tag.repository_tag_postgres import RepositoryTagPostgres
+from src.core.database import get_async_read_session, get_async_session
+from src.repositories.feed.repository_feed_postgres import RepositoryFeedPostgres
+from src.repositories.tag.repository_tag_postgres import RepositoryTagPostgres, TagSort
+from src.schemas.pagination import CursorPaginatedResponse, decode_cursor
 from src.schemas.security import User
-from src.schemas.tags import TagIn, TagOut
+from src.schemas.tags import TagIn, TagOut, TagSuggestionOut
+from src.services.use_cases_feed import UseCasesFeed
 from src.services.use_cases_tag import UseCasesTag
 
 tag_router = APIRouter(prefix="/tags", tags=["tags"])
@@ -19,6 +22,17 @@ async def get_use_cases_tag(session: AsyncSession = Depends(get_async_session))
     return UseCasesTag(repository=repository)
 
 
+# Igual que get_use_cases_tag pero con una sesión de solo lectura (réplica si existe)
+async def get_use_cases_tag_read(session: AsyncSession = Depends(get_async_read_session)) -> UseCasesTag:
+    repository = RepositoryTagPostgres(session=session)
+    return UseCasesTag(repository=repository)
+
+
+# Seguir y dejar de seguir una tag
+async def get_use_cases_feed(session: AsyncSession = Depends(get_async_session)) -> UseCasesFeed:
+    return UseCasesFeed(repository=RepositoryFeedPostgres(session=session))
+
+
 @tag_router.post("/", response_model=TagOut)
 async def create_tag(
     tag: TagIn,
@@ -31,20 +45,44 @@ async def create_tag(
     return await use_cases_tag.create_tag(tag, current_user.id)
 
 
-@tag_router.get("/", response_model=List[TagOut])
+@tag_router.get("/", response_model=CursorPaginatedResponse[TagOut])
 async def get_all_tags(
-    use_cases_tag: UseCasesTag = Depends(get_use_cases_tag),
+    size: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    sort: TagSort = Query("name", description="name: alphabetical; popular: most posts first"),
+    use_cases_tag: UseCasesTag = Depends(get_use_cases_tag_read),
 ):
     """
-    Get all tags
+    Get the tags, one page at a time
+
+    - **cursor**: If present, the page after the cursor is returned (use it with the same `sort`)
+    - **sort**: `name` or `popular`
     """
-    return await use_cases_tag.get_all_tags()
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, int, int) if sort == "popular" else decode_cursor(cursor, str)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return await use_cases_tag.get_all_tags(size, after, sort)
+
+
+@tag_router.get("/suggest", response_model=List[TagSuggestionOut])
+async def suggest_tags(
+    prefix: str = Query(..., min_length=1, max_length=30, description="Start of the tag name (case-insensitive)"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    use_cases_tag: UseCasesTag = Depends(get_use_cases_tag_read),
+):
+    """
+    Autocomplete tag names, in alphabetical order
+    """
+    return await use_cases_tag.suggest_tags(prefix, limit)
 
 
 @tag_router.get("/{id}", response_model=TagOut)
 async def get_tag(
     id: int,
-    use_cases_tag: UseCasesTag = Depends(get_use_cases_tag),
+    use_cases_tag: UseCasesTag = Depends(get_use_cases_tag_read),
 ):
     """
     Get the tag by id
@@ -75,3 +113,27 @@ async def delete_tag(
     Delete the tag by id if the user is the owner of the tag
     """
     await use_cases_tag.delete_tag(id, current_user.id)
+
+
+@tag_router.post("/{id}/follow")
+async def follow_tag(
+    id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    use_cases_feed: UseCasesFeed = Depends(get_use_cases_feed),
+):
+    """
+    Follow the tag: new posts with it (and the latest ones) appear in the feed of the current user
+    """
+    await use_cases_feed.follow_tag(current_user.id, id)
+
+
+@tag_router.delete("/{id}/follow")
+async def unfollow_tag(
+    id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    use_cases_feed: UseCasesFeed = Depends(get_use_cases_feed),
+):
+    """
+    Stop following the tag
+    """
+    await use_cases_feed.unfollow_tag(current_user.id, id)
@@ -1,13 +1,23 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.routers.comment_router import get_use_cases_comment_read
+from src.api.routers.post_router import get_use_cases_post_read
 from src.api.security import get_current_user
-from src.core.database import get_async_session
+from src.core.database import get_async_read_session, get_async_session
+from src.repositories.feed.repository_feed_postgres import RepositoryFeedPostgres
 from src.repositories.user.repository_user_postgres import RepositoryUserPostgres
+from src.schemas.comment import CommentOut, CommentSummaryOut
+from src.schemas.pagination import CursorPaginatedResponse, decode_cursor, encode_cursor
+from src.schemas.post import PostOut, PostSummaryOut
 from src.schemas.security import User
 from src.schemas.user import UserOut, UserPut
+from src.services.use_cases_comment import UseCasesComment
+from src.services.use_cases_feed import UseCasesFeed
+from src.services.use_cases_post import UseCasesPost
 from src.services.use_cases_user import UseCasesUser
 
 user_router = APIRouter(prefix="/users", tags=["users"])
@@ -19,10 +29,33 @@ async def get_use_cases_user(session: AsyncSession = Depends(get_async_session))
     return UseCasesUser(repository=repository)
 
 
+# Igual que get_use_cases_user pero con una sesión de solo lectura (réplica si existe)
+async def get_use_cases_user_read(session: AsyncSession = Depends(get_async_read_session)) -> UseCasesUser:
+    repository = RepositoryUserPostgres(session=session)
+    return UseCasesUser(repository=repository)
+
+
+# Seguir y dejar de seguir a un usuario
+async def get_use_cases_feed(session: AsyncSession = Depends(get_async_session)) -> UseCasesFeed:
+    return UseCasesFeed(repository=RepositoryFeedPostgres(session=session))
+
+
+TIMELINE_FIELDS = Literal["full", "summary"]
+
+
+def decode_timeline_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, datetime, int)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 @user_router.get("/{id}", response_model=UserOut)
 async def get_user(
     id: int,
-    use_cases_user: UseCasesUser = Depends(get_use_cases_user),
+    use_cases_user: UseCasesUser = Depends(get_use_cases_user_read),
 ):
     """
     Get the user by id
@@ -30,6 +63,90 @@ async def get_user(
     return await use_cases_user.get_user(id)
 
 
+@user_router.get(
+    "/{id}/posts",
+    response_model=CursorPaginatedResponse[PostOut] | CursorPaginatedResponse[PostSummaryOut],
+)
+async def get_user_posts(
+    id: int,
+    size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    fields: TIMELINE_FIELDS = Query("full", description="summary: only id, title, comment_count and dates"),
+    use_cases_post: UseCasesPost = Depends(get_use_cases_post_read),
+):
+    """
+    Get the posts of the user, newest first
+
+    - **cursor**: If present, the page after the cursor is returned
+    - **fields**: `full` posts (author and tags included) or a `summary` of each one
+    """
+    posts, total, has_more = await use_cases_post.get_user_posts(
+        id, size, decode_timeline_cursor(cursor), fields == "summary"
+    )
+    schema = PostSummaryOut if fields == "summary" else PostOut
+    return CursorPaginatedResponse[schema](
+        items=[schema.model_validate(post, from_attributes=True) for post in posts],
+        size=size,
+        next_cursor=encode_cursor(posts[-1].created_at, posts[-1].id) if has_more else None,
+        total=total,
+    )
+
+
+@user_router.get(
+    "/{id}/comments",
+    response_model=CursorPaginatedResponse[CommentOut] | CursorPaginatedResponse[CommentSummaryOut],
+)
+async def get_user_comments(
+    id: int,
+    size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    fields: TIMELINE_FIELDS = Query("full", description="summary: only id, post_id and dates"),
+    use_cases_comment: UseCasesComment = Depends(get_use_cases_comment_read),
+):
+    """
+    Get the comments of the user, newest first
+
+    - **cursor**: If present, the page after the cursor is returned
+    - **fields**: `full` comments or a `summary` of each one
+    """
+    comments, total, has_more = await use_cases_comment.get_user_comments(
+        id, size, decode_timeline_cursor(cursor), fields == "summary"
+    )
+    schema = CommentSummaryOut if fields == "summary" else CommentOut
+    return CursorPaginatedResponse[schema](
+        items=comments,
+        size=size,
+        next_cursor=encode_cursor(comments[-1].created_at, comments[-1].id) if has_more else None,
+        total=total,
+    )
+
+
+@user_router.post("/{id}/follow")
+async def follow_user(
+    id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    use_cases_feed: UseCasesFeed = Depends(get_use_cases_feed),
+):
+    """
+    Follow the user: their new posts (and the latest ones) appear in the feed of the current user
+    """
+    if id == current_user.id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Users cannot follow themselves")
+    await use_cases_feed.follow_user(current_user.id, id)
+
+
+@user_router.delete("/{id}/follow")
+async def unfollow_user(
+    id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    use_cases_feed: UseCasesFeed = Depends(get_use_cases_feed),
+):
+    """
+    Stop following the user
+    """
+    await use_cases_feed.unfollow_user(current_user.id, id)
+
+
 @user_router.put("/", response_model=UserOut)
 async def update_user(
     user: UserPut,
@@ -7,10 +7,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import env_float, env_int
 from src.core.database import get_async_session
+from src.core.executor import BoundedExecutor
+from src.core.ttl_cache import TTLCache
 from src.models.models import User
 from src.schemas.security import TokenData, UserInDB
 
@@ -20,20 +24,45 @@ if not SECRET_KEY:
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 
+# Caché del usuario autenticado, clave (sub, iat) del token
+USER_CACHE_MAXSIZE = env_int("USER_CACHE_MAXSIZE", 1024)
+USER_CACHE_TTL_SECONDS = env_float("USER_CACHE_TTL_SECONDS", 60)
+# Último usuario leído de cada id, para confiar en los claims del token. invalidate_user sólo lo
+# descarta en este proceso: en los demás un usuario modificado sigue valiendo hasta que caduca,
+# así que nunca dura más que la caché de usuarios
+USER_VERSION_TTL_SECONDS = min(env_float("USER_VERSION_TTL_SECONDS", USER_CACHE_TTL_SECONDS), USER_CACHE_TTL_SECONDS)
 
-password_hash = PasswordHash.recommended()
+user_cache: TTLCache[tuple[str, int | None], UserInDB] = TTLCache(USER_CACHE_MAXSIZE, USER_CACHE_TTL_SECONDS)
+user_versions: TTLCache[int, UserInDB] = TTLCache(USER_CACHE_MAXSIZE, USER_VERSION_TTL_SECONDS)
+
+
+# Coste de Argon2 (por defecto los valores recomendados por pwdlib)
+ARGON2_TIME_COST = env_int("ARGON2_TIME_COST", 3)
+ARGON2_MEMORY_COST = env_int("ARGON2_MEMORY_COST", 65536)  # KiB
+ARGON2_PARALLELISM = env_int("ARGON2_PARALLELISM", 4)
+
+password_hash = PasswordHash(
+    (Argon2Hasher(time_cost=ARGON2_TIME_COST, memory_cost=ARGON2_MEMORY_COST, parallelism=ARGON2_PARALLELISM),)
+)
+
+# El hash se calcula en un pool de hilos acotado para no bloquear el event loop
+password_executor = BoundedExecutor(
+    "password-hashing",
+    max_workers=env_int("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)),
+    max_queue=env_int("PASSWORD_HASH_MAX_QUEUE", 32),
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 app = APIRouter(tags=["login"])
 
 
-def verify_password(plain_password, hashed_password):
-    return password_hash.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await password_executor.run(password_hash.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password):
-    return password_hash.hash(password)
+async def get_password_hash(password):
+    return await password_executor.run(password_hash.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -42,23 +71,34 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def user_version(user: User) -> int:
+    """Versión del usuario para los claims del token: cambia con cada actualización."""
+    return int(user.updated_at.timestamp() * 1_000_000)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Descarta el usuario de la caché tras actualizarlo o eliminarlo."""
+    user_cache.delete_where(lambda key, user: user.id == user_id)
+    user_versions.delete(user_id)
+
+
 async def get_by_username(session: AsyncSession, username: str) -> Optional[UserInDB]:
-    result = await session.execute(select(User).where(User.username == username))
+    result = await session.execute(select(User).where(User.username == username, User.deleted_at.is_(None)))
     user = result.scalar()
     if not user:
         return None
-    return UserInDB(id=user.id, username=user.username, hashed_password=user.password)
+    return UserInDB(id=user.id, username=user.username, hashed_password=user.password, version=user_version(user))
 
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     session: AsyncSession = Depends(get_async_session),
-):
+) -> UserInDB:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -72,7 +112,23 @@ async def get_current_user(
         token_data = TokenData(username=username)
     except InvalidTokenError:
         raise credentials_exception
+
+    cache_key = (token_data.username, payload.get("iat"))
+    user = user_cache.get(cache_key)
+    if user is not None:
+        return user
+
+    # Si el token trae el id y la versión del usuario y coinciden con la última conocida,
+    # no hace falta consultar la base de datos
+    user_id, version = payload.get("uid"), payload.get("ver")
+    known = user_versions.get(user_id) if user_id is not None else None
+    if known is not None and version is not None and known.version == version and known.username == username:
+        user_cache.set(cache_key, known)
+        return known
+
     user = await get_by_username(session, username=token_data.username)
     if user is None:
         raise credentials_exception
+    user_cache.set(cache_key, user)
+    user_versions.set(user.id, user)
     return user
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Literal, Mapping, Sequence
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+EXPORT_FORMATS = Literal["ndjson", "csv"]
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = 1_048_576
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Separa un cuerpo NDJSON recibido en trozos en (número de línea, línea), sin cargarlo entero
+    en memoria. Las líneas vacías se ignoran. Lanza ValueError si una línea supera max_line_bytes.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+        if len(buffer) > max_line_bytes:
+            raise ValueError(f"Line {line_number + 1} exceeds {max_line_bytes} bytes")
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def ndjson_line(data: Any) -> bytes:
+    return json.dumps(data, default=_default, separators=(",", ":")).encode() + b"\n"
+
+
+def sse_message(id: int, event: str, data: Any) -> bytes:
+    """Un mensaje Server-Sent Events; el cliente reenvía `id` como Last-Event-ID al reconectar."""
+    return f"id: {id}\nevent: {event}\ndata: ".encode() + ndjson_line(data) + b"\n"
+
+
+def sse_comment(text: str) -> bytes:
+    # Las líneas que empiezan por ":" las ignora el cliente; sirven para mantener viva la conexión
+    return f": {text}\n\n".encode()
+
+
+async def ndjson_rows(partitions: AsyncIterator[Sequence[Mapping[str, Any]]]) -> AsyncIterator[bytes]:
+    """Serializa filas de la base de datos directamente a NDJSON, un bloque de bytes por partición."""
+    async for rows in partitions:
+        yield b"".join(ndjson_line(dict(row)) for row in rows)
+
+
+async def csv_rows(partitions: AsyncIterator[Sequence[Mapping[str, Any]]]) -> AsyncIterator[bytes]:
+    """Serializa filas de la base de datos directamente a CSV, con cabecera en la primera partición."""
+    buffer = io.StringIO()
+    writer = None
+    async for rows in partitions:
+        for row in rows:
+            if writer is None:
+                writer = csv.writer(buffer)
+                writer.writerow(row.keys())
+            writer.writerow(value.isoformat() if isinstance(value, datetime) else value for value in row.values())
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def export_response(partitions: AsyncIterator[Sequence[Mapping[str, Any]]], format: EXPORT_FORMATS, name: str):
+    if format == "csv":
+        content, media_type = csv_rows(partitions), CSV_MEDIA_TYPE
+    else:
+        content, media_type = ndjson_rows(partitions), NDJSON_MEDIA_TYPE
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que permite seguir leyendo el cuerpo de la petición mientras se envía la
+    respuesta. StreamingResponse escucha la desconexión del cliente consumiendo `receive`, lo que
+    se comería los trozos del cuerpo; esta variante no lo hace.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
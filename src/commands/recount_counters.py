@@ -0,0 +1,22 @@
+"""
+Recalcula Post.comment_count, Tag.post_count, User.post_count, User.comment_count y los follower_count a partir de los datos y corrige los que hayan
+derivado (ej: tras cambios hechos a mano en la base de datos).
+
+Uso: python -m src.commands.recount_counters
+"""
+
+import asyncio
+
+from src.core.database import AsyncSessionLocal, async_engine
+from src.repositories.counters import recompute_counters
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as session:
+        fixed = await recompute_counters(session)
+    await async_engine.dispose()
+    print(f"Contadores corregidos: {fixed['posts']} posts, {fixed['tags']} tags, {fixed['users']} usuarios")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,313 @@
+import asyncio
+import os
+import secrets
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Hashable, Optional, Sequence
+from urllib.parse import unquote, urlsplit
+
+from pydantic import TypeAdapter
+
+from src.core.config import env_float, env_int
+from src.core.single_flight import SingleFlight
+from src.core.ttl_cache import TTLCache
+
+# Sin CACHE_URL la caché vive en memoria de cada proceso; con redis://host:port/db se comparte
+CACHE_URL = os.getenv("CACHE_URL", "")
+CACHE_TTL_SECONDS = env_float("CACHE_TTL_SECONDS", 60)
+# Duración de las versiones de las etiquetas; nunca menor que la de las entradas (ver Cache)
+CACHE_TAG_TTL_SECONDS = env_float("CACHE_TAG_TTL_SECONDS", 2 * CACHE_TTL_SECONDS)
+CACHE_MAX_ENTRIES = env_int("CACHE_MAX_ENTRIES", 10_000)
+CACHE_REDIS_MAX_CONNECTIONS = env_int("CACHE_REDIS_MAX_CONNECTIONS", 10)
+CACHE_REDIS_TIMEOUT_SECONDS = env_float("CACHE_REDIS_TIMEOUT_SECONDS", 1)
+
+
+class CacheBackendError(Exception):
+    pass
+
+
+class CacheBackend(ABC):
+    """Almacén clave/valor de bytes con caducidad y versiones, compartido o no entre procesos."""
+
+    name: str
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[bytes]]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def new_version(self, key: str, ttl: float) -> None:
+        """Guarda en `key` durante `ttl` segundos un valor distinto de todos los anteriores."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    name = "memory"
+
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS):
+        self.values: TTLCache[str, bytes] = TTLCache(maxsize, ttl)
+        # Las versiones no entran en el LRU: expulsar una antes de tiempo volvería a mostrar las
+        # entradas guardadas sin versión. Se guardan ordenadas por caducidad.
+        self.versions: dict[str, tuple[float, bytes]] = {}
+
+    def _purge_versions(self) -> None:
+        now = time.monotonic()
+        while self.versions:
+            key, (expires_at, _) = next(iter(self.versions.items()))
+            if expires_at > now:
+                break
+            del self.versions[key]
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[bytes]]:
+        self._purge_versions()
+        values = []
+        for key in keys:
+            if key in self.versions:
+                values.append(self.versions[key][1])
+            else:
+                values.append(self.values.get(key))
+        return values
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.values.set(key, value, ttl)
+
+    async def new_version(self, key: str, ttl: float) -> None:
+        # Al final del diccionario: con un ttl constante el orden sigue siendo el de caducidad
+        self.versions.pop(key, None)
+        self.versions[key] = (time.monotonic() + ttl, version_token())
+        self._purge_versions()
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.delete(key)
+            self.versions.pop(key, None)
+
+
+def version_token() -> bytes:
+    # Aleatorio en lugar de un contador: una versión que caduca y se vuelve a crear no repite
+    # un valor con el que aún pueda haber entradas guardadas
+    return secrets.token_hex(6).encode()
+
+
+def encode_command(*args: Any) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Lee una respuesta RESP2. Los errores se devuelven (no se lanzan) para no perder la conexión."""
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by the cache server")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode()
+    if prefix == b"-":
+        return CacheBackendError(payload.decode())
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        return None if length < 0 else (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        return None if length < 0 else [await read_reply(reader) for _ in range(length)]
+    raise CacheBackendError(f"Unexpected reply from the cache server: {line!r}")
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cliente mínimo del protocolo de Redis (RESP2) sobre asyncio, con un pool pequeño de conexiones.
+    Sólo usa MGET/SET PX/DEL, así que sirve con Redis, Valkey, KeyDB o Dragonfly.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = CACHE_REDIS_MAX_CONNECTIONS,
+        timeout: float = CACHE_REDIS_TIMEOUT_SECONDS,
+    ):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = (reader, writer)
+        try:
+            if self.password:
+                await self._send(connection, "AUTH", self.password)
+            if self.db:
+                await self._send(connection, "SELECT", self.db)
+        except BaseException:
+            writer.close()
+            raise
+        return connection
+
+    async def _send(self, connection: tuple[asyncio.StreamReader, asyncio.StreamWriter], *args: Any) -> Any:
+        reader, writer = connection
+        writer.write(encode_command(*args))
+        await writer.drain()
+        reply = await read_reply(reader)
+        if isinstance(reply, CacheBackendError):
+            raise reply
+        return reply
+
+    async def execute(self, *args: Any) -> Any:
+        async with self._slots:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    connection = self._idle.pop() if self._idle else await self._connect()
+                    try:
+                        reply = await self._send(connection, *args)
+                    except CacheBackendError:
+                        self._idle.append(connection)
+                        raise
+                    except BaseException:
+                        connection[1].close()
+                        raise
+            except (OSError, asyncio.IncompleteReadError, TimeoutError) as exc:
+                raise CacheBackendError(f"Cache server unavailable: {exc}") from exc
+            self._idle.append(connection)
+            return reply
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[bytes]]:
+        return await self.execute("MGET", *keys) if keys else []
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.execute("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    async def new_version(self, key: str, ttl: float) -> None:
+        await self.set(key, version_token(), ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.execute("DEL", *keys)
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+class Cache:
+    """
+    Caché de modelos de lectura sobre un CacheBackend.
+
+    - `get_or_compute` guarda el resultado serializado con el esquema pydantic de la respuesta, y
+      las llamadas concurrentes que fallan con la misma clave sólo lo calculan una vez.
+    - Invalidación por etiquetas: cada etiqueta tiene una versión y la clave real de una entrada
+      incluye las versiones de sus etiquetas. Invalidar es cambiar la versión, y las entradas
+      antiguas dejan de encontrarse y caducan solas. Las versiones caducan tras `tag_ttl`
+      segundos sin invalidaciones; las entradas nunca duran más que eso, así que cuando una
+      versión desaparece ya no queda ninguna entrada guardada con la versión anterior.
+    - Si el backend falla, se calcula el valor sin caché; una invalidación perdida se corrige
+      como mucho en `ttl` segundos.
+    - `scope` es la base de datos de la que lee `compute`: las llamadas concurrentes sólo
+      comparten el cálculo dentro del mismo scope. Con `store=False` (lecturas de una réplica) se
+      usan las entradas guardadas pero no se guarda lo calculado: justo después de invalidar,
+      una réplica atrasada guardaría los datos antiguos con la versión nueva.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = CACHE_TTL_SECONDS,
+        namespace: str = "cache",
+        tag_ttl: float = CACHE_TAG_TTL_SECONDS,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.tag_ttl = max(tag_ttl, ttl)
+        self.namespace = namespace
+        self.single_flight = SingleFlight(namespace)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        schema: Any,
+        tags: Sequence[str] = (),
+        ttl: Optional[float] = None,
+        scope: Hashable = None,
+        store: bool = True,
+    ) -> Any:
+        adapter = type_adapter(schema)
+        ttl = min(self.ttl if ttl is None else ttl, self.tag_ttl)
+        try:
+            versions = await self.backend.get_many([self._tag_key(tag) for tag in tags])
+            versioned_key = ":".join(
+                [self.namespace, key, *(version.decode() if version else "0" for version in versions)]
+            )
+            [cached] = await self.backend.get_many([versioned_key])
+        except CacheBackendError:
+            self.errors += 1
+            return adapter.validate_python(await compute(), from_attributes=True)
+
+        if cached is not None:
+            self.hits += 1
+            return adapter.validate_json(cached)
+
+        async def compute_and_store():
+            self.misses += 1
+            value = adapter.validate_python(await compute(), from_attributes=True)
+            if not store:
+                return value
+            try:
+                await self.backend.set(versioned_key, adapter.dump_json(value), ttl)
+            except CacheBackendError:
+                self.errors += 1
+            return value
+
+        return await self.single_flight.do((scope, versioned_key), compute_and_store)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        for tag in tags:
+            try:
+                await self.backend.new_version(self._tag_key(tag), self.tag_ttl)
+            except CacheBackendError:
+                self.errors += 1
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend.name, "hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+def create_cache_backend(url: str) -> CacheBackend:
+    if url.startswith(("redis://", "valkey://")):
+        return RedisCacheBackend(url)
+    return MemoryCacheBackend()
+
+
+cache = Cache(create_cache_backend(CACHE_URL))
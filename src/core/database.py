@@ -1,8 +1,29 @@
 import os
+import time
+from typing import Any, Callable, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import QueuePool, StaticPool
 
+from src.core.config import env_bool, env_float, env_int, env_list
 from src.models.models import Base
+from src.repositories.post.post_search import create_search_index
+
+
+def to_async_url(url: str) -> str:
+    """Transforma la URL al formato correcto para asyncpg si es necesario."""
+    if url.startswith("postgresql://"):
+        # Transformar postgresql:// a postgresql+asyncpg://
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgres://"):
+        # Transformar postgres:// a postgresql+asyncpg://
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
 
 # Obtener la URL de la base de datos
 # Prioridad: ASYNC_DATABASE_URL > DATABASE_URL (transformada) > SQLite por defecto
@@ -12,21 +33,176 @@ async_database_url = os.getenv("ASYNC_DATABASE_URL")
 if not async_database_url:
     async_database_url = os.getenv("DATABASE_URL")
 
-# Transformar la URL al formato correcto para asyncpg si es necesario
 if async_database_url:
-    if async_database_url.startswith("postgresql://"):
-        # Transformar postgresql:// a postgresql+asyncpg://
-        async_database_url = async_database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    elif async_database_url.startswith("postgres://"):
-        # Transformar postgres:// a postgresql+asyncpg://
-        async_database_url = async_database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    async_database_url = to_async_url(async_database_url)
 else:
     # Fallback a SQLite para desarrollo local
     async_database_url = "sqlite+aiosqlite:///database.sqlite3"
 
 ASYNC_DATABASE_URL = async_database_url
 
-async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+# Réplicas de solo lectura, separadas por comas (opcional)
+ASYNC_DATABASE_REPLICA_URLS = [to_async_url(url) for url in env_list("ASYNC_DATABASE_REPLICA_URLS")]
+DB_REPLICA_EJECT_SECONDS = env_float("DB_REPLICA_EJECT_SECONDS", 30)
+DB_READ_YOUR_WRITES_SECONDS = env_float("DB_READ_YOUR_WRITES_SECONDS", 5)
+
+# Configuración del pool de conexiones (valores por defecto pensados para PostgreSQL)
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT = env_int("DB_POOL_TIMEOUT", 10)  # segundos esperando una conexión libre
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)  # segundos, -1 para desactivar
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+# Solo asyncpg
+DB_PREPARED_STATEMENT_CACHE_SIZE = env_int("DB_PREPARED_STATEMENT_CACHE_SIZE", 500)
+DB_STATEMENT_TIMEOUT_MS = env_int("DB_STATEMENT_TIMEOUT_MS", 30000)  # 0 para desactivar
+
+
+def get_engine_options(url: str) -> dict[str, Any]:
+    """Argumentos para create_async_engine según el dialecto de la URL."""
+    database_url = make_url(url)
+    options: dict[str, Any] = {"echo": False}
+
+    if database_url.get_backend_name() == "sqlite":
+        if database_url.database in (None, "", ":memory:"):
+            # Una única conexión compartida, si no cada conexión tendría su propia base de datos
+            options["poolclass"] = StaticPool
+            options["connect_args"] = {"check_same_thread": False}
+        else:
+            options["pool_size"] = DB_POOL_SIZE
+            options["max_overflow"] = DB_MAX_OVERFLOW
+            options["pool_timeout"] = DB_POOL_TIMEOUT
+        options["url"] = database_url
+        return options
+
+    options["pool_size"] = DB_POOL_SIZE
+    options["max_overflow"] = DB_MAX_OVERFLOW
+    options["pool_timeout"] = DB_POOL_TIMEOUT
+    options["pool_recycle"] = DB_POOL_RECYCLE
+    options["pool_pre_ping"] = DB_POOL_PRE_PING
+
+    if database_url.get_driver_name() == "asyncpg":
+        database_url = database_url.update_query_dict(
+            {"prepared_statement_cache_size": str(DB_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+        if DB_STATEMENT_TIMEOUT_MS > 0:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+
+    options["url"] = database_url
+    return options
+
+
+def configure_sqlite(engine: AsyncEngine) -> None:
+    """Activa WAL en SQLite para que las lecturas no se bloqueen con las escrituras."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+def create_engine_from_url(url: str) -> AsyncEngine:
+    engine = create_async_engine(**get_engine_options(url))
+    if engine.dialect.name == "sqlite":
+        configure_sqlite(engine)
+    return engine
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Estado actual del pool, útil para dimensionar DB_POOL_SIZE y DB_MAX_OVERFLOW."""
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "timeout": pool.timeout(),
+            }
+        )
+    return stats
+
+
+class ReplicaRouter:
+    """
+    Reparte las lecturas entre las réplicas en round-robin.
+
+    - Una réplica que falla con un error de conexión se expulsa durante `eject_seconds`.
+    - Tras una escritura, las lecturas con la misma clave (el token del cliente) van al
+      primario durante `read_your_writes_seconds`, para que el cliente vea lo que escribió.
+    - Sin réplicas sanas, las lecturas van al primario.
+    - Las sesiones de una réplica llevan `info["replica"]`: lo que leen puede ir por detrás del
+      primario y no debe guardarse en cachés compartidas.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        eject_seconds: float = 30,
+        read_your_writes_seconds: float = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.eject_seconds = eject_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.clock = clock
+        self._next = 0
+        self._ejected_until: dict[AsyncEngine, float] = {}
+        self._recent_writes: dict[str, float] = {}
+        self._sessionmakers = {
+            engine: async_sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False, info={"replica": engine is not primary}
+            )
+            for engine in [primary, *replicas]
+        }
+
+    def choose_engine(self, key: Optional[str] = None) -> AsyncEngine:
+        if not self.replicas or (key is not None and self.has_recent_write(key)):
+            return self.primary
+        now = self.clock()
+        for _ in range(len(self.replicas)):
+            engine = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if self._ejected_until.get(engine, 0) <= now:
+                return engine
+        return self.primary
+
+    def sessionmaker(self, engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return self._sessionmakers[engine]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        if engine is not self.primary:
+            self._ejected_until[engine] = self.clock() + self.eject_seconds
+
+    def mark_write(self, key: Optional[str]) -> None:
+        if key is None or not self.replicas or self.read_your_writes_seconds <= 0:
+            return
+        now = self.clock()
+        if len(self._recent_writes) > 10_000:
+            self._recent_writes = {k: until for k, until in self._recent_writes.items() if until > now}
+        self._recent_writes[key] = now + self.read_your_writes_seconds
+
+    def has_recent_write(self, key: str) -> bool:
+        until = self._recent_writes.get(key)
+        return until is not None and until > self.clock()
+
+    def stats(self) -> dict[str, Any]:
+        now = self.clock()
+        return {
+            "replicas": len(self.replicas),
+            "ejected": sum(1 for until in self._ejected_until.values() if until > now),
+            "recent_writers": sum(1 for until in self._recent_writes.values() if until > now),
+        }
+
+
+async_engine = create_engine_from_url(ASYNC_DATABASE_URL)
+replica_engines = [create_engine_from_url(url) for url in ASYNC_DATABASE_REPLICA_URLS]
 
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
@@ -34,12 +210,49 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+replica_router = ReplicaRouter(
+    async_engine,
+    replica_engines,
+    eject_seconds=DB_REPLICA_EJECT_SECONDS,
+    read_your_writes_seconds=DB_READ_YOUR_WRITES_SECONDS,
+)
+
+
+def create_missing_indexes(connection):
+    # create_all no añade los índices nuevos a tablas que ya existían (ej: database.sqlite3 local)
+    existing = set()
+    if connection.dialect.name == "sqlite":
+        # La reflexión de SQLite omite los índices sobre expresiones (ej: lower(name)), se miran por nombre
+        existing = set(connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars())
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection, checkfirst=True)
+
 
 async def create_db_and_tables():
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
+        await conn.run_sync(create_search_index)
 
 
 async def get_async_session():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_async_read_session(request: Request):
+    """
+    Sesión para endpoints de solo lectura: usa una réplica si hay alguna configurada. Si el
+    middleware de caché HTTP ya eligió la base de datos para calcular el ETag, se usa esa.
+    """
+    engine = getattr(request.state, "read_engine", None) or replica_router.choose_engine(
+        request.headers.get("Authorization")
+    )
+    async with replica_router.sessionmaker(engine)() as session:
+        try:
+            yield session
+        except (OperationalError, InterfaceError):
+            replica_router.eject(engine)
+            raise
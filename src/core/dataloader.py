@@ -0,0 +1,85 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Mapping, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Agrupa las cargas por clave pedidas en la misma vuelta del event loop en una sola llamada a
+    `batch_fn(keys) -> {key: value}` (normalmente una consulta con IN).
+
+    Cada clave se carga una vez: las siguientes peticiones reciben el mismo resultado. Las claves
+    que `batch_fn` no devuelve toman `default()` (o None).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+        default: Optional[Callable[[], V]] = None,
+        max_batch_size: int = 1000,
+    ):
+        self.batch_fn = batch_fn
+        self.default = default
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._futures: dict[K, asyncio.Future] = {}
+        self._queue: list[K] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    def load(self, key: K) -> Awaitable[V]:
+        # La clave se encola al llamar (no al esperar), así entran en el mismo lote las cargas
+        # pedidas desde corrutinas anidadas antes de que se despache
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            # Evita el aviso "exception was never retrieved" si nadie espera ya el resultado
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._futures[key] = future
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return asyncio.shield(future)
+
+    def load_many(self, keys: Iterable[K]) -> Awaitable[list[V]]:
+        return asyncio.gather(*(self.load(key) for key in keys))
+
+    def prime(self, key: K, value: V) -> None:
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self) -> None:
+        self._futures = {key: future for key, future in self._futures.items() if not future.done()}
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self.max_batch_size):
+            task = asyncio.get_running_loop().create_task(self._run(keys[start : start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: list[K]) -> None:
+        self.batches += 1
+        try:
+            values = await self.batch_fn(keys)
+        except BaseException as exc:
+            for key in keys:
+                # Sin caché de errores: una carga posterior vuelve a intentarlo
+                future = self._futures.pop(key, None)
+                if future is not None and not future.done():
+                    if isinstance(exc, Exception):
+                        future.set_exception(exc)
+                    else:
+                        future.cancel()
+            if not isinstance(exc, Exception):
+                raise
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                value = values.get(key) if key in values else (self.default() if self.default else None)
+                future.set_result(value)
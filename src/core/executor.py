@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedException(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"Executor {name} is saturated, try again later")
+
+
+class BoundedExecutor:
+    """
+    Pool de hilos para trabajo bloqueante de CPU (ej: hash de contraseñas) fuera del event loop.
+
+    Admite como mucho `max_workers + max_queue` tareas a la vez; por encima de ese límite
+    rechaza la tarea con ExecutorSaturatedException en lugar de acumular latencia. Una tarea
+    cuenta como pendiente hasta que su hilo termina, aunque quien la esperaba se haya cancelado.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturatedException(self.name)
+        with self._lock:
+            self.pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, future: Future) -> None:
+        # Se llama desde el hilo que ejecutó la tarea, o al cancelarla antes de empezar
+        with self._lock:
+            self.pending -= 1
+            if not future.cancelled():
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Any, Hashable, Optional
+
+from src.core.config import env_float, env_int
+from src.core.ttl_cache import TTLCache
+
+HTTP_CACHE_MAX_ENTRIES = env_int("HTTP_CACHE_MAX_ENTRIES", 512)
+HTTP_CACHE_TTL_SECONDS = env_float("HTTP_CACHE_TTL_SECONDS", 60)
+HTTP_CACHE_MAX_BODY_BYTES = env_int("HTTP_CACHE_MAX_BODY_BYTES", 256 * 1024)
+HTTP_CACHE_WATERMARK_TTL_SECONDS = env_float("HTTP_CACHE_WATERMARK_TTL_SECONDS", 1)
+HTTP_CACHE_MAX_AGE = env_int("HTTP_CACHE_MAX_AGE", 0)
+
+
+class ResponseCache:
+    """
+    Caché de respuestas HTTP de solo lectura.
+
+    - La marca de agua de cada recurso ("posts", "tags", ...) resume su estado en la base de datos
+      (max(updated_at), max(id), ambos leídos de un índice). Detecta las escrituras de otros
+      procesos; se guarda `watermark_ttl` segundos para no consultarla en cada petición, y las
+      escrituras de este proceso la descartan en el acto.
+    - Cada invalidación incrementa además un contador de generación local que entra en el ETag:
+      cubre las escrituras dentro del mismo segundo en SQLite, donde now() no tiene más resolución.
+    - El ETag se deriva de la URL, de la base de datos que responde (primario o réplica) y de las
+      marcas de agua que se leyeron de ella, así que un cuerpo guardado con un ETag nunca está
+      obsoleto: invalidar sólo libera memoria. Lo leído de una réplica atrasada nunca se sirve a
+      quien lee del primario tras escribir.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = HTTP_CACHE_MAX_ENTRIES,
+        ttl: float = HTTP_CACHE_TTL_SECONDS,
+        max_body_bytes: int = HTTP_CACHE_MAX_BODY_BYTES,
+        watermark_ttl: float = HTTP_CACHE_WATERMARK_TTL_SECONDS,
+    ):
+        self.max_body_bytes = max_body_bytes
+        self.bodies: TTLCache[tuple[tuple[str, ...], str, str], bytes] = TTLCache(maxsize, ttl)
+        # Por (base de datos, recurso): cada réplica puede ir por detrás del primario
+        self.watermarks: TTLCache[tuple[str, str], Hashable] = TTLCache(maxsize, watermark_ttl)
+        self.generations: dict[str, int] = {}
+        self.not_modified = 0
+
+    @staticmethod
+    def etag(url: str, scope: str, watermarks: tuple[Any, ...]) -> str:
+        digest = hashlib.blake2b(repr((url, scope, watermarks)).encode(), digest_size=12).hexdigest()
+        return f'W/"{digest}"'
+
+    def get_body(self, resources: tuple[str, ...], url: str, etag: str) -> Optional[bytes]:
+        return self.bodies.get((resources, url, etag))
+
+    def set_body(self, resources: tuple[str, ...], url: str, etag: str, body: bytes) -> None:
+        if len(body) <= self.max_body_bytes:
+            self.bodies.set((resources, url, etag), body)
+
+    def invalidate(self, *resources: str) -> None:
+        for resource in resources:
+            self.generations[resource] = self.generations.get(resource, 0) + 1
+        self.watermarks.delete_where(lambda key, watermark: key[1] in resources)
+        self.bodies.delete_where(lambda key, body: any(resource in key[0] for resource in resources))
+
+    def stats(self) -> dict[str, Any]:
+        return {**self.bodies.stats(), "not_modified": self.not_modified}
+
+
+response_cache = ResponseCache()
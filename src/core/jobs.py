@@ -0,0 +1,228 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import env_float, env_int
+from src.core.database import AsyncSessionLocal
+from src.models.models import background_job_table
+
+JOB_WORKERS = env_int("JOB_WORKERS", 2)
+JOB_MAX_ATTEMPTS = env_int("JOB_MAX_ATTEMPTS", 5)
+JOB_RETRY_BASE_SECONDS = env_float("JOB_RETRY_BASE_SECONDS", 1)
+JOB_RETRY_MAX_SECONDS = env_float("JOB_RETRY_MAX_SECONDS", 300)
+JOB_POLL_INTERVAL_SECONDS = env_float("JOB_POLL_INTERVAL_SECONDS", 1)
+JOB_LOCK_TIMEOUT_SECONDS = env_float("JOB_LOCK_TIMEOUT_SECONDS", 300)
+
+JobHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[None]]
+
+jobs = background_job_table
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay(attempts: int, base: float, maximum: float) -> float:
+    """Espera antes del siguiente intento: base, 2·base, 4·base... hasta `maximum` segundos."""
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+class JobQueue:
+    """
+    Cola de trabajos en segundo plano respaldada por la tabla background_job, para efectos de
+    una escritura que no tienen que terminar dentro de la petición (ej: fan-out del feed).
+
+    Los casos de uso llaman a enqueue() después del commit; la fila se guarda en su propia
+    transacción, así que el trabajo sobrevive a un reinicio. `workers` tareas del event loop
+    reclaman los trabajos pendientes con un UPDATE condicional (un trabajo sólo lo reclama un
+    worker, también entre procesos) y los ejecutan con el handler registrado para su nombre y
+    una sesión propia. Si el handler falla se reintenta con espera exponencial hasta
+    `max_attempts` intentos; después queda como "failed" con el último error.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        workers: int = JOB_WORKERS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_base: float = JOB_RETRY_BASE_SECONDS,
+        retry_max: float = JOB_RETRY_MAX_SECONDS,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+        lock_timeout: float = JOB_LOCK_TIMEOUT_SECONDS,
+        clock: Callable[[], datetime] = utcnow,
+    ):
+        self.sessionmaker = sessionmaker
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self.clock = clock
+        self.handlers: dict[str, JobHandler] = {}
+        self.enqueued = 0
+        self.running = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def handler(self, name: str) -> Callable[[JobHandler], JobHandler]:
+        """Decorador que registra la función que ejecuta los trabajos `name`."""
+
+        def register(fn: JobHandler) -> JobHandler:
+            self.handlers[name] = fn
+            return fn
+
+        return register
+
+    async def enqueue(self, name: str, payload: dict[str, Any]) -> int:
+        if name not in self.handlers:
+            raise ValueError(f"No handler registered for job {name}")
+        async with self.sessionmaker() as session:
+            id = await session.scalar(
+                insert(jobs)
+                .values(name=name, payload=payload, status="pending", attempts=0, run_at=self.clock())
+                .returning(jobs.c.id)
+            )
+            await session.commit()
+        self.enqueued += 1
+        self._wakeup.set()
+        return id
+
+    def start(self) -> None:
+        # El evento se crea en el event loop que ejecuta los workers
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 5) -> None:
+        """Espera a que terminen los trabajos en curso; los que no acaban a tiempo se recuperan tras lock_timeout."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except Exception as exc:
+                print(f"Background jobs: cannot claim a job ({exc!r})")
+                job = None
+            if job is None:
+                # Se despierta con enqueue() o cada poll_interval (reintentos y trabajos de otros procesos)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                continue
+            await self._run(*job)
+
+    def _claimable(self, now: datetime):
+        return or_(
+            and_(jobs.c.status == "pending", jobs.c.run_at <= now),
+            # Trabajos de un worker que se detuvo sin terminarlos
+            and_(jobs.c.status == "running", jobs.c.locked_at < now - timedelta(seconds=self.lock_timeout)),
+        )
+
+    async def _claim(self) -> Optional[tuple[int, str, dict[str, Any], int]]:
+        async with self.sessionmaker() as session:
+            now = self.clock()
+            candidates = (
+                await session.execute(
+                    select(jobs.c.id).where(self._claimable(now)).order_by(jobs.c.run_at, jobs.c.id).limit(self.workers)
+                )
+            ).scalars()
+            for id in candidates.all():
+                # Sólo uno de los workers que intenten reclamarlo a la vez encuentra la fila aún reclamable
+                claimed = (
+                    await session.execute(
+                        update(jobs)
+                        .where(jobs.c.id == id, self._claimable(now))
+                        .values(status="running", locked_at=now, attempts=jobs.c.attempts + 1)
+                        .returning(jobs.c.id, jobs.c.name, jobs.c.payload, jobs.c.attempts)
+                    )
+                ).first()
+                await session.commit()
+                if claimed is not None:
+                    return tuple(claimed)
+        return None
+
+    async def _run(self, id: int, name: str, payload: dict[str, Any], attempts: int) -> None:
+        self.running += 1
+        try:
+            handler = self.handlers.get(name)
+            if handler is None:
+                raise LookupError(f"No handler registered for job {name}")
+            async with self.sessionmaker() as session:
+                await handler(session, payload)
+        except Exception as exc:
+            await self._fail(id, attempts, repr(exc))
+        else:
+            async with self.sessionmaker() as session:
+                await session.execute(jobs.delete().where(jobs.c.id == id))
+                await session.commit()
+            self.succeeded += 1
+        finally:
+            self.running -= 1
+
+    async def _fail(self, id: int, attempts: int, error: str) -> None:
+        if attempts < self.max_attempts:
+            delay = retry_delay(attempts, self.retry_base, self.retry_max)
+            values = {"status": "pending", "run_at": self.clock() + timedelta(seconds=delay)}
+            self.retried += 1
+        else:
+            values = {"status": "failed"}
+            self.failed += 1
+        async with self.sessionmaker() as session:
+            await session.execute(
+                update(jobs).where(jobs.c.id == id).values(locked_at=None, last_error=error[:1000], **values)
+            )
+            await session.commit()
+
+    async def depth(self) -> dict[str, Any]:
+        """Trabajos pendientes, cuántos ya deberían estar ejecutándose y el retraso del más antiguo."""
+        now = self.clock()
+        async with self.sessionmaker() as session:
+            rows = (
+                await session.execute(
+                    select(jobs.c.status, func.count(), func.min(jobs.c.run_at)).group_by(jobs.c.status)
+                )
+            ).all()
+            due = await session.scalar(select(func.count()).where(jobs.c.status == "pending", jobs.c.run_at <= now))
+        by_status = {status: (count, oldest) for status, count, oldest in rows}
+        oldest = by_status.get("pending", (0, None))[1]
+        if oldest is not None and oldest.tzinfo is None:
+            # SQLite no guarda la zona horaria; las fechas de la cola siempre son UTC
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        return {
+            "pending": by_status.get("pending", (0, None))[0],
+            "due": due,
+            "running": by_status.get("running", (0, None))[0],
+            "failed": by_status.get("failed", (0, None))[0],
+            "lag_seconds": max((now - oldest).total_seconds(), 0) if oldest is not None else 0,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "in_progress": self.running,
+            "enqueued": self.enqueued,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+job_queue = JobQueue(AsyncSessionLocal)
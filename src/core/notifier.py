@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any
+
+
+class Notifier:
+    """
+    Despierta a las corrutinas que esperan un cambio (long-poll, SSE) en lugar de que consulten
+    la base de datos en bucle.
+
+    `version` cuenta las notificaciones: quien lee el estado guarda la versión antes de leer y
+    la pasa a wait(), así un cambio entre la lectura y la espera no se pierde.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._waiters: set[asyncio.Future] = set()
+
+    def notify(self) -> None:
+        self.version += 1
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait(self, timeout: float, since: int) -> bool:
+        """Espera una notificación posterior a `since` como mucho `timeout` segundos; devuelve si la hubo."""
+        if self.version != since:
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            self._waiters.discard(waiter)
+
+    def stats(self) -> dict[str, Any]:
+        return {"version": self.version, "waiting": len(self._waiters)}
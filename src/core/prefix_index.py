@@ -0,0 +1,80 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Generic, Iterable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class PrefixIndex(Generic[V]):
+    """
+    Índice en memoria para búsquedas por prefijo: claves ordenadas en un array y bisect para
+    encontrar la primera que empieza por el prefijo. Las coincidencias son contiguas, así que
+    una búsqueda cuesta O(log n + limit). Las claves se comparan en minúsculas.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, V]] = ()):
+        pairs = sorted(((key.lower(), key, value) for key, value in entries), key=lambda entry: entry[:2])
+        self._keys = [lowered for lowered, _, _ in pairs]
+        self._values = [(key, value) for _, key, value in pairs]
+
+    def search(self, prefix: str, limit: int) -> list[tuple[str, V]]:
+        prefix = prefix.lower()
+        start = bisect_left(self._keys, prefix)
+        end = min(start + limit, len(self._keys))
+        matches = []
+        for position in range(start, end):
+            if not self._keys[position].startswith(prefix):
+                break
+            matches.append(self._values[position])
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class RefreshingPrefixIndex(Generic[V]):
+    """
+    PrefixIndex que se reconstruye con `load(limit)` la primera vez que se usa tras invalidate()
+    (escrituras de este proceso) o tras `ttl` segundos (escrituras de otros procesos).
+
+    Si `load` devuelve más de `max_entries` entradas el índice no se usa (None) y las búsquedas
+    deben ir a la base de datos.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.loads = 0
+        self._index: Optional[PrefixIndex[V]] = None
+        self._version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._version += 1
+
+    def _fresh(self) -> bool:
+        return self._loaded_version == self._version and self.clock() - self._loaded_at < self.ttl
+
+    async def get(self, load: Callable[[int], Awaitable[list[tuple[str, V]]]]) -> Optional[PrefixIndex[V]]:
+        if not self._fresh():
+            async with self._lock:
+                if not self._fresh():
+                    # Una invalidación durante la carga deja el índice marcado como desactualizado
+                    version = self._version
+                    entries = await load(self.max_entries + 1)
+                    self._index = PrefixIndex(entries) if len(entries) <= self.max_entries else None
+                    self._loaded_version, self._loaded_at = version, self.clock()
+                    self.loads += 1
+        return self._index
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._index) if self._index is not None else None,
+            "max_entries": self.max_entries,
+            "fresh": self._fresh(),
+            "loads": self.loads,
+        }
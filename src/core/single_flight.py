@@ -0,0 +1,68 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Agrupa las llamadas concurrentes con la misma clave en una sola ejecución.
+
+    La primera llamada ejecuta `fn` y el resto espera su resultado (o su excepción). Si la
+    primera se cancela, la siguiente en espera vuelve a intentarlo en su lugar.
+
+    Tras una escritura hay que llamar a `forget`: quien lea después no debe unirse a una lectura
+    que empezó antes de la escritura y podría no verla.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        while (future := self._calls.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                self.coalesced -= 1
+
+        future = asyncio.get_running_loop().create_future()
+        # Evita el aviso "exception was never retrieved" cuando nadie más espera
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget(self) -> None:
+        """Las llamadas en curso siguen, pero las nuevas ya no se unen a ellas."""
+        self._calls.clear()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        return {"in_flight": len(self._calls), "calls": self.calls, "coalesced": self.coalesced}
+
+
+# Lecturas concurrentes e idénticas de la capa de servicios, agrupadas por recurso
+post_reads = SingleFlight("posts")
+comment_reads = SingleFlight("comments")
+tag_reads = SingleFlight("tags")
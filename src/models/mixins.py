@@ -7,6 +7,10 @@ from sqlalchemy.orm import Mapped, mapped_column
 class TimestampMixin:
     """Añade campos created_at y updated_at a los modelos."""
 
+    # Recupera id, created_at y updated_at con RETURNING en el mismo INSERT/UPDATE,
+    # así no hace falta refrescar la instancia después del commit
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -1,6 +1,6 @@
 from typing import List, Literal
 
-from sqlalchemy import Column, ForeignKey, String, Table
+from sqlalchemy import JSON, BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Table, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from src.models.mixins import SoftDeleteMixin, TimestampMixin
@@ -29,6 +29,11 @@ class User(TimestampMixin, SoftDeleteMixin, Base):
     posts: Mapped[List["Post"]] = relationship(back_populates="user")
     tags: Mapped[List["Tag"]] = relationship(back_populates="user")
     comments: Mapped[List["Comment"]] = relationship(back_populates="user")
+    # Posts y comentarios no eliminados del usuario, mantenidos por sus repositorios
+    post_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    comment_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    # Usuarios que le siguen, mantenido por el repositorio del feed
+    follower_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
 
     def __repr__(self) -> str:
         return f"User(id={self.id!r}, username={self.username!r}, fullname={self.fullname!r}, email={self.email!r})"
@@ -52,6 +57,8 @@ class Post(TimestampMixin, SoftDeleteMixin, Base):
     user: Mapped["User"] = relationship(back_populates="posts")
     comments: Mapped[List["Comment"]] = relationship(back_populates="post")
     tags: Mapped[List["Tag"]] = relationship(secondary="post_tag", back_populates="posts")
+    # Comentarios no eliminados, mantenido por el repositorio de comentarios
+    comment_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
 
     def __repr__(self) -> str:
         return f"Post(id={self.id!r}, title={self.title!r}, user_id={self.user_id!r})"
@@ -79,6 +86,137 @@ class Tag(TimestampMixin, SoftDeleteMixin, Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("user_account.id"), nullable=False)
     user: Mapped["User"] = relationship(back_populates="tags")
     posts: Mapped[List["Post"]] = relationship(secondary="post_tag", back_populates="tags")
+    # Posts no eliminados con esta tag, mantenido por el repositorio de posts
+    post_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    # Usuarios que siguen la tag, mantenido por el repositorio del feed
+    follower_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
 
     def __repr__(self) -> str:
         return f"Tag(id={self.id!r}, name={self.name!r})"
+
+
+# Usuarios y tags que sigue cada usuario
+user_follow_table = Table(
+    "user_follow",
+    Base.metadata,
+    Column("follower_id", ForeignKey("user_account.id"), primary_key=True),
+    Column("followee_id", ForeignKey("user_account.id"), primary_key=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+tag_follow_table = Table(
+    "tag_follow",
+    Base.metadata,
+    Column("user_id", ForeignKey("user_account.id"), primary_key=True),
+    Column("tag_id", ForeignKey("tag.id"), primary_key=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Feed materializado: una fila por (lector, post) con la fecha del post para ordenar
+feed_item_table = Table(
+    "feed_item",
+    Base.metadata,
+    Column("user_id", ForeignKey("user_account.id"), primary_key=True),
+    Column("post_id", ForeignKey("post.id"), primary_key=True),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+# Cola de trabajos en segundo plano (src/core/jobs.py). Las filas sobreviven a reinicios: un
+# trabajo "running" cuyo locked_at ha caducado se vuelve a ejecutar
+background_job_table = Table(
+    "background_job",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(100), nullable=False),
+    Column("payload", JSON, nullable=False),
+    # pending | running | failed (agotó los reintentos)
+    Column("status", String(20), nullable=False, default="pending"),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("run_at", DateTime(timezone=True), nullable=False),
+    Column("locked_at", DateTime(timezone=True), nullable=True),
+    Column("last_error", String(1000), nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Eventos de cambio de posts, comentarios y tags (src/repositories/outbox.py), escritos en la
+# misma transacción que el cambio. El id es la posición en el stream de GET /events
+outbox_table = Table(
+    "outbox",
+    Base.metadata,
+    Column("id", BigInteger().with_variant(Integer(), "sqlite"), primary_key=True, autoincrement=True),
+    # post | comment | tag
+    Column("entity", String(20), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    # created | updated | deleted | restored
+    Column("action", String(20), nullable=False),
+    Column("data", JSON, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+
+# Índices para las consultas más frecuentes. Los parciales solo incluyen filas no eliminadas,
+# que son las únicas que consultan los repositorios (deleted_at IS NULL).
+Index(
+    "ix_post_created_at_id_active",
+    Post.created_at.desc(),
+    Post.id.desc(),
+    postgresql_where=Post.deleted_at.is_(None),
+    sqlite_where=Post.deleted_at.is_(None),
+)
+Index(
+    "ix_post_user_id_created_at_id_active",
+    Post.user_id,
+    Post.created_at.desc(),
+    Post.id.desc(),
+    postgresql_where=Post.deleted_at.is_(None),
+    sqlite_where=Post.deleted_at.is_(None),
+)
+Index(
+    "ix_comment_post_id_created_at_active",
+    Comment.post_id,
+    Comment.created_at.desc(),
+    postgresql_where=Comment.deleted_at.is_(None),
+    sqlite_where=Comment.deleted_at.is_(None),
+)
+Index(
+    "ix_comment_user_id_created_at_id_active",
+    Comment.user_id,
+    Comment.created_at.desc(),
+    Comment.id.desc(),
+    postgresql_where=Comment.deleted_at.is_(None),
+    sqlite_where=Comment.deleted_at.is_(None),
+)
+# Seguidores de un usuario o una tag (fan-out al publicar) y página del feed de un lector
+Index("ix_user_follow_followee_id_follower_id", user_follow_table.c.followee_id, user_follow_table.c.follower_id)
+Index("ix_tag_follow_tag_id_user_id", tag_follow_table.c.tag_id, tag_follow_table.c.user_id)
+Index(
+    "ix_feed_item_user_id_created_at_post_id",
+    feed_item_table.c.user_id,
+    feed_item_table.c.created_at.desc(),
+    feed_item_table.c.post_id.desc(),
+)
+Index("ix_post_tag_tag_id_post_id", association_table.c.tag_id, association_table.c.post_id)
+# Búsqueda de tags por prefijo sin distinguir mayúsculas (LIKE 'prefijo%' en PostgreSQL necesita
+# text_pattern_ops) y listado de tags por popularidad
+Index(
+    "ix_tag_name_lower_active",
+    func.lower(Tag.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"},
+    postgresql_where=Tag.deleted_at.is_(None),
+    sqlite_where=Tag.deleted_at.is_(None),
+)
+Index(
+    "ix_tag_post_count_id_active",
+    Tag.post_count.desc(),
+    Tag.id.desc(),
+    postgresql_where=Tag.deleted_at.is_(None),
+    sqlite_where=Tag.deleted_at.is_(None),
+)
+# Marca de agua de la caché HTTP: max(updated_at) lee el último valor del índice. Incluyen las
+# filas eliminadas, porque el borrado lógico también cambia la marca de agua
+Index("ix_post_updated_at", Post.updated_at)
+Index("ix_comment_updated_at", Comment.updated_at)
+Index("ix_tag_updated_at", Tag.updated_at)
+Index("ix_user_account_updated_at", User.updated_at)
+# Siguiente trabajo a ejecutar y profundidad/retraso de la cola
+Index("ix_background_job_status_run_at", background_job_table.c.status, background_job_table.c.run_at)
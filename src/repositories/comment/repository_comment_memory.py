@@ -1,6 +1,7 @@
 from typing import List, Optional
 
 from src.models.models import Comment
+from src.repositories.counting import CountMode
 from src.repositories.exceptions import RepositoryAlreadyExistsException, RepositoryNotFoundException
 from src.repositories.repository_base import RepositoryBase
 from src.schemas.comment import CommentIn, CommentPut
@@ -12,8 +13,19 @@ class RepositoryCommentMemory(RepositoryBase):
         self.comments: dict[int, Comment] = comments
         self.id_counter = 0
 
-    async def get_all(self) -> Optional[List[Comment]]:
-        return list(self.comments.values())
+    async def get_all(
+        self, post_id: int, page: int, size: int, count: CountMode = "exact"
+    ) -> tuple[List[Comment], Optional[int], CountMode]:
+        comments = [
+            comment for comment in self.comments.values() if comment.deleted_at is None and comment.post_id == post_id
+        ]
+        comments.sort(key=lambda comment: comment.id, reverse=True)
+        skip = (page - 1) * size
+        page_comments = comments[skip : skip + size]
+        if not page_comments:
+            raise RepositoryNotFoundException("Not found comment")
+        # En memoria el total siempre es exacto
+        return page_comments, None if count == "none" else len(comments), "none" if count == "none" else "exact"
 
     async def get_by_id(self, id: int) -> Optional[Comment]:
         comment = self.comments.get(id)
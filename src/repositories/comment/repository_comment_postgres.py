@@ -1,10 +1,17 @@
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
-from src.models.models import Comment
+from src.core.http_cache import response_cache
+from src.models.models import Comment, User
+from src.repositories.counters import adjust_post_comment_count, adjust_user_counts
+from src.repositories.counting import CountMode, count_rows, invalidate_counts
 from src.repositories.exceptions import RepositoryNotFoundException
+from src.repositories.keyset import seek_before
+from src.repositories.outbox import record_events
 from src.repositories.repository_base import RepositoryBase
 from src.schemas.comment import CommentIn, CommentPut
 
@@ -14,13 +21,21 @@ class RepositoryCommentPostgres(RepositoryBase):
     def __init__(self, session: AsyncSession):
         super().__init__(session)
 
-    async def get_all(self, post_id: int, page: int, size: int) -> tuple[List[Comment], int]:
+    async def get_all(
+        self, post_id: int, page: int, size: int, count: CountMode = "exact"
+    ) -> tuple[List[Comment], Optional[int], CountMode]:
         skip = (page - 1) * size
         base_query = select(Comment).where(Comment.deleted_at.is_(None), Comment.post_id == post_id)
 
         # Count
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = await self.session.scalar(count_query)
+        total, count = await count_rows(
+            self.session,
+            select(Comment.id).where(Comment.deleted_at.is_(None), Comment.post_id == post_id),
+            count,
+            cache_key=("comments", post_id),
+            sqlite_index="ix_comment_post_id_created_at_active",
+            sqlite_prefix_columns=1,
+        )
 
         # Comments
         query = base_query.offset(skip).limit(size).order_by(Comment.created_at.desc())
@@ -29,7 +44,31 @@ class RepositoryCommentPostgres(RepositoryBase):
 
         if not comment:
             raise RepositoryNotFoundException("Not found comment")
-        return comment, total
+        return comment, total, count
+
+    async def get_by_user_keyset(
+        self, user_id: int, size: int, after: tuple[datetime, int] | None = None, summary: bool = False
+    ) -> tuple[List[Comment], int, bool]:
+        """
+        Comentarios de un usuario del más reciente al más antiguo, paginados por cursor sobre el
+        índice (user_id, created_at, id). El total es User.comment_count, sin COUNT.
+        Con `summary` sólo se leen las columnas del resumen.
+        Devuelve los comentarios, el total y si existen más páginas.
+        """
+        total = await self.session.scalar(
+            select(User.comment_count).where(User.id == user_id, User.deleted_at.is_(None))
+        )
+        if total is None:
+            raise RepositoryNotFoundException(entity_name="User", id=user_id)
+        query = select(Comment).where(Comment.deleted_at.is_(None), Comment.user_id == user_id)
+        if after is not None:
+            query = query.where(seek_before(self.session, Comment.created_at, Comment.id, *after))
+        if summary:
+            query = query.options(load_only(Comment.id, Comment.post_id, Comment.created_at, Comment.updated_at))
+        comments = (
+            await self.session.scalars(query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(size + 1))
+        ).all()
+        return list(comments[:size]), total, len(comments) > size
 
     async def get_by_id(self, id: int) -> Optional[Comment]:
         result = await self.session.execute(select(Comment).where(Comment.id == id, Comment.deleted_at.is_(None)))
@@ -38,11 +77,39 @@ class RepositoryCommentPostgres(RepositoryBase):
             raise RepositoryNotFoundException(entity_name="Comment", id=id)
         return comment
 
+    async def stream_all(
+        self, post_id: int | None = None, fetch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Mapping[str, Any]]]:
+        """
+        Recorre los comentarios no eliminados (de un post o de todos) con un cursor del servidor,
+        entregando particiones de `fetch_size` filas.
+        """
+        query = (
+            select(
+                Comment.id, Comment.content, Comment.user_id, Comment.post_id, Comment.created_at, Comment.updated_at
+            )
+            .where(Comment.deleted_at.is_(None))
+            .order_by(Comment.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        if post_id is not None:
+            query = query.where(Comment.post_id == post_id)
+        result = await self.session.stream(query)
+        async for partition in result.mappings().partitions():
+            yield partition
+
     async def create(self, schema: CommentIn, user_id: int, post_id: int) -> Optional[Comment]:
         comment = Comment(**schema.model_dump(), user_id=user_id, post_id=post_id)
         self.session.add(comment)
+        await adjust_post_comment_count(self.session, post_id, 1)
+        await adjust_user_counts(self.session, user_id, comments=1)
+        await self.session.flush()
+        await record_events(
+            self.session, "comment", "created", [(comment.id, {"user_id": user_id, "post_id": post_id})]
+        )
         await self.session.commit()
-        await self.session.refresh(comment)
+        response_cache.invalidate("comments")
+        invalidate_counts("comments")
         return comment
 
     async def update(self, id: int, schema: CommentPut, user_id: int) -> Optional[Comment]:
@@ -56,16 +123,33 @@ class RepositoryCommentPostgres(RepositoryBase):
         # Actualizar los atributos del comentario existente
         for key, value in update_comment_data.items():
             setattr(comment, key, value)
+        await record_events(
+            self.session,
+            "comment",
+            "updated",
+            [(comment.id, {"user_id": user_id, "post_id": comment.post_id, "fields": sorted(update_comment_data)})],
+        )
         await self.session.commit()
-        await self.session.refresh(comment)
+        response_cache.invalidate("comments")
         return comment
 
-    async def delete(self, id: int, user_id: int) -> None:
-        result = await self.session.execute(
-            select(Comment).where(Comment.id == id, Comment.deleted_at.is_(None), Comment.user_id == user_id)
+    async def delete(self, id: int, user_id: int) -> Comment:
+        # Borrado lógico condicional: de dos borrados simultáneos sólo uno encuentra la fila sin
+        # eliminar, así que los contadores y el evento se aplican una única vez
+        comment = await self.session.scalar(
+            update(Comment)
+            .where(Comment.id == id, Comment.deleted_at.is_(None), Comment.user_id == user_id)
+            .values(deleted_at=datetime.now(timezone.utc))
+            .returning(Comment)
         )
-        comment = result.unique().scalar_one_or_none()
-        if not comment:
+        if comment is None:
             raise RepositoryNotFoundException(f"Not found comment with id {id} for the user with id {user_id}")
-        comment.soft_delete()
+        await adjust_post_comment_count(self.session, comment.post_id, -1)
+        await adjust_user_counts(self.session, user_id, comments=-1)
+        await record_events(
+            self.session, "comment", "deleted", [(comment.id, {"user_id": user_id, "post_id": comment.post_id})]
+        )
         await self.session.commit()
+        response_cache.invalidate("comments")
+        invalidate_counts("comments")
+        return comment
@@ -0,0 +1,136 @@
+from collections import Counter
+from typing import Iterable, Mapping
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Comment, Post, Tag, User, association_table, tag_follow_table, user_follow_table
+
+# Contadores desnormalizados: Post.comment_count (comentarios no eliminados del post),
+# Tag.post_count (posts no eliminados con la tag) y User.post_count / User.comment_count (posts y
+# comentarios no eliminados del usuario), además de User.follower_count / Tag.follower_count
+# (seguidores, los mantiene el repositorio del feed). Se mantienen con incrementos atómicos en la
+# misma transacción que la escritura que los cambia, y recompute_counters los repara si derivan.
+# Ninguno cuenta como una modificación de la fila: los UPDATE conservan updated_at (si no, lo
+# actualizaría onupdate y, por ejemplo, cada comentario haría parecer editado a su post).
+
+tag_table = Tag.__table__
+
+
+def tag_deltas(added: Iterable[int] = (), removed: Iterable[int] = ()) -> Counter[int]:
+    deltas: Counter[int] = Counter(added)
+    deltas.subtract(removed)
+    return deltas
+
+
+async def adjust_tag_post_counts(session: AsyncSession, deltas: Mapping[int, int]) -> None:
+    """Suma `delta` al post_count de cada tag con un único UPDATE ejecutado como executemany."""
+    params = [{"tag_id": tag_id, "delta": delta} for tag_id, delta in deltas.items() if delta]
+    if params:
+        await session.execute(
+            update(tag_table)
+            .where(tag_table.c.id == bindparam("tag_id"))
+            .values(post_count=tag_table.c.post_count + bindparam("delta"), updated_at=tag_table.c.updated_at),
+            params,
+        )
+
+
+async def adjust_post_comment_count(session: AsyncSession, post_id: int, delta: int) -> None:
+    await session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comment_count=Post.comment_count + delta, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def adjust_user_counts(session: AsyncSession, user_id: int, posts: int = 0, comments: int = 0) -> None:
+    values = {}
+    if posts:
+        values["post_count"] = User.post_count + posts
+    if comments:
+        values["comment_count"] = User.comment_count + comments
+    if values:
+        values["updated_at"] = User.updated_at
+        await session.execute(
+            update(User).where(User.id == user_id).values(**values).execution_options(synchronize_session=False)
+        )
+
+
+def comment_count_subquery():
+    return (
+        select(func.count(Comment.id)).where(Comment.post_id == Post.id, Comment.deleted_at.is_(None)).scalar_subquery()
+    )
+
+
+def post_count_subquery():
+    return (
+        select(func.count(association_table.c.post_id))
+        .join(Post, Post.id == association_table.c.post_id)
+        .where(association_table.c.tag_id == Tag.id, Post.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+
+
+def user_post_count_subquery():
+    return select(func.count(Post.id)).where(Post.user_id == User.id, Post.deleted_at.is_(None)).scalar_subquery()
+
+
+def user_comment_count_subquery():
+    return (
+        select(func.count(Comment.id)).where(Comment.user_id == User.id, Comment.deleted_at.is_(None)).scalar_subquery()
+    )
+
+
+def user_follower_count_subquery():
+    return (
+        select(func.count(user_follow_table.c.follower_id))
+        .where(user_follow_table.c.followee_id == User.id)
+        .scalar_subquery()
+    )
+
+
+def tag_follower_count_subquery():
+    return select(func.count(tag_follow_table.c.user_id)).where(tag_follow_table.c.tag_id == Tag.id).scalar_subquery()
+
+
+async def recompute_counters(session: AsyncSession) -> dict[str, int]:
+    """
+    Recalcula todos los contadores en bloque (un UPDATE por tabla con subconsultas correlacionadas) y
+    devuelve cuántas filas estaban desajustadas. Sólo se reescriben esas filas.
+    """
+    comment_count = comment_count_subquery()
+    posts = await session.execute(
+        update(Post)
+        .where(Post.comment_count != comment_count)
+        .values(comment_count=comment_count, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    post_count, tag_follower_count = post_count_subquery(), tag_follower_count_subquery()
+    tags = await session.execute(
+        update(Tag)
+        .where(or_(Tag.post_count != post_count, Tag.follower_count != tag_follower_count))
+        .values(post_count=post_count, follower_count=tag_follower_count, updated_at=Tag.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    user_post_count, user_comment_count = user_post_count_subquery(), user_comment_count_subquery()
+    user_follower_count = user_follower_count_subquery()
+    users = await session.execute(
+        update(User)
+        .where(
+            or_(
+                User.post_count != user_post_count,
+                User.comment_count != user_comment_count,
+                User.follower_count != user_follower_count,
+            )
+        )
+        .values(
+            post_count=user_post_count,
+            comment_count=user_comment_count,
+            follower_count=user_follower_count,
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return {"posts": posts.rowcount, "tags": tags.rowcount, "users": users.rowcount}
@@ -0,0 +1,93 @@
+from typing import Any, Hashable, Literal, Optional
+
+from sqlalchemy import Dialect, Select, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import env_float, env_int
+from src.core.ttl_cache import TTLCache
+
+CountMode = Literal["exact", "estimate", "none"]
+
+COUNT_CACHE_MAX_ENTRIES = env_int("COUNT_CACHE_MAX_ENTRIES", 1024)
+COUNT_CACHE_TTL_SECONDS = env_float("COUNT_CACHE_TTL_SECONDS", 30)
+
+# Totales exactos ya calculados, por (recurso, filtros). Las escrituras del recurso los descartan
+count_cache: TTLCache[tuple[Hashable, ...], int] = TTLCache(COUNT_CACHE_MAX_ENTRIES, COUNT_CACHE_TTL_SECONDS)
+
+
+def invalidate_counts(resource: str) -> None:
+    count_cache.delete_where(lambda key, total: key[0] == resource)
+
+
+def driver_statement(query: Select, dialect: Dialect) -> tuple[str, Any]:
+    """
+    SQL de `query` en el formato del driver, con sus parámetros (tupla o dict según el driver),
+    para ejecutarla con exec_driver_sql. Los valores van como parámetros y no como literales en el
+    texto: text() interpretaría como parámetro cualquier ":nombre" dentro de un valor (ej: una tag).
+    """
+    compiled = query.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    if compiled.positional:
+        return str(compiled), tuple(params[name] for name in compiled.positiontup)
+    return str(compiled), params
+
+
+async def estimate_count(
+    session: AsyncSession, query: Select, sqlite_index: Optional[str], sqlite_prefix_columns: int = 0
+) -> Optional[int]:
+    """
+    Estimación del planificador, sin recorrer las filas:
+
+    - PostgreSQL: filas estimadas por EXPLAIN para `query` (a partir de reltuples y las
+      estadísticas de las columnas filtradas).
+    - SQLite: sqlite_stat1 del índice (generado por ANALYZE). Con `sqlite_prefix_columns=0` es el
+      número de filas del índice; con k, la media de filas por valor de sus k primeras columnas.
+
+    Devuelve None si no hay estadísticas (o no se indica índice en SQLite).
+    """
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        sql, params = driver_statement(query, session.bind.dialect)
+        connection = await session.connection()
+        plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params)).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+    if dialect == "sqlite" and sqlite_index is not None:
+        try:
+            stat = await session.scalar(text("SELECT stat FROM sqlite_stat1 WHERE idx = :idx"), {"idx": sqlite_index})
+        except DBAPIError:
+            # La tabla sqlite_stat1 no existe hasta el primer ANALYZE
+            return None
+        if stat is None:
+            return None
+        values = stat.split()
+        return int(values[sqlite_prefix_columns]) if len(values) > sqlite_prefix_columns else None
+    return None
+
+
+async def count_rows(
+    session: AsyncSession,
+    query: Select,
+    mode: CountMode,
+    cache_key: tuple[Hashable, ...],
+    sqlite_index: Optional[str],
+    sqlite_prefix_columns: int = 0,
+) -> tuple[Optional[int], CountMode]:
+    """
+    Total de filas de `query` según `mode`, y el modo realmente usado:
+
+    - "exact": COUNT(*), reutilizando durante COUNT_CACHE_TTL_SECONDS el último total calculado.
+    - "estimate": estimación del planificador; sin estadísticas se cuenta de forma exacta.
+    - "none": no se cuenta.
+    """
+    if mode == "none":
+        return None, "none"
+    if mode == "estimate":
+        estimate = await estimate_count(session, query, sqlite_index, sqlite_prefix_columns)
+        if estimate is not None:
+            return estimate, "estimate"
+    total = count_cache.get(cache_key)
+    if total is None:
+        total = await session.scalar(select(func.count()).select_from(query.subquery()))
+        count_cache.set(cache_key, total)
+    return total, "exact"
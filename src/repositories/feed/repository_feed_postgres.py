@@ -0,0 +1,261 @@
+from datetime import datetime
+from typing import Any, List, Sequence
+
+from sqlalchemy import and_, delete, insert, literal, or_, select, union, union_all, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import env_int
+from src.models.models import (
+    Post,
+    Tag,
+    User,
+    association_table,
+    feed_item_table,
+    tag_follow_table,
+    user_follow_table,
+)
+from src.repositories.exceptions import RepositoryNotFoundException
+from src.repositories.keyset import seek_before
+from src.repositories.loaders import load_post_relations
+from src.repositories.post.repository_post_postgres import DEFAULT_RELATIONS
+
+# Autores y tags con más seguidores que esto no se copian en los feeds al publicar (serían
+# demasiadas filas por post): sus posts se mezclan al leer el feed de cada seguidor
+FEED_FANOUT_MAX_FOLLOWERS = env_int("FEED_FANOUT_MAX_FOLLOWERS", 10_000)
+# Posts recientes que se añaden al feed al empezar a seguir a un usuario o una tag
+FEED_BACKFILL_POSTS = env_int("FEED_BACKFILL_POSTS", 20)
+
+feed = feed_item_table
+
+
+class RepositoryFeedPostgres:
+    """
+    Seguimiento de usuarios y tags y feed materializado de cada usuario.
+
+    Al publicar, el post se copia (fan-out on write) en feed_item para el autor, sus seguidores
+    y los seguidores de sus tags con un único INSERT ... SELECT. Leer el feed es un rango del
+    índice (user_id, created_at, post_id), sin importar a cuántos autores se siga. Los autores y
+    tags con más de FEED_FANOUT_MAX_FOLLOWERS seguidores no se copian: sus posts se consultan y
+    mezclan al leer (fan-out on read).
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _insert_ignoring_duplicates(self, table, columns: Sequence[str], query) -> Any:
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            return postgresql_insert(table).from_select(columns, query).on_conflict_do_nothing()
+        if dialect == "sqlite":
+            return sqlite_insert(table).from_select(columns, query).on_conflict_do_nothing()
+        return insert(table).from_select(columns, query)
+
+    async def _ensure_exists(self, model, id: int) -> None:
+        found = await self.session.scalar(select(model.id).where(model.id == id, model.deleted_at.is_(None)))
+        if found is None:
+            raise RepositoryNotFoundException(entity_name=model.__name__, id=id)
+
+    async def _backfill(self, user_id: int, posts) -> None:
+        recent = (
+            posts.where(Post.deleted_at.is_(None))
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(FEED_BACKFILL_POSTS)
+            .subquery()
+        )
+        await self.session.execute(
+            self._insert_ignoring_duplicates(
+                feed,
+                ["user_id", "post_id", "created_at"],
+                select(literal(user_id), recent.c.id, recent.c.created_at).where(recent.c.id.is_not(None)),
+            )
+        )
+
+    async def follow_user(self, follower_id: int, followee_id: int) -> None:
+        await self._ensure_exists(User, followee_id)
+        result = await self.session.execute(
+            self._insert_ignoring_duplicates(
+                user_follow_table,
+                ["follower_id", "followee_id"],
+                select(literal(follower_id), literal(followee_id)).where(literal(True)),
+            )
+        )
+        if result.rowcount:
+            await self._adjust_follower_count(User, followee_id, 1)
+            if await self._is_fanned_out(User, followee_id):
+                await self._backfill(follower_id, select(Post.id, Post.created_at).where(Post.user_id == followee_id))
+        await self.session.commit()
+
+    async def unfollow_user(self, follower_id: int, followee_id: int) -> None:
+        result = await self.session.execute(
+            delete(user_follow_table).where(
+                user_follow_table.c.follower_id == follower_id, user_follow_table.c.followee_id == followee_id
+            )
+        )
+        if result.rowcount:
+            await self._adjust_follower_count(User, followee_id, -1)
+            # Se quitan sus posts salvo los que siguen llegando por una tag seguida
+            followed_tags = select(tag_follow_table.c.tag_id).where(tag_follow_table.c.user_id == follower_id)
+            await self._remove(
+                follower_id,
+                select(Post.id).where(
+                    Post.user_id == followee_id,
+                    Post.id.not_in(
+                        select(association_table.c.post_id).where(association_table.c.tag_id.in_(followed_tags))
+                    ),
+                ),
+            )
+        await self.session.commit()
+
+    async def follow_tag(self, user_id: int, tag_id: int) -> None:
+        await self._ensure_exists(Tag, tag_id)
+        result = await self.session.execute(
+            self._insert_ignoring_duplicates(
+                tag_follow_table,
+                ["user_id", "tag_id"],
+                select(literal(user_id), literal(tag_id)).where(literal(True)),
+            )
+        )
+        if result.rowcount:
+            await self._adjust_follower_count(Tag, tag_id, 1)
+            if await self._is_fanned_out(Tag, tag_id):
+                await self._backfill(
+                    user_id,
+                    select(Post.id, Post.created_at)
+                    .join(association_table, association_table.c.post_id == Post.id)
+                    .where(association_table.c.tag_id == tag_id),
+                )
+        await self.session.commit()
+
+    async def unfollow_tag(self, user_id: int, tag_id: int) -> None:
+        result = await self.session.execute(
+            delete(tag_follow_table).where(tag_follow_table.c.user_id == user_id, tag_follow_table.c.tag_id == tag_id)
+        )
+        if result.rowcount:
+            await self._adjust_follower_count(Tag, tag_id, -1)
+            # Se quitan los posts con la tag salvo los propios, los de autores seguidos y los que
+            # tienen otra tag seguida
+            followed_users = select(user_follow_table.c.followee_id).where(user_follow_table.c.follower_id == user_id)
+            followed_tags = select(tag_follow_table.c.tag_id).where(tag_follow_table.c.user_id == user_id)
+            await self._remove(
+                user_id,
+                select(association_table.c.post_id)
+                .join(Post, Post.id == association_table.c.post_id)
+                .where(
+                    association_table.c.tag_id == tag_id,
+                    Post.user_id != user_id,
+                    Post.user_id.not_in(followed_users),
+                    Post.id.not_in(
+                        select(association_table.c.post_id).where(association_table.c.tag_id.in_(followed_tags))
+                    ),
+                ),
+            )
+        await self.session.commit()
+
+    async def _remove(self, user_id: int, post_ids) -> None:
+        await self.session.execute(delete(feed).where(feed.c.user_id == user_id, feed.c.post_id.in_(post_ids)))
+
+    async def _adjust_follower_count(self, model, id: int, delta: int) -> None:
+        # Sin tocar updated_at: seguir a alguien no modifica su perfil ni la tag
+        await self.session.execute(
+            update(model)
+            .where(model.id == id)
+            .values(follower_count=model.follower_count + delta, updated_at=model.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _is_fanned_out(self, model, id: int) -> bool:
+        follower_count = await self.session.scalar(select(model.follower_count).where(model.id == id))
+        return follower_count <= FEED_FANOUT_MAX_FOLLOWERS
+
+    async def fan_out(self, post_ids: Sequence[int]) -> None:
+        """
+        Copia los posts en el feed de su autor, de los seguidores del autor y de los seguidores de
+        sus tags, con un único INSERT ... SELECT para todo el lote. Los autores y tags con
+        demasiados seguidores se omiten (se mezclan al leer).
+        """
+        if not post_ids:
+            return
+        posts = select(Post.id, Post.user_id, Post.created_at).where(Post.id.in_(post_ids)).subquery()
+        readers = union(
+            select(posts.c.user_id, posts.c.id, posts.c.created_at).where(posts.c.id.is_not(None)),
+            select(user_follow_table.c.follower_id, posts.c.id, posts.c.created_at)
+            .join(user_follow_table, user_follow_table.c.followee_id == posts.c.user_id)
+            .join(User, User.id == posts.c.user_id)
+            .where(User.follower_count <= FEED_FANOUT_MAX_FOLLOWERS),
+            select(tag_follow_table.c.user_id, posts.c.id, posts.c.created_at)
+            .join(association_table, association_table.c.post_id == posts.c.id)
+            .join(tag_follow_table, tag_follow_table.c.tag_id == association_table.c.tag_id)
+            .join(Tag, Tag.id == association_table.c.tag_id)
+            .where(Tag.follower_count <= FEED_FANOUT_MAX_FOLLOWERS),
+        )
+        await self.session.execute(
+            self._insert_ignoring_duplicates(feed, ["user_id", "post_id", "created_at"], readers)
+        )
+        await self.session.commit()
+
+    async def get_feed(
+        self, user_id: int, size: int, after: tuple[datetime, int] | None = None
+    ) -> tuple[List[Post], bool]:
+        """
+        Página del feed del usuario, del post más reciente al más antiguo, y si existen más
+        páginas. `after` es el (created_at, id) del último post de la página anterior.
+        """
+        query = (
+            select(feed.c.post_id, feed.c.created_at)
+            .join(Post, Post.id == feed.c.post_id)
+            .where(feed.c.user_id == user_id, Post.deleted_at.is_(None))
+        )
+        if after is not None:
+            query = query.where(self._seek_feed(*after))
+        query = query.order_by(feed.c.created_at.desc(), feed.c.post_id.desc()).limit(size + 1)
+        rows = (await self.session.execute(query)).all()
+        rows += await self._get_unmaterialized(user_id, size, after)
+
+        # Un post puede llegar por las dos vías; se mezclan por (created_at, id) descendente
+        page = sorted(dict(rows).items(), key=lambda row: (row[1], row[0]), reverse=True)
+        ids = [post_id for post_id, _ in page[:size]]
+        found = (await self.session.scalars(select(Post).where(Post.id.in_(ids)))).all() if ids else []
+        posts_by_id = {post.id: post for post in found}
+        posts = [posts_by_id[id] for id in ids]
+        await load_post_relations(self.session, posts, DEFAULT_RELATIONS)
+        return posts, len(page) > size
+
+    def _seek_feed(self, created_at: datetime, post_id: int):
+        # Como seek_before, pero la fila ancla se busca en post: el último post de la página
+        # anterior puede no estar en feed_item (autores o tags sin fan-out)
+        if self.session.bind.dialect.name == "sqlite":
+            created_at = select(Post.created_at).where(Post.id == post_id).scalar_subquery()
+        return or_(feed.c.created_at < created_at, and_(feed.c.created_at == created_at, feed.c.post_id < post_id))
+
+    async def _get_unmaterialized(
+        self, user_id: int, size: int, after: tuple[datetime, int] | None
+    ) -> list[tuple[int, datetime]]:
+        """Posts de los autores y tags seguidos que no se copian en los feeds (demasiados seguidores)."""
+        heavy = (
+            await self.session.execute(
+                union_all(
+                    select(literal("user"), user_follow_table.c.followee_id)
+                    .join(User, User.id == user_follow_table.c.followee_id)
+                    .where(user_follow_table.c.follower_id == user_id, User.follower_count > FEED_FANOUT_MAX_FOLLOWERS),
+                    select(literal("tag"), tag_follow_table.c.tag_id)
+                    .join(Tag, Tag.id == tag_follow_table.c.tag_id)
+                    .where(tag_follow_table.c.user_id == user_id, Tag.follower_count > FEED_FANOUT_MAX_FOLLOWERS),
+                )
+            )
+        ).all()
+        if not heavy:
+            return []
+        authors = [id for kind, id in heavy if kind == "user"]
+        tags = [id for kind, id in heavy if kind == "tag"]
+        sources = []
+        if authors:
+            sources.append(Post.user_id.in_(authors))
+        if tags:
+            sources.append(Post.id.in_(select(association_table.c.post_id).where(association_table.c.tag_id.in_(tags))))
+        query = select(Post.id, Post.created_at).where(Post.deleted_at.is_(None), or_(*sources))
+        if after is not None:
+            query = query.where(seek_before(self.session, Post.created_at, Post.id, *after))
+        result = await self.session.execute(query.order_by(Post.created_at.desc(), Post.id.desc()).limit(size + 1))
+        return [(post_id, created_at) for post_id, created_at in result]
@@ -0,0 +1,21 @@
+from typing import Any
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def seek_before(
+    session: AsyncSession, sort_column: Any, id_column: Any, sort_value: Any, id_value: int
+) -> ColumnElement[bool]:
+    """
+    Condición keyset para ordenar por (sort_column DESC, id_column DESC) y continuar
+    después de la fila (sort_value, id_value).
+
+    En SQLite las fechas se guardan como texto y el valor enlazado no tiene el mismo
+    formato que el generado por CURRENT_TIMESTAMP, así que se compara contra el valor
+    almacenado en la fila ancla en lugar del valor del cursor.
+    """
+    if session.bind.dialect.name == "sqlite":
+        sort_value = select(sort_column).where(id_column == id_value).scalar_subquery()
+    return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < id_value))
@@ -0,0 +1,89 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.core.dataloader import DataLoader
+from src.models.models import JOINED_LOAD_RELATIONS, Comment, Post, Tag, User, association_table
+
+
+class RelationLoaders:
+    """
+    DataLoaders de las relaciones de posts y comentarios para una sesión (una petición).
+
+    Las consultas de los distintos loaders comparten la sesión, así que se ejecutan de una en
+    una aunque se hayan pedido en la misma vuelta del event loop.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._lock = asyncio.Lock()
+        self.users: DataLoader[int, User] = DataLoader(self._load_users)
+        self.tags_by_post: DataLoader[int, list[Tag]] = DataLoader(self._load_tags_by_post, default=list)
+        self.comments_by_post: DataLoader[int, list[Comment]] = DataLoader(self._load_comments_by_post, default=list)
+
+    async def _execute(self, query: Any):
+        async with self._lock:
+            return await self.session.execute(query)
+
+    async def _load_users(self, ids: list[int]) -> dict[int, User]:
+        result = await self._execute(select(User).where(User.id.in_(ids)))
+        return {user.id: user for user in result.scalars()}
+
+    async def _load_tags_by_post(self, post_ids: list[int]) -> dict[int, list[Tag]]:
+        result = await self._execute(
+            select(association_table.c.post_id, Tag)
+            .join(Tag, Tag.id == association_table.c.tag_id)
+            .where(association_table.c.post_id.in_(post_ids))
+            .order_by(Tag.id)
+        )
+        tags: dict[int, list[Tag]] = defaultdict(list)
+        for post_id, tag in result:
+            tags[post_id].append(tag)
+        return tags
+
+    async def _load_comments_by_post(self, post_ids: list[int]) -> dict[int, list[Comment]]:
+        result = await self._execute(
+            select(Comment)
+            .where(Comment.post_id.in_(post_ids), Comment.deleted_at.is_(None))
+            .order_by(Comment.created_at, Comment.id)
+        )
+        comments = result.scalars().all()
+        # Los autores de los comentarios también se cargan en lote
+        for comment, user in zip(comments, await self.users.load_many(comment.user_id for comment in comments)):
+            set_committed_value(comment, "user", user)
+        by_post: dict[int, list[Comment]] = defaultdict(list)
+        for comment in comments:
+            by_post[comment.post_id].append(comment)
+        return by_post
+
+
+def get_loaders(session: AsyncSession) -> RelationLoaders:
+    """Loaders de la sesión; se crean la primera vez y viven lo que vive la sesión."""
+    loaders = session.info.get("loaders")
+    if loaders is None:
+        loaders = session.info["loaders"] = RelationLoaders(session)
+    return loaders
+
+
+async def load_post_relations(
+    session: AsyncSession, posts: Sequence[Post], relations: Sequence[JOINED_LOAD_RELATIONS]
+) -> None:
+    """
+    Rellena las relaciones indicadas de los posts con los loaders de la sesión: una consulta IN
+    por relación para todos los posts, sin importar cuántos sean.
+    """
+    loaders = get_loaders(session)
+    sources = {
+        "user": (loaders.users, lambda post: post.user_id),
+        "tags": (loaders.tags_by_post, lambda post: post.id),
+        "comments": (loaders.comments_by_post, lambda post: post.id),
+    }
+    # Las claves se encolan aquí mismo, así se agrupan con otras cargas pedidas en este paso
+    pending = [sources[relation][0].load_many(sources[relation][1](post) for post in posts) for relation in relations]
+    for relation, values in zip(relations, await asyncio.gather(*pending)):
+        for post, value in zip(posts, values):
+            set_committed_value(post, relation, value)
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Literal
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.notifier import Notifier
+from src.models.models import outbox_table
+
+# Bloqueo de PostgreSQL que ordena a los escritores del outbox (pg_advisory_xact_lock)
+OUTBOX_LOCK_KEY = 0x6F7574626F78
+
+OutboxEntity = Literal["post", "comment", "tag"]
+OutboxAction = Literal["created", "updated", "deleted", "restored"]
+
+outbox = outbox_table
+
+# Avisa a los lectores de GET /events de este proceso cuando se confirman eventos nuevos
+outbox_notifier = Notifier()
+
+
+async def record_events(
+    session: AsyncSession, entity: OutboxEntity, action: OutboxAction, changes: Iterable[tuple[int, dict[str, Any]]]
+) -> None:
+    """
+    Añade un evento por cada (id, datos) a la transacción de la sesión: se confirma o se
+    descarta junto con el cambio que describe. No hace commit.
+
+    En PostgreSQL toma antes un bloqueo de transacción compartido por todos los escritores del
+    outbox, que se libera con el commit o el rollback: los ids se asignan y se confirman en el
+    mismo orden, así que un id visible implica que los menores ya son definitivos. En SQLite las
+    escrituras ya están serializadas por la base de datos.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"entity": entity, "entity_id": id, "action": action, "data": data, "created_at": now} for id, data in changes
+    ]
+    if rows:
+        if session.bind.dialect.name == "postgresql":
+            await session.execute(select(func.pg_advisory_xact_lock(OUTBOX_LOCK_KEY)))
+        await session.execute(insert(outbox), rows)
+        session.info["outbox_events"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def notify_committed_events(session: Session) -> None:
+    if session.info.pop("outbox_events", False):
+        outbox_notifier.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_events(session: Session) -> None:
+    session.info.pop("outbox_events", None)
+
+
+class RepositoryOutboxPostgres:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_after(self, after: int, limit: int) -> List[Row]:
+        """
+        Eventos con id mayor que `after`, en orden de id, sin saltarse ninguno.
+
+        Los ids se confirman en orden (ver record_events): un id que falta entre eventos visibles
+        es de una transacción descartada y nunca aparecerá, así que la página no se detiene en él.
+
+        Termina la transacción de lectura para no retener la conexión mientras el cliente espera.
+        """
+        rows = (
+            await self.session.execute(select(outbox).where(outbox.c.id > after).order_by(outbox.c.id).limit(limit))
+        ).all()
+        await self.session.rollback()
+        return rows
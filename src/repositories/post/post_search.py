@@ -0,0 +1,163 @@
+import html
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Post
+from src.repositories.exceptions import RepositoryException
+
+# Búsqueda de texto completo sobre title + content de los posts no eliminados:
+#
+# - PostgreSQL: columna generada post.search_vector (tsvector, title con peso A y content con
+#   peso B) con un índice GIN parcial. La mantiene la propia base de datos.
+# - SQLite: tabla virtual FTS5 post_fts (rowid = post.id) que mantiene el repositorio de posts
+#   en la misma transacción que la escritura.
+#
+# Las dos usan tokenización sin stemming (configuración 'simple' / unicode61), así una misma
+# consulta encuentra lo mismo en ambas.
+
+TS_CONFIG = "simple"
+DIALECTS = ("postgresql", "sqlite")
+
+POSTGRESQL_DDL = [
+    f"""
+    ALTER TABLE post ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_post_search_vector ON post USING gin (search_vector) WHERE deleted_at IS NULL",
+]
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5(
+        title, content, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+# Marcas de los términos encontrados en el snippet. Se sustituyen por <mark> después de escapar
+# el texto, así el contenido del post nunca llega como HTML
+MARK_START, MARK_END = "⟦", "⟧"
+
+search_vector = literal_column("post.search_vector")
+post_fts = table("post_fts", column("rowid"), column("title"), column("content"))
+post_fts_ref = literal_column("post_fts")
+
+
+@dataclass
+class SearchHit:
+    id: int
+    rank: float
+    snippet: str
+
+
+def create_search_index(connection) -> None:
+    """Crea la columna/tabla de búsqueda si falta (bases creadas con create_all en lugar de alembic)."""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRESQL_DDL:
+            connection.exec_driver_sql(statement)
+    elif dialect == "sqlite":
+        exists = connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'post_fts'").first()
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+        if not exists:
+            connection.exec_driver_sql(
+                "INSERT INTO post_fts (rowid, title, content) SELECT id, title, content FROM post WHERE deleted_at IS NULL"
+            )
+
+
+def fts5_query(q: str) -> Optional[str]:
+    """Convierte el texto del usuario en una consulta FTS5 (todos los términos, cada uno entre comillas)."""
+    terms = re.findall(r"\w+", q)
+    return " ".join(f'"{term}"' for term in terms) if terms else None
+
+
+def highlight(snippet: Optional[str]) -> str:
+    return html.escape(snippet or "").replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+class PostSearchIndex:
+    """
+    Índice de búsqueda de los posts. En PostgreSQL index/remove no hacen nada (la columna es
+    generada y las búsquedas filtran deleted_at); en SQLite actualizan post_fts.
+
+    No hace commit, los cambios quedan en la transacción de la sesión. Con otra base de datos
+    falla al crearlo, no en la primera búsqueda.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.dialect = session.bind.dialect.name
+        if self.dialect not in DIALECTS:
+            raise RepositoryException(f"Full-text search is not available for {self.dialect}")
+
+    async def index(self, rows: Iterable[tuple[int, str, str]]) -> None:
+        """Añade o reemplaza (id, title, content) en el índice."""
+        if self.dialect != "sqlite":
+            return
+        rows = list(rows)
+        if rows:
+            await self.remove(id for id, _, _ in rows)
+            await self.session.execute(
+                post_fts.insert(), [{"rowid": id, "title": title, "content": content} for id, title, content in rows]
+            )
+
+    async def remove(self, ids: Iterable[int]) -> None:
+        if self.dialect != "sqlite":
+            return
+        ids = list(ids)
+        if ids:
+            await self.session.execute(post_fts.delete().where(post_fts.c.rowid.in_(ids)))
+
+    async def search(self, q: str, size: int, after: tuple[float, int] | None = None) -> List[SearchHit]:
+        """
+        Posts que contienen todos los términos de `q`, del más relevante al menos relevante
+        (desempate por id descendente). `after` es el (rank, id) del último resultado de la
+        página anterior. Los snippets se calculan sólo para los resultados de la página.
+        """
+        if self.dialect == "postgresql":
+            return await self._search_postgresql(q, size, after)
+        return await self._search_sqlite(q, size, after)
+
+    async def _search_postgresql(self, q: str, size: int, after: tuple[float, int] | None) -> List[SearchHit]:
+        query = func.plainto_tsquery(TS_CONFIG, q)
+        ranked = (
+            select(Post.id, func.ts_rank_cd(search_vector, query).label("rank"))
+            .where(search_vector.op("@@")(query), Post.deleted_at.is_(None))
+            .subquery()
+        )
+        page = select(ranked.c.id, ranked.c.rank)
+        if after is not None:
+            page = page.where(seek_rank(ranked.c.rank, ranked.c.id, *after))
+        page = page.order_by(ranked.c.rank.desc(), ranked.c.id.desc()).limit(size).subquery()
+        options = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxFragments=2, MaxWords=20, MinWords=5"
+        result = await self.session.execute(
+            select(page.c.id, page.c.rank, func.ts_headline(TS_CONFIG, Post.content, query, options))
+            .join(Post, Post.id == page.c.id)
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+        return [SearchHit(id, rank, highlight(snippet)) for id, rank, snippet in result]
+
+    async def _search_sqlite(self, q: str, size: int, after: tuple[float, int] | None) -> List[SearchHit]:
+        match = fts5_query(q)
+        if match is None:
+            return []
+        # bm25 es menor cuanto más relevante; se invierte para ordenar igual que en PostgreSQL
+        # (post_fts ya tiene una columna oculta "rank", de ahí el nombre "score")
+        rank = (-func.bm25(post_fts_ref, 2.0, 1.0)).label("score")
+        snippet = func.snippet(post_fts_ref, 1, MARK_START, MARK_END, "…", 16)
+        query = select(post_fts.c.rowid, rank, snippet).where(post_fts_ref.op("MATCH")(match))
+        if after is not None:
+            query = query.where(seek_rank(rank, post_fts.c.rowid, *after))
+        result = await self.session.execute(query.order_by(rank.desc(), post_fts.c.rowid.desc()).limit(size))
+        return [SearchHit(id, rank, highlight(snippet)) for id, rank, snippet in result]
+
+
+def seek_rank(rank, id_column, rank_value: float, id_value: int):
+    """Condición keyset para ordenar por (rank DESC, id DESC) y continuar después de (rank_value, id_value)."""
+    return or_(rank < rank_value, and_(rank == rank_value, id_column < id_value))
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from src.models.models import Post
+from src.repositories.counting import CountMode
 from src.repositories.exceptions import RepositoryAlreadyExistsException, RepositoryNotFoundException
+from src.repositories.post.repository_post_postgres import TagMatchMode
 from src.repositories.repository_base import RepositoryBase
 from src.schemas.post import PostIn, PostPut
 
@@ -12,8 +14,27 @@ class RepositoryPostMemory(RepositoryBase):
         self.posts: dict[int, Post] = posts
         self.id_counter = 0
 
-    async def get_all(self) -> Optional[List[Post]]:
-        return list(self.posts.values())
+    async def get_all(
+        self,
+        page: int,
+        size: int,
+        count: CountMode = "exact",
+        tags: Sequence[str] = (),
+        mode: TagMatchMode = "all",
+        exclude: Sequence[str] = (),
+    ) -> tuple[List[Post], Optional[int], CountMode]:
+        posts = [post for post in self.posts.values() if post.deleted_at is None]
+        criteria = bool(tags or exclude)
+        if criteria:
+            posts = [post for post in posts if self._matches_tags(post, tags, mode, exclude)]
+        posts.sort(key=lambda post: post.id, reverse=True)
+        skip = (page - 1) * size
+        page_posts = posts[skip : skip + size]
+        # Un filtro sin resultados devuelve una página vacía
+        if not page_posts and not criteria:
+            raise RepositoryNotFoundException("Not found posts")
+        # En memoria el total siempre es exacto
+        return page_posts, None if count == "none" else len(posts), "none" if count == "none" else "exact"
 
     async def get_by_id(self, id: int) -> Optional[Post]:
         post = self.posts.get(id)
@@ -54,3 +75,10 @@ class RepositoryPostMemory(RepositoryBase):
 
     async def get_by_title(self, title: str) -> Optional[Post]:
         return next((post for post in self.posts.values() if post.title == title), None)
+
+    @staticmethod
+    def _matches_tags(post: Post, tags: Sequence[str], mode: TagMatchMode, exclude: Sequence[str]) -> bool:
+        names = {tag.name for tag in post.tags or []}
+        if tags and not (set(tags) <= names if mode == "all" else names & set(tags)):
+            return False
+        return not names & set(exclude)
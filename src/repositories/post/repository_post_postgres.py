@@ -1,112 +1,355 @@
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, List, Literal, Mapping, Optional, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.elements import ColumnElement
 
-from src.models.models import Post, Tag
-from src.repositories.exceptions import RepositoryAlreadyExistsException, RepositoryNotFoundException
+from src.core.http_cache import response_cache
+from src.models.models import JOINED_LOAD_RELATIONS, Comment, Post, Tag, User, association_table
+from src.repositories.counters import adjust_tag_post_counts, adjust_user_counts, tag_deltas
+from src.repositories.counting import CountMode, count_rows, invalidate_counts
+from src.repositories.exceptions import (
+    RepositoryAlreadyExistsException,
+    RepositoryException,
+    RepositoryNotFoundException,
+)
+from src.repositories.keyset import seek_before
+from src.repositories.loaders import get_loaders, load_post_relations
+from src.repositories.outbox import record_events
+from src.repositories.post.post_search import PostSearchIndex, SearchHit
 from src.repositories.repository_base import RepositoryBase
+from src.repositories.tag.tag_resolver import TagResolver
 from src.schemas.post import PostIn, PostPut
 
 
+DEFAULT_RELATIONS: tuple[JOINED_LOAD_RELATIONS, ...] = ("user", "tags")
+
+TagMatchMode = Literal["all", "any"]
+
+
+def load_options(relations: Sequence[JOINED_LOAD_RELATIONS]) -> list:
+    """Opciones de carga para las relaciones de Post: cada una con selectinload (una consulta IN por relación)."""
+    return [selectinload(getattr(Post, relation)) for relation in relations]
+
+
+def tag_ids(names: Sequence[str]):
+    return select(Tag.id).where(Tag.name.in_(names))
+
+
+def tag_criteria(
+    tags: Sequence[str] = (), mode: TagMatchMode = "all", exclude: Sequence[str] = ()
+) -> list[ColumnElement[bool]]:
+    """
+    Filtros de posts por nombre de tag. Se resuelven sobre post_tag con el índice
+    (tag_id, post_id), sin recorrer los posts:
+
+    - mode="all": posts con todas las `tags` (GROUP BY post_id HAVING count = nº de tags)
+    - mode="any": posts con alguna de las `tags`
+    - `exclude`: posts sin ninguna de esas tags
+    """
+    criteria: list[ColumnElement[bool]] = []
+    if tags:
+        names = list(dict.fromkeys(tags))
+        matching = select(association_table.c.post_id).where(association_table.c.tag_id.in_(tag_ids(names)))
+        if mode == "all" and len(names) > 1:
+            matching = matching.group_by(association_table.c.post_id).having(func.count() == len(names))
+        criteria.append(Post.id.in_(matching))
+    if exclude:
+        excluded = select(association_table.c.post_id).where(association_table.c.tag_id.in_(tag_ids(exclude)))
+        criteria.append(Post.id.not_in(excluded))
+    return criteria
+
+
+def post_event_data(user_id: int, schema: PostIn) -> dict[str, Any]:
+    return {"user_id": user_id, "title": schema.title, "tags": list(dict.fromkeys(schema.tags or []))}
+
+
 class RepositoryPostPostgres(RepositoryBase):
 
     def __init__(self, session: AsyncSession):
         super().__init__(session)
 
-    async def get_all(self, page: int, size: int) -> tuple[List[Post], int]:
-        skip = (page - 1) * size
-        base_query = (
-            select(Post).options(joinedload(Post.user), joinedload(Post.tags)).where(Post.deleted_at.is_(None))
+    async def _get_page(
+        self,
+        *criteria: ColumnElement[bool],
+        offset: int | None = None,
+        limit: int | None = None,
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> List[Post]:
+        """
+        Las relaciones se cargan con los DataLoaders de la sesión (una consulta IN por relación),
+        sin joins: LIMIT se aplica a posts y no a filas multiplicadas por tags.
+        """
+        query = (
+            select(Post)
+            .where(Post.deleted_at.is_(None), *criteria)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .offset(offset)
+            .limit(limit)
         )
+        posts = list((await self.session.scalars(query)).all())
+        await load_post_relations(self.session, posts, relations)
+        return posts
+
+    async def _hydrate(
+        self,
+        ids: Sequence[int],
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> List[Post]:
+        if not ids:
+            return []
+        posts_by_id = {post.id: post for post in (await self.session.scalars(select(Post).where(Post.id.in_(ids))))}
+        # Mantener el orden de `ids`
+        posts = [posts_by_id[id] for id in ids if id in posts_by_id]
+        await load_post_relations(self.session, posts, relations)
+        return posts
 
-        # Count
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total = await self.session.scalar(count_query)
+    async def get_all(
+        self,
+        page: int,
+        size: int,
+        count: CountMode = "exact",
+        tags: Sequence[str] = (),
+        mode: TagMatchMode = "all",
+        exclude: Sequence[str] = (),
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> tuple[List[Post], Optional[int], CountMode]:
+        skip = (page - 1) * size
+        criteria = tag_criteria(tags, mode, exclude)
+
+        # Count (sin los joins de carga de relaciones). Con filtros, las estadísticas del índice
+        # de SQLite no sirven como estimación y se cuenta
+        total, count = await count_rows(
+            self.session,
+            select(Post.id).where(Post.deleted_at.is_(None), *criteria),
+            count,
+            cache_key=("posts", tuple(sorted(set(tags))), mode, tuple(sorted(set(exclude)))),
+            sqlite_index=None if criteria else "ix_post_created_at_id_active",
+        )
 
         # Posts
-        query = base_query.offset(skip).limit(size).order_by(Post.created_at.desc())
-        result = await self.session.execute(query)
-        posts = result.unique().scalars().all()
+        posts = await self._get_page(*criteria, offset=skip, limit=size, relations=relations)
 
-        if not posts:
+        # Un filtro sin resultados devuelve una página vacía
+        if not posts and not criteria:
             raise RepositoryNotFoundException("Not found posts")
 
-        return posts, total
+        return posts, total, count
 
-    async def get_by_id(self, id: int) -> Optional[Post]:
-        result = await self.session.execute(
-            select(Post)
-            .options(joinedload(Post.user), joinedload(Post.tags))
-            .where(Post.id == id, Post.deleted_at.is_(None))
-        )
-        post = result.unique().scalar_one_or_none()
+    async def get_all_keyset(
+        self,
+        size: int,
+        after: tuple[datetime, int] | None = None,
+        with_total: bool = False,
+        tags: Sequence[str] = (),
+        mode: TagMatchMode = "all",
+        exclude: Sequence[str] = (),
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> tuple[List[Post], Optional[int], bool]:
+        """
+        Paginación por cursor: busca directamente la posición (created_at, id) del último
+        post de la página anterior en lugar de recorrer OFFSET filas.
+        Devuelve los posts, el total (solo si se pide) y si existen más páginas.
+        """
+        criteria = tag_criteria(tags, mode, exclude)
+        seek = [seek_before(self.session, Post.created_at, Post.id, *after)] if after is not None else []
+        posts = await self._get_page(*criteria, *seek, limit=size + 1, relations=relations)
+
+        total = None
+        if with_total:
+            total = await self.session.scalar(
+                select(func.count()).select_from(Post).where(Post.deleted_at.is_(None), *criteria)
+            )
+
+        return posts[:size], total, len(posts) > size
+
+    async def get_by_id(
+        self,
+        id: int,
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> Optional[Post]:
+        post = await self.session.scalar(select(Post).where(Post.id == id, Post.deleted_at.is_(None)))
         if not post:
             raise RepositoryNotFoundException(entity_name="Post", id=id)
+        await load_post_relations(self.session, [post], relations)
         return post
 
-    async def get_by_user_id(self, user_id: int) -> Optional[List[Post]]:
+    async def get_by_id_with_comments(self, id: int, comments_size: int) -> tuple[Post, List[Comment], int]:
+        """
+        El post con su autor y sus tags, sus `comments_size` comentarios más recientes con sus
+        autores y el total de comentarios, en cuatro consultas: post, comentarios (el total sale de
+        la misma consulta con una función de ventana), usuarios y tags.
+        """
+        post = await self.get_by_id(id, relations=())
         result = await self.session.execute(
-            select(Post)
-            .options(joinedload(Post.user), joinedload(Post.tags))
-            .where(Post.user_id == user_id, Post.deleted_at.is_(None))
+            select(Comment, func.count().over())
+            .where(Comment.post_id == id, Comment.deleted_at.is_(None))
+            .order_by(Comment.created_at.desc(), Comment.id.desc())
+            .limit(comments_size)
         )
-        posts = result.unique().scalars().all()
+        rows = result.all()
+        comments = [comment for comment, _ in rows]
+        total = rows[0][1] if rows else 0
+
+        # Autor del post y autores de los comentarios en el mismo lote
+        authors = get_loaders(self.session).users.load_many(comment.user_id for comment in comments)
+        await load_post_relations(self.session, [post], DEFAULT_RELATIONS)
+        for comment, user in zip(comments, await authors):
+            set_committed_value(comment, "user", user)
+        return post, comments, total
+
+    async def get_by_user_id(
+        self,
+        user_id: int,
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> Optional[List[Post]]:
+        posts = await self._get_page(Post.user_id == user_id, relations=relations)
         if not posts:
             raise RepositoryNotFoundException(message=f"No posts found for user {user_id}")
         return posts
 
-    async def get_by_tag(self, tag: str) -> Optional[List[Post]]:
-        result = await self.session.execute(
-            select(Post)
-            .options(joinedload(Post.user), joinedload(Post.tags))
-            .where(Post.tags.any(Tag.name == tag), Post.deleted_at.is_(None))
-        )
-        posts = result.unique().scalars().all()
+    async def get_by_user_keyset(
+        self,
+        user_id: int,
+        size: int,
+        after: tuple[datetime, int] | None = None,
+        summary: bool = False,
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> tuple[List[Post], int, bool]:
+        """
+        Posts de un usuario del más reciente al más antiguo, paginados por cursor sobre el índice
+        (user_id, created_at, id). El total es User.post_count, sin COUNT.
+        Con `summary` sólo se leen las columnas del resumen y ninguna relación.
+        Devuelve los posts, el total y si existen más páginas.
+        """
+        total = await self.session.scalar(select(User.post_count).where(User.id == user_id, User.deleted_at.is_(None)))
+        if total is None:
+            raise RepositoryNotFoundException(entity_name="User", id=user_id)
+        criteria = [Post.user_id == user_id]
+        if after is not None:
+            criteria.append(seek_before(self.session, Post.created_at, Post.id, *after))
+        if summary:
+            query = (
+                select(Post)
+                .options(load_only(Post.id, Post.title, Post.comment_count, Post.created_at, Post.updated_at))
+                .where(Post.deleted_at.is_(None), *criteria)
+                .order_by(Post.created_at.desc(), Post.id.desc())
+                .limit(size + 1)
+            )
+            posts = list((await self.session.scalars(query)).all())
+        else:
+            posts = await self._get_page(*criteria, limit=size + 1, relations=relations)
+        return posts[:size], total, len(posts) > size
+
+    async def get_by_tag(
+        self,
+        tag: str,
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> Optional[List[Post]]:
+        posts = await self._get_page(*tag_criteria([tag]), relations=relations)
         if not posts:
             raise RepositoryNotFoundException(message=f"No posts found for tag {tag}")
         return posts
 
+    async def search(
+        self,
+        q: str,
+        size: int,
+        after: tuple[float, int] | None = None,
+        relations: Sequence[JOINED_LOAD_RELATIONS] = DEFAULT_RELATIONS,
+    ) -> tuple[List[tuple[Post, SearchHit]], bool]:
+        """
+        Búsqueda de texto completo: los posts de la página con su rank y snippet, y si existen más
+        páginas. La búsqueda usa el índice (GIN o FTS5) y sólo se cargan los posts de la página.
+        """
+        hits = await PostSearchIndex(self.session).search(q, size + 1, after)
+        posts = {post.id: post for post in await self._hydrate([hit.id for hit in hits[:size]], relations)}
+        return [(posts[hit.id], hit) for hit in hits[:size] if hit.id in posts], len(hits) > size
+
+    async def stream_all(self, fetch_size: int = 1000) -> AsyncIterator[Sequence[Mapping[str, Any]]]:
+        """
+        Recorre todos los posts no eliminados con un cursor del servidor, entregando particiones
+        de `fetch_size` filas. La memoria usada no depende del tamaño de la tabla.
+        """
+        query = (
+            select(Post.id, Post.title, Post.content, Post.user_id, Post.created_at, Post.updated_at)
+            .where(Post.deleted_at.is_(None))
+            .order_by(Post.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.mappings().partitions():
+            yield partition
+
     async def create(self, schema: PostIn, user_id: int) -> Optional[Post]:
-        tags = []
-        if schema.tags:
-            for tag_name in schema.tags:
-                result = await self.session.execute(select(Tag).where(Tag.name == tag_name))
-                tag = result.unique().scalar()
-                if tag:
-                    if tag.deleted_at is not None:
-                        tag.deleted_at = None
-                    tags.append(tag)
-                else:
-                    try:
-                        tag = Tag(name=tag_name, user_id=user_id)
-                        self.session.add(tag)
-                        tags.append(tag)
-                    except (
-                        IntegrityError
-                    ):  # Puede ocurrir que justo en ese instante otro proceso haya creado el tag(concurrency issue)
-                        tags.append(tag)
-        post = Post(**schema.model_dump(exclude={"tags"}), user_id=user_id, tags=tags)
+        tags = await TagResolver(self.session).resolve(schema.tags or [], user_id)
+        # El autor se busca por clave primaria (sin consulta si ya está en la sesión)
+        user = await self.session.get(User, user_id)
+        post = Post(**schema.model_dump(exclude={"tags"}), user=user, tags=tags)
         try:
             self.session.add(post)
+            await adjust_tag_post_counts(self.session, tag_deltas(added=[tag.id for tag in tags]))
+            await adjust_user_counts(self.session, user_id, posts=1)
+            await self.session.flush()
+            await PostSearchIndex(self.session).index([(post.id, post.title, post.content)])
+            await record_events(self.session, "post", "created", [(post.id, post_event_data(user_id, schema))])
             await self.session.commit()
-            await self.session.refresh(post, attribute_names=["id", "created_at", "updated_at"])
-            # Recargar con las relaciones
-            result = await self.session.execute(
-                select(Post).options(joinedload(Post.user), joinedload(Post.tags)).where(Post.id == post.id)
-            )
-            post = result.unique().scalar_one()
+            response_cache.invalidate("posts", "tags")
+            invalidate_counts("posts")
             return post
         except IntegrityError:
             await self.session.rollback()
             raise RepositoryAlreadyExistsException(entity_name="Post", name=post.title)
 
+    async def create_many(self, schemas: Sequence[PostIn], user_id: int) -> List[int]:
+        """
+        Inserta un lote de posts con un número constante de sentencias: una resolución de tags
+        para todo el lote, un INSERT multi-fila de posts y otro de post_tag.
+        Devuelve los ids en el mismo orden que `schemas`.
+        """
+        tag_names = [name for schema in schemas for name in schema.tags or []]
+        tags_by_name = {tag.name: tag for tag in await TagResolver(self.session).resolve(tag_names, user_id)}
+        try:
+            ids = (
+                await self.session.scalars(
+                    insert(Post).returning(Post.id, sort_by_parameter_order=True),
+                    [{**schema.model_dump(exclude={"tags"}), "user_id": user_id} for schema in schemas],
+                )
+            ).all()
+            await PostSearchIndex(self.session).index(
+                (post_id, schema.title, schema.content) for post_id, schema in zip(ids, schemas)
+            )
+            await adjust_user_counts(self.session, user_id, posts=len(ids))
+            await record_events(
+                self.session,
+                "post",
+                "created",
+                [(post_id, post_event_data(user_id, schema)) for post_id, schema in zip(ids, schemas)],
+            )
+            post_tags = [
+                {"post_id": post_id, "tag_id": tags_by_name[name].id}
+                for post_id, schema in zip(ids, schemas)
+                for name in dict.fromkeys(schema.tags or [])
+            ]
+            if post_tags:
+                await self.session.execute(insert(association_table), post_tags)
+                await adjust_tag_post_counts(self.session, tag_deltas(added=[row["tag_id"] for row in post_tags]))
+            await self.session.commit()
+            response_cache.invalidate("posts", "tags")
+            invalidate_counts("posts")
+        except IntegrityError as exc:
+            await self.session.rollback()
+            raise RepositoryException("Could not insert the batch of posts") from exc
+        return ids
+
     async def update(self, id: int, schema: PostPut, user_id: int) -> Optional[Post]:
         result = await self.session.execute(
             select(Post)
-            .options(joinedload(Post.user), joinedload(Post.tags))
+            .options(*load_options(DEFAULT_RELATIONS))
             .where(Post.id == id, Post.deleted_at.is_(None), Post.user_id == user_id)
         )
         post = result.unique().scalar_one_or_none()
@@ -118,44 +361,56 @@ class RepositoryPostPostgres(RepositoryBase):
         for key, value in update_post_data.items():
             setattr(post, key, value)
 
+        if "title" in update_post_data or "content" in update_post_data:
+            await PostSearchIndex(self.session).index([(post.id, post.title, post.content)])
+
         # Manejar tags si están presentes
         if schema.tags is not None:
-            tags = []
-            for tag_name in schema.tags:
-                tag_result = await self.session.execute(select(Tag).where(Tag.name == tag_name))
-                tag = tag_result.unique().scalar()
-                if tag:
-                    tags.append(tag)
-                else:
-                    try:
-                        tag = Tag(name=tag_name, user_id=user_id)
-                        self.session.add(tag)
-                        tags.append(tag)
-                    except (
-                        IntegrityError
-                    ):  # Puede ocurrir que justo en ese instante otro proceso haya creado el tag(concurrency issue)
-                        tags.append(tag)
-            post.tags = tags
+            old_tag_ids = [tag.id for tag in post.tags]
+            post.tags = await TagResolver(self.session).resolve(schema.tags, user_id)
+            await adjust_tag_post_counts(
+                self.session, tag_deltas(added=[tag.id for tag in post.tags], removed=old_tag_ids)
+            )
+            # Cambiar sólo las tags no modifica la fila del post: se marca a mano para que
+            # updated_at (y el ETag de las respuestas cacheadas) refleje el cambio
+            post.updated_at = func.now()
 
         try:
-            await self.session.commit()
-            await self.session.refresh(post, attribute_names=["updated_at"])
-            # Recargar con las relaciones
-            result = await self.session.execute(
-                select(Post).options(joinedload(Post.user), joinedload(Post.tags)).where(Post.id == post.id)
+            await record_events(
+                self.session,
+                "post",
+                "updated",
+                [(post.id, {"user_id": user_id, "fields": sorted(schema.model_fields_set)})],
             )
-            post = result.unique().scalar_one()
+            await self.session.commit()
+            response_cache.invalidate("posts", "tags")
+            if schema.tags is not None:
+                # Los totales filtrados por tag dependen de las tags de cada post
+                invalidate_counts("posts")
             return post
         except IntegrityError:
             await self.session.rollback()
             raise RepositoryAlreadyExistsException(entity_name="Post", name=post.title)
 
     async def delete(self, id: int, user_id: int) -> None:
-        result = await self.session.execute(
-            select(Post).where(Post.id == id, Post.deleted_at.is_(None), Post.user_id == user_id)
+        # Borrado lógico condicional: de dos borrados simultáneos sólo uno encuentra la fila sin
+        # eliminar, así que los contadores y el evento se aplican una única vez
+        deleted = await self.session.scalar(
+            update(Post)
+            .where(Post.id == id, Post.deleted_at.is_(None), Post.user_id == user_id)
+            .values(deleted_at=datetime.now(timezone.utc))
+            .returning(Post.id)
+            .execution_options(synchronize_session=False)
         )
-        post = result.unique().scalar_one_or_none()
-        if not post:
+        if deleted is None:
             raise RepositoryNotFoundException(f"Not found post with id {id} for the user with id {user_id}")
-        post.soft_delete()
+        post_tag_ids = await self.session.scalars(
+            select(association_table.c.tag_id).where(association_table.c.post_id == id)
+        )
+        await adjust_tag_post_counts(self.session, tag_deltas(removed=post_tag_ids))
+        await adjust_user_counts(self.session, user_id, posts=-1)
+        await PostSearchIndex(self.session).remove([id])
+        await record_events(self.session, "post", "deleted", [(id, {"user_id": user_id})])
         await self.session.commit()
+        response_cache.invalidate("posts", "tags")
+        invalidate_counts("posts")
@@ -5,10 +5,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class RepositoryBase(ABC):
-
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def read_scope(self) -> Any:
+        """Base de datos de la que lee la sesión (primario o réplica); None sin sesión."""
+        return self.session.bind if self.session is not None else None
+
+    def reads_from_replica(self) -> bool:
+        """Si la sesión lee de una réplica, que puede ir por detrás de las últimas escrituras."""
+        return self.session is not None and self.session.info.get("replica", False)
+
     @abstractmethod
     async def get_all(self, **kwargs: Any) -> Optional[List[Any]]:
         pass
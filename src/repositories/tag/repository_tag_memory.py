@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from src.models.models import Tag
 from src.repositories.exceptions import RepositoryAlreadyExistsException, RepositoryNotFoundException
 from src.repositories.repository_base import RepositoryBase
+from src.repositories.tag.repository_tag_postgres import TagSort
 from src.schemas.tags import TagIn, TagPut
 
 
@@ -12,8 +13,19 @@ class RepositoryTagMemory(RepositoryBase):
         self.tags: dict[int, Tag] = tags
         self.id_counter = 0
 
-    async def get_all(self) -> Optional[List[Tag]]:
-        return list(self.tags.values())
+    async def get_all(
+        self, size: int, after: tuple[Any, ...] | None = None, sort: TagSort = "name"
+    ) -> tuple[List[Tag], bool]:
+        tags = [tag for tag in self.tags.values() if tag.deleted_at is None]
+        if sort == "popular":
+            tags.sort(key=lambda tag: (tag.post_count or 0, tag.id), reverse=True)
+            if after is not None:
+                tags = [tag for tag in tags if ((tag.post_count or 0), tag.id) < tuple(after)]
+        else:
+            tags.sort(key=lambda tag: tag.name)
+            if after is not None:
+                tags = [tag for tag in tags if tag.name > after[0]]
+        return tags[:size], len(tags) > size
 
     async def get_by_id(self, id: int) -> Optional[Tag]:
         tag = self.tags.get(id)
@@ -1,26 +1,81 @@
-from typing import List, Optional
+from typing import Any, List, Literal, Optional
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from src.core.http_cache import response_cache
 from src.models.models import Tag
-from src.repositories.exceptions import RepositoryNotFoundException
+from src.repositories.counting import invalidate_counts
+from src.repositories.exceptions import RepositoryAlreadyExistsException, RepositoryNotFoundException
+from src.repositories.outbox import record_events
 from src.repositories.repository_base import RepositoryBase
+from src.repositories.tag.tag_name_index import tag_name_index
+from src.repositories.tag.tag_resolver import TagResolver
 from src.schemas.tags import TagIn, TagPut
 
 
+TagSort = Literal["name", "popular"]
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class RepositoryTagPostgres(RepositoryBase):
 
     def __init__(self, session: AsyncSession):
         super().__init__(session)
 
-    async def get_all(self) -> Optional[List[Tag]]:
-        result = await self.session.execute(select(Tag).where(Tag.deleted_at.is_(None)))
-        tags = result.unique().scalars().all()
-        if not tags:
-            raise RepositoryNotFoundException("Not found tags")
-        return tags
+    async def get_all(
+        self, size: int, after: tuple[Any, ...] | None = None, sort: TagSort = "name"
+    ) -> tuple[List[Tag], bool]:
+        """
+        Página de tags no eliminadas con paginación por cursor. Devuelve las tags y si hay más.
+
+        - sort="name": orden alfabético; `after` es (name,) de la última tag de la página anterior
+        - sort="popular": más posts primero (post_count DESC, id DESC); `after` es (post_count, id)
+        """
+        query = select(Tag).where(Tag.deleted_at.is_(None))
+        if sort == "popular":
+            if after is not None:
+                post_count, id = after
+                query = query.where(or_(Tag.post_count < post_count, and_(Tag.post_count == post_count, Tag.id < id)))
+            query = query.order_by(Tag.post_count.desc(), Tag.id.desc())
+        else:
+            if after is not None:
+                query = query.where(Tag.name > after[0])
+            query = query.order_by(Tag.name)
+        tags = (await self.session.scalars(query.limit(size + 1))).all()
+        return list(tags[:size]), len(tags) > size
+
+    async def get_names(self, limit: int) -> List[tuple[str, int]]:
+        """(name, id) de hasta `limit` tags no eliminadas, para construir el índice de autocompletado."""
+        result = await self.session.execute(select(Tag.name, Tag.id).where(Tag.deleted_at.is_(None)).limit(limit))
+        return [(name, id) for name, id in result]
+
+    async def suggest(self, prefix: str, limit: int) -> List[dict[str, Any]]:
+        """
+        Tags cuyo nombre empieza por `prefix` (sin distinguir mayúsculas), en orden alfabético.
+        Se responden desde el índice en memoria; si hay demasiadas tags para tenerlo en memoria se
+        consulta la base de datos con el índice ix_tag_name_lower_active.
+        """
+        index = await tag_name_index.get(self.get_names)
+        if index is not None:
+            return [{"id": id, "name": name} for name, id in index.search(prefix, limit)]
+        name_lower = func.lower(Tag.name)
+        if self.session.bind.dialect.name == "postgresql":
+            matches = name_lower.like(escape_like(prefix.lower()) + "%", escape="\\")
+        else:
+            # El índice de SQLite sirve para rangos, no para LIKE sobre una expresión
+            matches = and_(name_lower >= prefix.lower(), name_lower < prefix.lower() + "\U0010ffff")
+        result = await self.session.execute(
+            select(Tag.id, Tag.name)
+            .where(matches, Tag.deleted_at.is_(None))
+            .order_by(name_lower, Tag.name)
+            .limit(limit)
+        )
+        return [{"id": id, "name": name} for id, name in result]
 
     async def get_by_id(self, id: int) -> Optional[Tag]:
         result = await self.session.execute(select(Tag).where(Tag.id == id, Tag.deleted_at.is_(None)))
@@ -30,10 +85,16 @@ class RepositoryTagPostgres(RepositoryBase):
         return tag
 
     async def create(self, schema: TagIn, user_id: int) -> Optional[Tag]:
-        tag = Tag(**schema.model_dump(), user_id=user_id)
-        self.session.add(tag)
+        """
+        Crea la tag con TagResolver, que revive la tag eliminada con ese nombre si existe (el nombre
+        es único también entre las eliminadas). Una tag no eliminada con el nombre es un conflicto.
+        """
+        existing = await self.session.scalar(select(Tag.id).where(Tag.name == schema.name, Tag.deleted_at.is_(None)))
+        if existing is not None:
+            raise RepositoryAlreadyExistsException(entity_name="Tag", name=schema.name)
+        [tag] = await TagResolver(self.session).resolve([schema.name], user_id)
         await self.session.commit()
-        await self.session.refresh(tag)
+        response_cache.invalidate("tags")
         return tag
 
     async def update(self, id: int, schema: TagPut, user_id: int) -> Optional[Tag]:
@@ -47,8 +108,15 @@ class RepositoryTagPostgres(RepositoryBase):
         # Actualizar los atributos del tag existente
         for key, value in update_tag_data.items():
             setattr(tag, key, value)
+        await record_events(
+            self.session,
+            "tag",
+            "updated",
+            [(tag.id, {"user_id": user_id, "name": tag.name, "fields": sorted(update_tag_data)})],
+        )
         await self.session.commit()
-        await self.session.refresh(tag)
+        response_cache.invalidate("tags")
+        tag_name_index.invalidate()
         return tag
 
     async def delete(self, id: int, user_id: int) -> None:
@@ -62,4 +130,11 @@ class RepositoryTagPostgres(RepositoryBase):
             raise RepositoryNotFoundException(f"Not found tag with id {id} for the user with id {user_id}")
         tag.soft_delete()
         tag.posts.clear()
+        # Sin filas en post_tag: si se restaura (TagResolver) empieza sin posts
+        tag.post_count = 0
+        await record_events(self.session, "tag", "deleted", [(tag.id, {"user_id": user_id, "name": tag.name})])
         await self.session.commit()
+        response_cache.invalidate("tags")
+        # Los totales de posts filtrados por tag dependen de post_tag
+        invalidate_counts("posts")
+        tag_name_index.invalidate()
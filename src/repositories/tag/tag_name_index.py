@@ -0,0 +1,32 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.config import env_float, env_int
+from src.core.prefix_index import RefreshingPrefixIndex
+
+TAG_INDEX_MAX_ENTRIES = env_int("TAG_INDEX_MAX_ENTRIES", 100_000)
+TAG_INDEX_TTL_SECONDS = env_float("TAG_INDEX_TTL_SECONDS", 30)
+
+# Nombre -> id de las tags no eliminadas, para el autocompletado. Se invalida al crear, renombrar,
+# eliminar o revivir tags en este proceso; las escrituras de otros procesos se ven tras el TTL
+tag_name_index: RefreshingPrefixIndex[int] = RefreshingPrefixIndex(TAG_INDEX_MAX_ENTRIES, TAG_INDEX_TTL_SECONDS)
+
+
+def invalidate_after_commit(session: AsyncSession) -> None:
+    """
+    Invalida el índice cuando se confirme la transacción de la sesión. Invalidarlo antes dejaría
+    que una búsqueda entre medias lo reconstruyera sin el cambio, y así seguiría hasta el TTL.
+    """
+    session.info["tag_names_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_tag_names(session: Session) -> None:
+    if session.info.pop("tag_names_changed", False):
+        tag_name_index.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_tag_names(session: Session) -> None:
+    session.info.pop("tag_names_changed", None)
@@ -0,0 +1,85 @@
+from typing import List, Sequence
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.models.models import Tag
+from src.repositories.outbox import record_events
+from src.repositories.tag.tag_name_index import invalidate_after_commit
+
+
+class TagResolver:
+    """
+    Resuelve una lista de nombres de tags a instancias de Tag con un número constante de
+    consultas, sin importar cuántos tags tenga la lista:
+
+    1. Un SELECT ... WHERE name IN (...) para los existentes.
+    2. Un UPDATE para revivir los que estaban eliminados.
+    3. Un INSERT ... ON CONFLICT DO NOTHING RETURNING para los que faltan.
+
+    No hace commit, los cambios quedan en la transacción de la sesión. Si crea o revive tags, el
+    índice de nombres (tag_name_index) se invalida cuando se confirme esa transacción.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def resolve(self, names: Sequence[str], user_id: int) -> List[Tag]:
+        names = list(dict.fromkeys(names))  # Sin duplicados y manteniendo el orden
+        if not names:
+            return []
+
+        tags_by_name = await self._get_existing(names)
+
+        missing = [name for name in names if name not in tags_by_name]
+        if missing:
+            invalidate_after_commit(self.session)
+            tags_by_name.update(await self._insert_missing(missing, user_id))
+            # Puede ocurrir que otro proceso haya creado alguno justo antes del insert
+            conflicted = [name for name in missing if name not in tags_by_name]
+            if conflicted:
+                tags_by_name.update(await self._get_existing(conflicted))
+
+        return [tags_by_name[name] for name in names]
+
+    async def _get_existing(self, names: Sequence[str]) -> dict[str, Tag]:
+        result = await self.session.scalars(select(Tag).where(Tag.name.in_(names)))
+        tags_by_name = {tag.name: tag for tag in result}
+
+        deleted = [tag for tag in tags_by_name.values() if tag.deleted_at is not None]
+        if deleted:
+            invalidate_after_commit(self.session)
+            await self.session.execute(
+                update(Tag)
+                .where(Tag.id.in_([tag.id for tag in deleted]))
+                .values(deleted_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            for tag in deleted:
+                set_committed_value(tag, "deleted_at", None)
+            await record_events(
+                self.session,
+                "tag",
+                "restored",
+                [(tag.id, {"user_id": tag.user_id, "name": tag.name}) for tag in deleted],
+            )
+
+        return tags_by_name
+
+    async def _insert_missing(self, names: Sequence[str], user_id: int) -> dict[str, Tag]:
+        rows = [{"name": name, "user_id": user_id} for name in names]
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            statement = postgresql_insert(Tag).values(rows).on_conflict_do_nothing(index_elements=[Tag.name])
+        elif dialect == "sqlite":
+            statement = sqlite_insert(Tag).values(rows).on_conflict_do_nothing(index_elements=[Tag.name])
+        else:
+            statement = insert(Tag).values(rows)
+        inserted = (await self.session.scalars(statement.returning(Tag))).all()
+        await record_events(
+            self.session, "tag", "created", [(tag.id, {"user_id": user_id, "name": tag.name}) for tag in inserted]
+        )
+        return {tag.name: tag for tag in inserted}
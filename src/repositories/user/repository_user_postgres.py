@@ -3,7 +3,8 @@ from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.security import get_by_username, get_password_hash, verify_password
+from src.api.security import get_by_username, get_password_hash, invalidate_user, verify_password
+from src.core.http_cache import response_cache
 from src.models.models import User
 from src.repositories.exceptions import RepositoryAlreadyExistsException, RepositoryNotFoundException
 from src.repositories.repository_base import RepositoryBase
@@ -30,12 +31,11 @@ class RepositoryUserPostgres(RepositoryBase):
 
     async def create(self, schema: UserIn) -> Optional[User]:
         user_dict = schema.model_dump()
-        user_dict["password"] = get_password_hash(schema.password)
+        user_dict["password"] = await get_password_hash(schema.password)
         user = User(**user_dict)
         try:
             self.session.add(user)
             await self.session.commit()
-            await self.session.refresh(user)
             return user
         except IntegrityError:
             await self.session.rollback()
@@ -50,7 +50,8 @@ class RepositoryUserPostgres(RepositoryBase):
         for key, value in update_user_data.items():
             setattr(user, key, value)
         await self.session.commit()
-        await self.session.refresh(user)
+        response_cache.invalidate("users")
+        invalidate_user(id)
         return user
 
     async def delete(self, id: int) -> None:
@@ -59,11 +60,13 @@ class RepositoryUserPostgres(RepositoryBase):
             raise RepositoryNotFoundException(entity_name="User", id=id)
         user.soft_delete()
         await self.session.commit()
+        response_cache.invalidate("users")
+        invalidate_user(id)
 
     async def authenticate_user(self, username: str, password: str) -> UserInDB:
         user: UserInDB | None = await get_by_username(self.session, username)
         if not user:
             return None
-        if verify_password(password, user.hashed_password):
+        if await verify_password(password, user.hashed_password):
             return user
         return None
@@ -25,6 +25,13 @@ class CommentOut(CommentBase):
     updated_at: datetime
 
 
+class CommentSummaryOut(BaseModel):
+    id: int
+    post_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
 class CommentForPostOut(BaseModel):
     id: int
     user: UserForShowOut
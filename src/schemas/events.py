@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Any, List, Literal
+
+from pydantic import BaseModel
+
+
+class EventOut(BaseModel):
+    # Posición en el stream: los eventos se entregan en orden de id
+    id: int
+    entity: Literal["post", "comment", "tag"]
+    entity_id: int
+    action: Literal["created", "updated", "deleted", "restored"]
+    data: dict[str, Any]
+    created_at: datetime
+
+
+class EventPageOut(BaseModel):
+    items: List[EventOut]
+    # Valor de `after` para pedir los siguientes eventos
+    next_after: int
@@ -1,4 +1,9 @@
-from typing import Generic, List, TypeVar
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Any, Generic, List, Literal, Optional, TypeVar
 
 from pydantic import BaseModel
 
@@ -7,10 +12,13 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
+    total: Optional[int]
     page: int
     size: int
-    pages: int
+    pages: Optional[int]
+    next_cursor: Optional[str] = None
+    # Cómo se obtuvo `total`: contado, estimado por el planificador o sin contar (total = None)
+    count: Literal["exact", "estimate", "none"] = "exact"
 
     model_config = {
         "json_schema_extra": {
@@ -20,6 +28,57 @@ class PaginatedResponse(BaseModel, Generic[T]):
                 "page": 2,
                 "size": 10,
                 "pages": 16,
+                "next_cursor": "WyIyMDI1LTExLTAzVDEwOjAwOjAwIiwxNDZd",
+                "count": "exact",
             }
         }
     }
+
+
+def count_pages(total: Optional[int], size: int) -> Optional[int]:
+    if total is None:
+        return None
+    return math.ceil(total / size) if total > 0 else 0
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    items: List[T]
+    size: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "items": [],
+                "size": 10,
+                "next_cursor": "WyIyMDI1LTExLTAzVDEwOjAwOjAwIiwxNDZd",
+                "total": None,
+            }
+        }
+    }
+
+
+def encode_cursor(*values: Any) -> str:
+    """Codifica los valores de la clave de ordenación en un cursor opaco."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Decodifica un cursor generado por encode_cursor. Lanza ValueError si es inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise ValueError("Invalid cursor")
+    values = []
+    for value, type_ in zip(payload, types):
+        try:
+            values.append(datetime.fromisoformat(value) if type_ is datetime else type_(value))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+    return tuple(values)
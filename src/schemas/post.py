@@ -3,6 +3,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from src.schemas.comment import CommentForPostOut
+from src.schemas.pagination import PaginatedResponse
 from src.schemas.tags import TagForPostOut
 from src.schemas.user import UserForShowOut
 
@@ -27,7 +29,29 @@ class PostOut(PostBase):
     id: int
     author: UserForShowOut = Field(..., validation_alias="user")
     tags: Optional[List[TagForPostOut]] = None
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True, "populate_by_name": True}
+
+
+class PostSummaryOut(BaseModel):
+    id: int
+    title: str
+    comment_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class PostSearchOut(PostOut):
+    # Relevancia del post para la búsqueda (mayor es más relevante)
+    rank: float
+    # Fragmento del contenido con los términos encontrados entre <mark> y </mark> (texto escapado)
+    snippet: str
+
+
+class PostDetailOut(PostOut):
+    comments: PaginatedResponse[CommentForPostOut]
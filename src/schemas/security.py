@@ -19,3 +19,4 @@ class User(BaseModel):
 
 class UserInDB(User):
     hashed_password: str
+    version: int | None = None
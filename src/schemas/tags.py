@@ -18,6 +18,7 @@ class TagPut(TagBase):
 class TagOut(TagBase):
     id: int
     user_id: int
+    post_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -25,3 +26,8 @@ class TagOut(TagBase):
 class TagForPostOut(TagBase):
     id: int
     name: str
+
+
+class TagSuggestionOut(BaseModel):
+    id: int
+    name: str
@@ -50,6 +50,7 @@ class UserPut(BaseModel):
 
 class UserOut(UserBase):
     id: int
+    follower_count: int = 0
     created_at: datetime
     updated_at: datetime
     deleted_at: datetime | None = None
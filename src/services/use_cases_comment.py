@@ -1,25 +1,88 @@
-from typing import Sequence
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence
 
+from src.core.cache import Cache, cache
+from src.core.single_flight import SingleFlight, comment_reads, post_reads
 from src.models.models import Comment
+from src.repositories.counting import CountMode
 from src.repositories.repository_base import RepositoryBase
-from src.schemas.comment import CommentIn, CommentPut
+from src.schemas.comment import CommentIn, CommentOut, CommentPut, CommentSummaryOut
 
 
 class UseCasesComment:
-    def __init__(self, repository: RepositoryBase):
+    def __init__(self, repository: RepositoryBase, cache: Cache = cache, reads: SingleFlight = comment_reads):
         self.repository = repository
+        self.cache = cache
+        # Las lecturas concurrentes con los mismos argumentos y la misma base de datos comparten una
+        # sola consulta. Sólo las que devuelven modelos de lectura: las instancias ORM pertenecen a
+        # la sesión de quien hizo la consulta
+        self.reads = reads
+
+    def _forget_reads(self) -> None:
+        # El detalle de un post incluye sus primeros comentarios
+        self.reads.forget()
+        post_reads.forget()
 
     async def create_comment(self, comment: CommentIn, user_id: int, post_id: int) -> Comment:
-        return await self.repository.create(comment, user_id, post_id)
+        created = await self.repository.create(comment, user_id, post_id)
+        self._forget_reads()
+        # El post cacheado muestra su número de comentarios
+        await self.cache.invalidate_tags(f"post:{post_id}")
+        return created
 
     async def get_comment(self, id: int) -> Comment:
         return await self.repository.get_by_id(id)
 
-    async def get_all_comments(self, post_id: int, page: int = 1, size: int = 10) -> tuple[Sequence[Comment], int]:
-        return await self.repository.get_all(post_id, page, size)
+    async def get_comment_out(self, id: int) -> CommentOut:
+        """El comentario ya serializado como CommentOut (para GET /comments/{id})."""
+        return await self.reads.do(
+            (self.repository.read_scope(), "get_comment_out", id),
+            lambda: self._get_comment_out(id),
+        )
+
+    async def _get_comment_out(self, id: int) -> CommentOut:
+        return CommentOut.model_validate(await self.repository.get_by_id(id), from_attributes=True)
+
+    async def get_all_comments(
+        self, post_id: int, page: int = 1, size: int = 10, count: CountMode = "exact"
+    ) -> tuple[List[CommentOut], Optional[int], CountMode]:
+        return await self.reads.do(
+            (self.repository.read_scope(), "get_all_comments", post_id, page, size, count),
+            lambda: self._get_all_comments(post_id, page, size, count),
+        )
+
+    async def _get_all_comments(
+        self, post_id: int, page: int, size: int, count: CountMode
+    ) -> tuple[List[CommentOut], Optional[int], CountMode]:
+        comments, total, count = await self.repository.get_all(post_id, page, size, count)
+        return [CommentOut.model_validate(comment, from_attributes=True) for comment in comments], total, count
+
+    async def get_user_comments(
+        self, user_id: int, size: int = 10, after: tuple[datetime, int] | None = None, summary: bool = False
+    ) -> tuple[List[CommentOut] | List[CommentSummaryOut], int, bool]:
+        return await self.reads.do(
+            (self.repository.read_scope(), "get_user_comments", user_id, size, after, summary),
+            lambda: self._get_user_comments(user_id, size, after, summary),
+        )
+
+    async def _get_user_comments(
+        self, user_id: int, size: int, after: tuple[datetime, int] | None, summary: bool
+    ) -> tuple[List[CommentOut] | List[CommentSummaryOut], int, bool]:
+        comments, total, has_more = await self.repository.get_by_user_keyset(user_id, size, after, summary)
+        schema = CommentSummaryOut if summary else CommentOut
+        return [schema.model_validate(comment, from_attributes=True) for comment in comments], total, has_more
+
+    def export_comments(
+        self, post_id: int | None = None, fetch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Mapping[str, Any]]]:
+        return self.repository.stream_all(post_id, fetch_size)
 
     async def update_comment(self, id: int, comment: CommentPut, user_id: int) -> Comment:
-        return await self.repository.update(id, comment, user_id)
+        updated = await self.repository.update(id, comment, user_id)
+        self._forget_reads()
+        return updated
 
     async def delete_comment(self, id: int, user_id: int) -> None:
-        await self.repository.delete(id, user_id)
+        deleted = await self.repository.delete(id, user_id)
+        self._forget_reads()
+        await self.cache.invalidate_tags(f"post:{deleted.post_id}")
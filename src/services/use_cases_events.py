@@ -0,0 +1,69 @@
+import asyncio
+from typing import AsyncIterator, List
+
+from src.core.config import env_float
+from src.core.notifier import Notifier
+from src.repositories.outbox import RepositoryOutboxPostgres, outbox_notifier
+from src.schemas.events import EventOut, EventPageOut
+
+# Los cambios de este proceso despiertan a los lectores al momento; los de otros procesos se ven
+# como mucho tras este intervalo
+OUTBOX_POLL_INTERVAL_SECONDS = env_float("OUTBOX_POLL_INTERVAL_SECONDS", 1)
+# Segundos sin eventos tras los que el stream envía un comentario para mantener viva la conexión
+OUTBOX_HEARTBEAT_SECONDS = env_float("OUTBOX_HEARTBEAT_SECONDS", 15)
+
+
+class UseCasesEvents:
+    def __init__(
+        self,
+        repository: RepositoryOutboxPostgres,
+        notifier: Notifier = outbox_notifier,
+        poll_interval: float = OUTBOX_POLL_INTERVAL_SECONDS,
+    ):
+        self.repository = repository
+        self.notifier = notifier
+        self.poll_interval = poll_interval
+
+    async def _get_after(self, after: int, limit: int) -> List[EventOut]:
+        return [
+            EventOut.model_validate(row, from_attributes=True) for row in await self.repository.get_after(after, limit)
+        ]
+
+    async def get_events(self, after: int, limit: int, wait: float = 0) -> EventPageOut:
+        """
+        Eventos posteriores a `after`. Si no hay ninguno espera hasta `wait` segundos a que se
+        confirme alguno (long-poll) antes de devolver una página vacía.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            version = self.notifier.version
+            events = await self._get_after(after, limit)
+            remaining = deadline - loop.time()
+            if events or remaining <= 0:
+                return EventPageOut(items=events, next_after=events[-1].id if events else after)
+            await self.notifier.wait(min(self.poll_interval, remaining), version)
+
+    async def stream_events(
+        self, after: int, limit: int, heartbeat: float = OUTBOX_HEARTBEAT_SECONDS
+    ) -> AsyncIterator[List[EventOut]]:
+        """
+        Genera los eventos posteriores a `after` por lotes, y después cada lote nuevo en cuanto
+        se confirma. Tras `heartbeat` segundos sin eventos genera un lote vacío.
+        """
+        loop = asyncio.get_running_loop()
+        idle_since = loop.time()
+        while True:
+            version = self.notifier.version
+            events = await self._get_after(after, limit)
+            if events:
+                after = events[-1].id
+                idle_since = loop.time()
+                yield events
+                continue
+            idle = loop.time() - idle_since
+            if idle >= heartbeat:
+                idle_since = loop.time()
+                yield []
+                continue
+            await self.notifier.wait(min(self.poll_interval, heartbeat - idle), version)
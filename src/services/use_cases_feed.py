@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Any, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import Cache, cache
+from src.core.jobs import job_queue
+from src.models.models import Post
+from src.repositories.feed.repository_feed_postgres import RepositoryFeedPostgres
+
+# Trabajo en segundo plano que copia posts recién creados en los feeds: {"post_ids": [...]}
+FAN_OUT_JOB = "feed.fan_out"
+
+
+@job_queue.handler(FAN_OUT_JOB)
+async def fan_out_posts(session: AsyncSession, payload: dict[str, Any]) -> None:
+    await RepositoryFeedPostgres(session).fan_out(payload["post_ids"])
+
+
+class UseCasesFeed:
+    def __init__(self, repository: RepositoryFeedPostgres, cache: Cache = cache):
+        self.repository = repository
+        self.cache = cache
+
+    async def follow_user(self, follower_id: int, followee_id: int) -> None:
+        await self.repository.follow_user(follower_id, followee_id)
+        # El perfil cacheado muestra follower_count
+        await self.cache.invalidate_tags(f"user:{followee_id}")
+
+    async def unfollow_user(self, follower_id: int, followee_id: int) -> None:
+        await self.repository.unfollow_user(follower_id, followee_id)
+        await self.cache.invalidate_tags(f"user:{followee_id}")
+
+    async def follow_tag(self, user_id: int, tag_id: int) -> None:
+        await self.repository.follow_tag(user_id, tag_id)
+
+    async def unfollow_tag(self, user_id: int, tag_id: int) -> None:
+        await self.repository.unfollow_tag(user_id, tag_id)
+
+    async def get_feed(
+        self, user_id: int, size: int = 10, after: tuple[datetime, int] | None = None
+    ) -> tuple[List[Post], bool]:
+        return await self.repository.get_feed(user_id, size, after)
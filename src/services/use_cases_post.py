@@ -1,31 +1,200 @@
-from typing import List, Sequence
+import math
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence
 
+from pydantic import ValidationError
+
+from src.core.cache import Cache, cache
+from src.core.jobs import JobQueue
+from src.core.single_flight import SingleFlight, post_reads, tag_reads
 from src.models.models import Post
+from src.repositories.counting import CountMode
+from src.repositories.exceptions import RepositoryException
+from src.repositories.post.repository_post_postgres import TagMatchMode
 from src.repositories.repository_base import RepositoryBase
-from src.schemas.post import PostIn, PostPut
+from src.schemas.comment import CommentForPostOut
+from src.schemas.pagination import PaginatedResponse
+from src.schemas.post import PostDetailOut, PostIn, PostOut, PostPut, PostSearchOut
+from src.services.use_cases_feed import FAN_OUT_JOB
 
 
 class UseCasesPost:
-    def __init__(self, repository: RepositoryBase):
+    def __init__(
+        self,
+        repository: RepositoryBase,
+        cache: Cache = cache,
+        reads: SingleFlight = post_reads,
+        jobs: Optional[JobQueue] = None,
+    ):
         self.repository = repository
+        self.cache = cache
+        # Las lecturas concurrentes con los mismos argumentos y la misma base de datos comparten una
+        # sola consulta. Sólo las que devuelven modelos de lectura: las instancias ORM pertenecen a
+        # la sesión de quien hizo la consulta
+        self.reads = reads
+        # Cola para los efectos que no hace falta esperar (ej: copiar los posts creados en los feeds)
+        self.jobs = jobs
+
+    def _forget_reads(self) -> None:
+        # Las escrituras de posts pueden crear tags, así que también afectan a las lecturas de tags
+        self.reads.forget()
+        tag_reads.forget()
 
     async def create_post(self, post: PostIn, user_id: int) -> Post:
-        return await self.repository.create(post, user_id)
+        created = await self.repository.create(post, user_id)
+        if self.jobs is not None:
+            await self.jobs.enqueue(FAN_OUT_JOB, {"post_ids": [created.id]})
+        self._forget_reads()
+        if post.tags:
+            await self.cache.invalidate_tags("tag-list")
+        return created
+
+    async def import_posts(
+        self, lines: AsyncIterator[tuple[int, bytes]], user_id: int, batch_size: int = 100
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Valida cada línea como PostIn y los inserta por lotes de `batch_size`.
+        Genera un resultado por línea, en orden, a medida que se procesa cada lote.
+        """
+        batch: list[tuple[int, PostIn | dict[str, Any]]] = []
+        try:
+            async for line_number, line in lines:
+                try:
+                    batch.append((line_number, PostIn.model_validate_json(line)))
+                except ValidationError as exc:
+                    errors = exc.errors(include_url=False, include_context=False, include_input=False)
+                    batch.append((line_number, {"line": line_number, "status": "error", "detail": errors}))
+                if len(batch) >= batch_size:
+                    for result in await self._import_batch(batch, user_id):
+                        yield result
+                    batch = []
+        except ValueError as exc:
+            batch.append((0, {"line": None, "status": "error", "detail": str(exc)}))
+        for result in await self._import_batch(batch, user_id):
+            yield result
+
+    async def _import_batch(
+        self, batch: list[tuple[int, PostIn | dict[str, Any]]], user_id: int
+    ) -> list[dict[str, Any]]:
+        posts = [(line_number, item) for line_number, item in batch if isinstance(item, PostIn)]
+        created: dict[int, dict[str, Any]] = {}
+        if posts:
+            try:
+                ids = await self.repository.create_many([post for _, post in posts], user_id)
+                if self.jobs is not None:
+                    await self.jobs.enqueue(FAN_OUT_JOB, {"post_ids": ids})
+                self._forget_reads()
+                if any(post.tags for _, post in posts):
+                    await self.cache.invalidate_tags("tag-list")
+                created = {
+                    line_number: {"line": line_number, "status": "created", "id": id}
+                    for (line_number, _), id in zip(posts, ids)
+                }
+            except RepositoryException as exc:
+                created = {
+                    line_number: {"line": line_number, "status": "error", "detail": str(exc)}
+                    for line_number, _ in posts
+                }
+        return [created[line_number] if isinstance(item, PostIn) else item for line_number, item in batch]
 
     async def get_post(self, id: int) -> Post:
         return await self.repository.get_by_id(id)
 
-    async def get_all_posts(self, page: int = 1, size: int = 10) -> tuple[Sequence[Post], int]:
-        return await self.repository.get_all(page, size)
+    async def get_cached_post(self, id: int) -> PostOut:
+        """El post ya serializado como PostOut, desde la caché compartida (para GET /posts/{id})."""
+        # El post incluye el autor y los nombres de sus tags: depende de las tres etiquetas.
+        # Sólo se guarda lo leído del primario (ver Cache)
+        return await self.reads.do(
+            (self.repository.read_scope(), "get_cached_post", id),
+            lambda: self.cache.get_or_compute(
+                f"post:{id}",
+                lambda: self.repository.get_by_id(id),
+                PostOut,
+                tags=(f"post:{id}", "tags", "users"),
+                scope=self.repository.read_scope(),
+                store=not self.repository.reads_from_replica(),
+            ),
+        )
+
+    async def get_post_with_comments(self, id: int, comments_size: int = 10) -> PostDetailOut:
+        return await self.reads.do(
+            (self.repository.read_scope(), "get_post_with_comments", id, comments_size),
+            lambda: self._get_post_with_comments(id, comments_size),
+        )
+
+    async def _get_post_with_comments(self, id: int, comments_size: int) -> PostDetailOut:
+        post, comments, total = await self.repository.get_by_id_with_comments(id, comments_size)
+        page = {"items": comments, "total": total, "page": 1, "size": comments_size}
+        return PostDetailOut(
+            **PostOut.model_validate(post, from_attributes=True).model_dump(),
+            comments=PaginatedResponse[CommentForPostOut].model_validate(
+                {**page, "pages": math.ceil(total / comments_size)}, from_attributes=True
+            ),
+        )
+
+    async def get_all_posts(
+        self,
+        page: int = 1,
+        size: int = 10,
+        count: CountMode = "exact",
+        tags: Sequence[str] = (),
+        mode: TagMatchMode = "all",
+        exclude: Sequence[str] = (),
+    ) -> tuple[Sequence[Post], Optional[int], CountMode]:
+        return await self.repository.get_all(page, size, count, tags, mode, exclude)
+
+    async def get_all_posts_keyset(
+        self,
+        size: int = 10,
+        after: tuple[datetime, int] | None = None,
+        with_total: bool = False,
+        tags: Sequence[str] = (),
+        mode: TagMatchMode = "all",
+        exclude: Sequence[str] = (),
+    ) -> tuple[Sequence[Post], Optional[int], bool]:
+        return await self.repository.get_all_keyset(size, after, with_total, tags, mode, exclude)
+
+    async def search_posts(
+        self, q: str, size: int = 10, after: tuple[float, int] | None = None
+    ) -> tuple[List[PostSearchOut], bool]:
+        return await self.reads.do(
+            (self.repository.read_scope(), "search_posts", q, size, after), lambda: self._search_posts(q, size, after)
+        )
+
+    async def _search_posts(
+        self, q: str, size: int, after: tuple[float, int] | None
+    ) -> tuple[List[PostSearchOut], bool]:
+        results, has_more = await self.repository.search(q, size, after)
+        posts = [
+            PostSearchOut(
+                **PostOut.model_validate(post, from_attributes=True).model_dump(), rank=hit.rank, snippet=hit.snippet
+            )
+            for post, hit in results
+        ]
+        return posts, has_more
+
+    def export_posts(self, fetch_size: int = 1000) -> AsyncIterator[Sequence[Mapping[str, Any]]]:
+        return self.repository.stream_all(fetch_size)
 
     async def update_post(self, id: int, post: PostPut, user_id: int) -> Post:
-        return await self.repository.update(id, post, user_id)
+        updated = await self.repository.update(id, post, user_id)
+        self._forget_reads()
+        await self.cache.invalidate_tags(f"post:{id}", *(["tag-list"] if post.tags is not None else []))
+        return updated
 
     async def delete_post(self, id: int, user_id: int) -> None:
         await self.repository.delete(id, user_id)
+        self._forget_reads()
+        # El listado de tags muestra cuántos posts tiene cada una
+        await self.cache.invalidate_tags(f"post:{id}", "tag-list")
 
     async def get_posts_by_user(self, user_id: int) -> List[Post]:
         return await self.repository.get_by_user_id(user_id)
 
+    async def get_user_posts(
+        self, user_id: int, size: int = 10, after: tuple[datetime, int] | None = None, summary: bool = False
+    ) -> tuple[Sequence[Post], int, bool]:
+        return await self.repository.get_by_user_keyset(user_id, size, after, summary)
+
     async def get_posts_by_tag(self, tag: str) -> List[Post]:
         return await self.repository.get_by_tag(tag)
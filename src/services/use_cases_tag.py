@@ -1,25 +1,75 @@
-from typing import List
+from typing import Any, List
 
+from src.core.cache import Cache, cache
+from src.core.single_flight import SingleFlight, post_reads, tag_reads
 from src.models.models import Tag
 from src.repositories.repository_base import RepositoryBase
-from src.schemas.tags import TagIn, TagPut
+from src.repositories.tag.repository_tag_postgres import TagSort
+from src.schemas.pagination import CursorPaginatedResponse, encode_cursor
+from src.schemas.tags import TagIn, TagOut, TagPut, TagSuggestionOut
 
 
 class UseCasesTag:
-    def __init__(self, repository: RepositoryBase):
+    def __init__(self, repository: RepositoryBase, cache: Cache = cache, reads: SingleFlight = tag_reads):
         self.repository = repository
+        self.cache = cache
+        # Las lecturas concurrentes con los mismos argumentos y la misma base de datos comparten una
+        # sola consulta. Sólo las que devuelven modelos de lectura: las instancias ORM pertenecen a
+        # la sesión de quien hizo la consulta
+        self.reads = reads
+
+    def _forget_reads(self) -> None:
+        # Los posts muestran el nombre de sus tags
+        self.reads.forget()
+        post_reads.forget()
 
     async def create_tag(self, tag: TagIn, user_id: int) -> Tag:
-        return await self.repository.create(tag, user_id)
+        created = await self.repository.create(tag, user_id)
+        self.reads.forget()
+        await self.cache.invalidate_tags("tag-list")
+        return created
 
     async def get_tag(self, id: int) -> Tag:
         return await self.repository.get_by_id(id)
 
-    async def get_all_tags(self) -> List[Tag]:
-        return await self.repository.get_all()
+    async def get_all_tags(
+        self, size: int = 50, after: tuple[Any, ...] | None = None, sort: TagSort = "name"
+    ) -> CursorPaginatedResponse[TagOut]:
+        return await self.reads.do(
+            (self.repository.read_scope(), "get_all_tags", size, after, sort),
+            lambda: self.cache.get_or_compute(
+                f"tags:{sort}:{size}:{after!r}",
+                lambda: self._get_all_tags(size, after, sort),
+                CursorPaginatedResponse[TagOut],
+                tags=("tag-list",),
+                scope=self.repository.read_scope(),
+                store=not self.repository.reads_from_replica(),
+            ),
+        )
+
+    async def _get_all_tags(
+        self, size: int, after: tuple[Any, ...] | None, sort: TagSort
+    ) -> CursorPaginatedResponse[TagOut]:
+        tags, has_more = await self.repository.get_all(size, after, sort)
+        next_cursor = None
+        if has_more:
+            last = tags[-1]
+            next_cursor = encode_cursor(last.post_count, last.id) if sort == "popular" else encode_cursor(last.name)
+        return CursorPaginatedResponse[TagOut](
+            items=[TagOut.model_validate(tag, from_attributes=True) for tag in tags], size=size, next_cursor=next_cursor
+        )
+
+    async def suggest_tags(self, prefix: str, limit: int = 10) -> List[TagSuggestionOut]:
+        return [TagSuggestionOut(**tag) for tag in await self.repository.suggest(prefix, limit)]
 
     async def update_tag(self, id: int, tag: TagPut, user_id: int) -> Tag:
-        return await self.repository.update(id, tag, user_id)
+        updated = await self.repository.update(id, tag, user_id)
+        self._forget_reads()
+        # "tags" invalida también los posts cacheados, que muestran el nombre de sus tags
+        await self.cache.invalidate_tags("tags", "tag-list")
+        return updated
 
     async def delete_tag(self, id: int, user_id: int) -> None:
         await self.repository.delete(id, user_id)
+        self._forget_reads()
+        await self.cache.invalidate_tags("tags", "tag-list")
@@ -1,28 +1,41 @@
 from typing import List
 
+from src.core.cache import Cache, cache
 from src.models.models import User
 from src.repositories.repository_base import RepositoryBase
-from src.schemas.user import UserIn, UserPut
+from src.schemas.user import UserIn, UserOut, UserPut
 
 
 class UseCasesUser:
-    def __init__(self, repository: RepositoryBase):
+    def __init__(self, repository: RepositoryBase, cache: Cache = cache):
         self.repository = repository
+        self.cache = cache
 
     async def create_user(self, user: UserIn) -> User:
         return await self.repository.create(user)
 
-    async def get_user(self, id: int) -> User:
-        return await self.repository.get_by_id(id)
+    async def get_user(self, id: int) -> UserOut:
+        return await self.cache.get_or_compute(
+            f"user:{id}",
+            lambda: self.repository.get_by_id(id),
+            UserOut,
+            tags=(f"user:{id}",),
+            scope=self.repository.read_scope(),
+            store=not self.repository.reads_from_replica(),
+        )
 
     async def get_all_users(self) -> List[User]:
         return await self.repository.get_all()
 
     async def update_user(self, id: int, user: UserPut) -> User:
-        return await self.repository.update(id, user)
+        updated = await self.repository.update(id, user)
+        # "users" invalida también los posts cacheados, que muestran a su autor
+        await self.cache.invalidate_tags(f"user:{id}", "users")
+        return updated
 
     async def delete_user(self, id: int) -> None:
         await self.repository.delete(id)
+        await self.cache.invalidate_tags(f"user:{id}", "users")
 
     async def authenticate_user(self, username: str, password: str) -> str:
         return await self.repository.authenticate_user(username, password)
@@ -1,5 +1,6 @@
 import os
 import sys
+from datetime import datetime, timezone
 
 import pytest  # type: ignore
 
@@ -30,7 +31,10 @@ def comment_put():
 
 @pytest.fixture
 def use_cases_comment_with_data():
-    memory_db = {1: Comment(id=1, content="This is a test comment", user_id=1, post_id=1)}
+    now = datetime.now(timezone.utc)
+    memory_db = {
+        1: Comment(id=1, content="This is a test comment", user_id=1, post_id=1, created_at=now, updated_at=now)
+    }
     repository = RepositoryCommentMemory(memory_db)
     return UseCasesComment(repository)
 
@@ -53,7 +57,8 @@ async def test_get_comment(use_cases_comment_with_data: UseCasesComment, comment
 
 @pytest.mark.comment
 async def test_get_all_comments(use_cases_comment_with_data: UseCasesComment, comment: CommentIn):
-    comments = await use_cases_comment_with_data.get_all_comments()
+    comments, total, _ = await use_cases_comment_with_data.get_all_comments(1)
+    assert total == 1
     assert len(comments) == 1
     assert comments[0].content == "This is a test comment"
     assert comments[0].user_id == 1
@@ -54,7 +54,8 @@ async def test_get_post(use_cases_post_with_data: UseCasesPost, post: PostIn):
 
 @pytest.mark.post
 async def test_get_all_posts(use_cases_post_with_data: UseCasesPost, post: PostIn):
-    posts = await use_cases_post_with_data.get_all_posts()
+    posts, total, _ = await use_cases_post_with_data.get_all_posts()
+    assert total == 1
     assert len(posts) == 1
     assert posts[0].title == "Test Post"
     assert posts[0].content == "This is a test post"
@@ -1,5 +1,6 @@
 import os
 import sys
+from datetime import datetime, timezone
 
 import pytest  # type: ignore
 
@@ -30,7 +31,9 @@ def tag_put():
 
 @pytest.fixture
 def use_cases_tag_with_data():
-    memory_db = {1: Tag(id=1, name="This is a test tag")}
+    now = datetime.now(timezone.utc)
+    # Los valores que en la base de datos pone el servidor (fechas y contador)
+    memory_db = {1: Tag(id=1, name="This is a test tag", user_id=1, post_count=0, created_at=now, updated_at=now)}
     repository = RepositoryTagMemory(memory_db)
     return UseCasesTag(repository)
 
@@ -49,7 +52,7 @@ async def test_get_tag(use_cases_tag_with_data: UseCasesTag, tag: TagIn):
 
 @pytest.mark.tag
 async def test_get_all_tags(use_cases_tag_with_data: UseCasesTag, tag: TagIn):
-    tags = await use_cases_tag_with_data.get_all_tags()
+    tags = (await use_cases_tag_with_data.get_all_tags()).items
     assert len(tags) == 1
     assert tags[0].name == "This is a test tag"
 
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.models.models import Base
+from src.repositories.post.post_search import create_search_index
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """Base de datos SQLite con el esquema de los modelos, en un fichero para admitir varias conexiones."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
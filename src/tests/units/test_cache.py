@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sys
+
+import pytest  # type: ignore
+from pydantic import BaseModel
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from core.cache import Cache, MemoryCacheBackend, RedisCacheBackend, encode_command, read_reply
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class Counter:
+    def __init__(self, name: str = "first", delay: float = 0):
+        self.calls = 0
+        self.name = name
+        self.delay = delay
+
+    async def __call__(self) -> Item:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return Item(id=1, name=self.name)
+
+
+def encode_reply(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    if value == "OK":
+        return b"+OK\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+@pytest.fixture
+async def fake_redis():
+    """Servidor local que entiende el subconjunto de comandos que usa RedisCacheBackend."""
+    data: dict[bytes, bytes] = {}
+    ttls: dict[bytes, int] = {}
+
+    async def handle(reader, writer):
+        while not reader.at_eof():
+            try:
+                command, *args = await read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                break
+            command = command.upper()
+            if command == b"MGET":
+                reply = [data.get(key) for key in args]
+            elif command == b"SET":
+                data[args[0]] = args[1]
+                ttls[args[0]] = int(args[3])
+                reply = "OK"
+            elif command == b"DEL":
+                reply = sum(data.pop(key, None) is not None for key in args)
+            writer.write(encode_reply(reply))
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"redis://127.0.0.1:{port}/0", data, ttls
+    server.close()
+
+
+def test_encode_command():
+    assert (
+        encode_command("SET", "k", b"v", "PX", 10)
+        == b"*5\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\nv\r\n$2\r\nPX\r\n$2\r\n10\r\n"
+    )
+
+
+async def test_get_or_compute_and_invalidate_memory():
+    cache = Cache(MemoryCacheBackend(maxsize=10, ttl=60))
+    compute = Counter()
+
+    assert await cache.get_or_compute("item:1", compute, Item, tags=("item:1",)) == Item(id=1, name="first")
+    assert await cache.get_or_compute("item:1", compute, Item, tags=("item:1",)) == Item(id=1, name="first")
+    assert compute.calls == 1
+
+    await cache.invalidate_tags("item:1")
+    await cache.get_or_compute("item:1", compute, Item, tags=("item:1",))
+    assert compute.calls == 2
+    assert cache.stats() == {"backend": "memory", "hits": 1, "misses": 2, "errors": 0}
+
+
+async def test_tag_versions_expire_after_entries():
+    backend = MemoryCacheBackend(maxsize=10, ttl=60)
+    cache = Cache(backend, ttl=0.05, tag_ttl=0.1)
+    compute = Counter()
+
+    await cache.invalidate_tags("item:1")
+    await cache.get_or_compute("item:1", compute, Item, tags=("item:1",))
+    await asyncio.sleep(0.15)
+    # Versión caducada: no queda ninguna entrada guardada con ella ni con la anterior
+    assert await cache.get_or_compute("item:1", compute, Item, tags=("item:1",)) == Item(id=1, name="first")
+    assert compute.calls == 2
+    assert backend.versions == {}
+
+
+async def test_concurrent_misses_compute_once():
+    cache = Cache(MemoryCacheBackend(maxsize=10, ttl=60))
+    compute = Counter(delay=0.01)
+
+    results = await asyncio.gather(*[cache.get_or_compute("item:1", compute, Item) for _ in range(10)])
+
+    assert compute.calls == 1
+    assert all(result == Item(id=1, name="first") for result in results)
+
+
+async def test_replica_reads_use_entries_but_do_not_store_them():
+    cache = Cache(MemoryCacheBackend(maxsize=10, ttl=60))
+
+    # Tras invalidar, lo que lee una réplica atrasada no se guarda con la versión nueva
+    await cache.invalidate_tags("item:1")
+    assert await cache.get_or_compute("item:1", Counter("stale"), Item, tags=("item:1",), store=False) == Item(
+        id=1, name="stale"
+    )
+    assert await cache.get_or_compute("item:1", Counter("fresh"), Item, tags=("item:1",)) == Item(id=1, name="fresh")
+    # La entrada guardada desde el primario sí se usa en las lecturas de la réplica
+    replica = Counter("stale")
+    assert await cache.get_or_compute("item:1", replica, Item, tags=("item:1",), store=False) == Item(
+        id=1, name="fresh"
+    )
+    assert replica.calls == 0
+
+
+async def test_concurrent_misses_only_share_the_computation_within_a_scope():
+    cache = Cache(MemoryCacheBackend(maxsize=10, ttl=60))
+    replica, primary = Counter("stale", delay=0.01), Counter("fresh", delay=0.01)
+
+    results = await asyncio.gather(
+        cache.get_or_compute("item:1", replica, Item, scope="replica", store=False),
+        cache.get_or_compute("item:1", primary, Item, scope="primary"),
+    )
+
+    assert [result.name for result in results] == ["stale", "fresh"]
+    assert (replica.calls, primary.calls) == (1, 1)
+
+
+async def test_redis_backend_is_shared_between_caches(fake_redis):
+    url, data, ttls = fake_redis
+    worker_a = Cache(RedisCacheBackend(url))
+    worker_b = Cache(RedisCacheBackend(url))
+
+    await worker_a.get_or_compute("item:1", Counter("first"), Item, tags=("items",))
+    assert await worker_b.get_or_compute("item:1", Counter("second"), Item, tags=("items",)) == Item(id=1, name="first")
+
+    await worker_b.invalidate_tags("items")
+    assert await worker_a.get_or_compute("item:1", Counter("third"), Item, tags=("items",)) == Item(id=1, name="third")
+    # La versión de la etiqueta caduca, pero nunca antes que las entradas guardadas con ella
+    assert ttls[b"cache:tag:items"] >= ttls[next(key for key in data if key.startswith(b"cache:item:1:"))]
+    await worker_a.close()
+    await worker_b.close()
+
+
+async def test_unavailable_backend_falls_back_to_compute():
+    cache = Cache(RedisCacheBackend("redis://127.0.0.1:1/0", timeout=0.5))
+    compute = Counter()
+
+    assert await cache.get_or_compute("item:1", compute, Item) == Item(id=1, name="first")
+    await cache.invalidate_tags("items")
+    assert cache.errors == 2
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.single_flight import SingleFlight
+from src.models.models import Post, User
+from src.repositories.comment.repository_comment_postgres import RepositoryCommentPostgres
+from src.schemas.comment import CommentIn, CommentOut, CommentSummaryOut
+from src.services.use_cases_comment import UseCasesComment
+
+
+@pytest.fixture
+async def post(session: AsyncSession) -> Post:
+    post = Post(
+        title="a", content="x", user=User(id=1, username="ana", fullname="Ana", email="ana@x.com", password="x")
+    )
+    session.add(post)
+    await session.commit()
+    await RepositoryCommentPostgres(session).create(CommentIn(content="hola"), user_id=1, post_id=post.id)
+    return post
+
+
+async def test_concurrent_reads_share_one_query_and_return_read_models(engine, post: Post):
+    reads = SingleFlight()
+
+    # Cada petición con su propia sesión sobre la misma base de datos
+    async def read(get):
+        async with AsyncSession(engine) as session:
+            return await get(UseCasesComment(RepositoryCommentPostgres(session), reads=reads))
+
+    pages = await asyncio.gather(*[read(lambda use_cases: use_cases.get_all_comments(post.id)) for _ in range(5)])
+    assert reads.coalesced == 4
+    comments, total, count = pages[0]
+    assert all(page == pages[0] for page in pages)
+    assert (type(comments[0]), comments[0].content, total, count) == (CommentOut, "hola", 1, "exact")
+
+    assert await read(lambda use_cases: use_cases.get_comment_out(comments[0].id)) == comments[0]
+    summaries, total, has_more = await read(lambda use_cases: use_cases.get_user_comments(1, summary=True))
+    assert (type(summaries[0]), total, has_more) == (CommentSummaryOut, 1, False)
+
+
+async def test_comment_writes_forget_reads_in_flight(engine, session: AsyncSession, post: Post):
+    reads = SingleFlight()
+
+    # Una lectura de la página que empezó antes del comentario, con su propia sesión
+    release = asyncio.Event()
+    async with AsyncSession(engine) as reader:
+        stale = RepositoryCommentPostgres(reader)
+        get_all = stale.get_all
+
+        async def wait_and_get(*args):
+            await release.wait()
+            return await get_all(*args)
+
+        stale.get_all = wait_and_get
+        in_flight = asyncio.create_task(UseCasesComment(stale, reads=reads).get_all_comments(post.id))
+        await asyncio.sleep(0)
+
+        use_cases = UseCasesComment(RepositoryCommentPostgres(session), reads=reads)
+        await use_cases.create_comment(CommentIn(content="adiós"), user_id=1, post_id=post.id)
+
+        # La lectura posterior no se une a la que ya estaba en curso
+        comments, total, _ = await asyncio.wait_for(use_cases.get_all_comments(post.id), 1)
+        assert ([comment.content for comment in comments], total) == (["hola", "adiós"], 2)
+        release.set()
+        await in_flight
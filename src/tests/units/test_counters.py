@@ -0,0 +1,106 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Post, Tag, User
+from src.repositories.comment.repository_comment_postgres import RepositoryCommentPostgres
+from src.repositories.exceptions import RepositoryNotFoundException
+from src.repositories.post.repository_post_postgres import RepositoryPostPostgres
+from src.repositories.tag.repository_tag_postgres import RepositoryTagPostgres
+from src.schemas.comment import CommentIn
+from src.schemas.post import PostIn, PostPut
+
+
+@pytest.fixture
+async def user(session: AsyncSession) -> User:
+    user = User(id=1, username="ana", fullname="Ana", email="ana@x.com", password="x")
+    session.add(user)
+    await session.commit()
+    return user
+
+
+async def post_counts(session: AsyncSession) -> dict[str, int]:
+    tags = await session.execute(select(Tag.name, Tag.post_count).execution_options(populate_existing=True))
+    return dict(tags.all())
+
+
+async def user_counts(session: AsyncSession) -> tuple[int, int]:
+    user = await session.get(User, 1, populate_existing=True)
+    return user.post_count, user.comment_count
+
+
+async def test_post_writes_keep_tag_and_user_counters(session: AsyncSession, user: User):
+    posts = RepositoryPostPostgres(session)
+    first = await posts.create(PostIn(title="a", content="x", tags=["python", "sql"]), user_id=1)
+    await posts.create(PostIn(title="b", content="x", tags=["python"]), user_id=1)
+    assert await post_counts(session) == {"python": 2, "sql": 1}
+    assert await user_counts(session) == (2, 0)
+
+    # Cambiar las tags suma y resta sólo la diferencia
+    await posts.update(first.id, PostPut(tags=["sql", "go"]), user_id=1)
+    assert await post_counts(session) == {"python": 1, "sql": 1, "go": 1}
+
+    await posts.delete(first.id, user_id=1)
+    assert await post_counts(session) == {"python": 1, "sql": 0, "go": 0}
+    assert await user_counts(session) == (1, 0)
+
+    # Un segundo borrado no encuentra el post sin eliminar y no vuelve a restar
+    with pytest.raises(RepositoryNotFoundException):
+        await posts.delete(first.id, user_id=1)
+    assert await post_counts(session) == {"python": 1, "sql": 0, "go": 0}
+    assert await user_counts(session) == (1, 0)
+
+
+async def test_comment_writes_keep_post_and_user_counters(session: AsyncSession, user: User):
+    post = await RepositoryPostPostgres(session).create(PostIn(title="a", content="x"), user_id=1)
+    comments = RepositoryCommentPostgres(session)
+    comment = await comments.create(CommentIn(content="hola"), user_id=1, post_id=post.id)
+    await comments.create(CommentIn(content="adiós"), user_id=1, post_id=post.id)
+    assert (await session.get(Post, post.id, populate_existing=True)).comment_count == 2
+    assert await user_counts(session) == (1, 2)
+
+    deleted = await comments.delete(comment.id, user_id=1)
+    assert deleted.post_id == post.id
+    with pytest.raises(RepositoryNotFoundException):
+        await comments.delete(comment.id, user_id=1)
+    assert (await session.get(Post, post.id, populate_existing=True)).comment_count == 1
+    assert await user_counts(session) == (1, 1)
+
+
+async def test_deleted_tag_is_restored_without_posts(session: AsyncSession, user: User):
+    posts = RepositoryPostPostgres(session)
+    await posts.create(PostIn(title="a", content="x", tags=["python"]), user_id=1)
+    tag_id = await session.scalar(select(Tag.id).where(Tag.name == "python"))
+
+    await RepositoryTagPostgres(session).delete(tag_id, user_id=1)
+    assert await post_counts(session) == {"python": 0}
+
+    # Usar de nuevo el nombre restaura la tag con el post que la usa ahora
+    await posts.create(PostIn(title="b", content="x", tags=["python"]), user_id=1)
+    assert await post_counts(session) == {"python": 1}
+
+
+async def test_counters_do_not_touch_updated_at(session: AsyncSession, user: User):
+    posts = RepositoryPostPostgres(session)
+    post = await posts.create(PostIn(title="a", content="x", tags=["python"]), user_id=1)
+    edited = datetime(2020, 1, 1)
+    await session.execute(update(Post).values(updated_at=edited).execution_options(synchronize_session=False))
+    await session.execute(update(Tag).values(updated_at=edited).execution_options(synchronize_session=False))
+    await session.commit()
+
+    # Comentar no edita el post, y publicar o borrar otro post con la tag no edita la tag
+    await RepositoryCommentPostgres(session).create(CommentIn(content="hola"), user_id=1, post_id=post.id)
+    other = await posts.create(PostIn(title="b", content="x", tags=["python"]), user_id=1)
+    await posts.delete(other.id, user_id=1)
+
+    assert (await session.get(Post, post.id, populate_existing=True)).updated_at == edited
+    assert (await session.scalar(select(Tag).execution_options(populate_existing=True))).updated_at == edited
+    assert await post_counts(session) == {"python": 1}
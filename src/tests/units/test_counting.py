@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy import Column, Integer, MetaData, Table, select, text
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from repositories.counting import count_cache, count_rows, driver_statement, invalidate_counts
+from src.models.models import Post, User
+from src.repositories.post.repository_post_postgres import RepositoryPostPostgres, tag_criteria
+from src.schemas.post import PostIn
+
+metadata = MetaData()
+item = Table("item", metadata, Column("id", Integer, primary_key=True), Column("group_id", Integer, index=True))
+
+
+@pytest.fixture
+async def items(engine, session: AsyncSession):
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(item.insert(), [{"group_id": i % 2} for i in range(10)])
+    yield session
+    count_cache.clear()
+
+
+async def test_exact_count_is_cached_until_invalidated(items: AsyncSession):
+    query = select(item.c.id)
+    assert await count_rows(items, query, "exact", ("items",), "ix_item_group_id") == (10, "exact")
+    await items.execute(item.insert().values(group_id=1))
+    assert await count_rows(items, query, "exact", ("items",), "ix_item_group_id") == (10, "exact")
+    invalidate_counts("items")
+    assert await count_rows(items, query, "exact", ("items",), "ix_item_group_id") == (11, "exact")
+
+
+async def test_estimate_uses_sqlite_stat1_and_falls_back_to_exact(items: AsyncSession):
+    query = select(item.c.id).where(item.c.group_id == 0)
+    # Sin ANALYZE no hay estadísticas: se cuenta
+    assert await count_rows(items, query, "estimate", ("items", 0), "ix_item_group_id", 1) == (5, "exact")
+    await items.execute(text("ANALYZE"))
+    assert await count_rows(items, query, "estimate", ("items", 0), "ix_item_group_id") == (10, "estimate")
+    assert await count_rows(items, query, "estimate", ("items", 0), "ix_item_group_id", 1) == (5, "estimate")
+
+
+async def test_none_skips_the_count(items: AsyncSession):
+    assert await count_rows(items, select(item.c.id), "none", ("items",), "ix_item_group_id") == (None, "none")
+
+
+async def test_driver_statement_binds_values_with_colons(session: AsyncSession):
+    # Tags con ":nombre" no se confunden con parámetros al preparar el EXPLAIN de PostgreSQL
+    query = select(Post.id).where(*tag_criteria([":x", "a :b"], "all", exclude=["c++ :y"]))
+    sql, params = driver_statement(query, asyncpg.dialect())
+    assert ":x" not in sql and ":y" not in sql
+    assert params == (2, ":x", "a :b", "c++ :y")
+
+    # El mismo SQL del driver se ejecuta tal cual
+    session.add(User(id=1, username="ana", fullname="Ana", email="ana@x.com", password="x"))
+    await session.commit()
+    post = await RepositoryPostPostgres(session).create(PostIn(title="a", content="x", tags=[":x"]), user_id=1)
+    sql, params = driver_statement(select(Post.id).where(*tag_criteria([":x"])), session.bind.dialect)
+    connection = await session.connection()
+    assert (await connection.exec_driver_sql(sql, params)).scalars().all() == [post.id]
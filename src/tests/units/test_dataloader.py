@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from core.dataloader import DataLoader
+
+
+class Source:
+    def __init__(self, fail: bool = False):
+        self.batches: list[list[int]] = []
+        self.fail = fail
+
+    async def __call__(self, keys: list[int]) -> dict[int, str]:
+        self.batches.append(keys)
+        if self.fail:
+            raise ValueError("boom")
+        return {key: f"value {key}" for key in keys if key != 0}
+
+
+async def test_loads_in_the_same_tick_are_batched_and_deduplicated():
+    source = Source()
+    loader = DataLoader(source)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load_many([3, 2]))
+
+    assert results == ["value 1", "value 2", "value 1", ["value 3", "value 2"]]
+    assert source.batches == [[1, 2, 3]]
+    assert await loader.load(2) == "value 2"
+    assert loader.batches == 1
+
+
+async def test_missing_keys_use_the_default():
+    loader = DataLoader(Source(), default=list)
+    assert await loader.load_many([0, 1]) == [[], "value 1"]
+
+
+async def test_max_batch_size():
+    source = Source()
+    loader = DataLoader(source, max_batch_size=2)
+    await loader.load_many([1, 2, 3])
+    assert source.batches == [[1, 2], [3]]
+
+
+async def test_errors_are_not_cached():
+    source = Source(fail=True)
+    loader = DataLoader(source)
+    with pytest.raises(ValueError):
+        await loader.load_many([1, 2])
+
+    source.fail = False
+    assert await loader.load(1) == "value 1"
+    assert source.batches == [[1, 2], [1]]
+
+
+async def test_prime():
+    source = Source()
+    loader = DataLoader(source)
+    loader.prime(1, "primed")
+    assert await loader.load_many([1, 2]) == ["primed", "value 2"]
+    assert source.batches == [[2]]
@@ -0,0 +1,55 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from core.executor import BoundedExecutor, ExecutorSaturatedException
+
+
+async def test_run_returns_result():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    assert await executor.run(pow, 2, 10) == 1024
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+
+async def test_rejects_when_saturated():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ExecutorSaturatedException):
+        await executor.run(release.wait)
+    assert executor.stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(*running)
+    assert executor.stats()["pending"] == 0
+    executor.shutdown()
+
+
+async def test_cancelled_call_stays_pending_until_its_thread_finishes():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = asyncio.create_task(executor.run(release.wait))
+    queued = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.01)
+    running.cancel()
+    queued.cancel()
+    await asyncio.gather(running, queued, return_exceptions=True)
+    # El hilo sigue ocupado; la tarea en cola se descarta sin ejecutarse ni contar como completada
+    assert (executor.stats()["pending"], executor.stats()["completed"]) == (1, 0)
+
+    release.set()
+    for _ in range(100):
+        if executor.stats()["pending"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert (executor.stats()["pending"], executor.stats()["completed"]) == (0, 1)
+    executor.shutdown()
@@ -0,0 +1,66 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import repositories.feed.repository_feed_postgres as feed_module
+from src.models.models import Post, Tag, User, association_table
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def read_all(repository: feed_module.RepositoryFeedPostgres, user_id: int, size: int) -> list[str]:
+    titles, after = [], None
+    while True:
+        posts, has_more = await repository.get_feed(user_id, size, after)
+        titles += [post.title for post in posts]
+        if not has_more:
+            return titles
+        after = (posts[-1].created_at, posts[-1].id)
+
+
+async def build_feed(session: AsyncSession, monkeypatch, max_followers: int) -> list[list[str]]:
+    monkeypatch.setattr(feed_module, "FEED_FANOUT_MAX_FOLLOWERS", max_followers)
+    session.add_all(
+        [
+            User(id=id, username=name, fullname=name, email=f"{name}@x.com", password="x")
+            for id, name in ((1, "ana"), (2, "bob"), (3, "eva"))
+        ]
+    )
+    session.add(Tag(id=1, name="python", user_id=3))
+    await session.flush()
+    repository = feed_module.RepositoryFeedPostgres(session)
+
+    def publish(id: int, user_id: int, minutes: int) -> Post:
+        return Post(id=id, title=f"p{id}", content="x", user_id=user_id, created_at=START + timedelta(minutes=minutes))
+
+    session.add_all([publish(1, 2, 1), publish(2, 3, 2)])
+    await session.flush()
+    await session.execute(association_table.insert().values(post_id=2, tag_id=1))
+    await session.commit()
+
+    await repository.follow_user(1, 2)
+    await repository.follow_tag(1, 1)
+    await repository.follow_user(1, 2)
+    session.add_all([publish(3, 1, 3), publish(4, 2, 4), publish(5, 3, 5)])
+    await session.commit()
+    await repository.fan_out([3, 4, 5])
+
+    followed = await read_all(repository, 1, 2)
+    await repository.unfollow_user(1, 2)
+    unfollowed = await read_all(repository, 1, 10)
+    followers = (await session.get(User, 2, populate_existing=True)).follower_count
+    return [followed, unfollowed, [str(followers)]]
+
+
+async def test_feed_is_materialized_on_write(session: AsyncSession, monkeypatch):
+    # p5 (eva, sin la tag) no está en el feed de ana: no la sigue
+    assert await build_feed(session, monkeypatch, max_followers=10) == [["p4", "p3", "p2", "p1"], ["p3", "p2"], ["0"]]
+
+
+async def test_feed_merges_high_follower_sources_on_read(session: AsyncSession, monkeypatch):
+    assert await build_feed(session, monkeypatch, max_followers=0) == [["p4", "p3", "p2", "p1"], ["p3", "p2"], ["0"]]
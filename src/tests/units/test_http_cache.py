@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from core.http_cache import ResponseCache
+
+
+def test_etag_depends_on_url_database_and_watermarks():
+    etag = ResponseCache.etag("/posts/", "primary", (("2024-01-01", 3, 3),))
+    assert etag.startswith('W/"')
+    assert etag == ResponseCache.etag("/posts/", "primary", (("2024-01-01", 3, 3),))
+    assert etag != ResponseCache.etag("/posts/?page=2", "primary", (("2024-01-01", 3, 3),))
+    assert etag != ResponseCache.etag("/posts/", "primary", (("2024-01-01", 4, 4),))
+    # Lo leído de una réplica no se confunde con lo leído del primario
+    assert etag != ResponseCache.etag("/posts/", "replica", (("2024-01-01", 3, 3),))
+
+
+def test_invalidate_drops_bodies_of_the_resource():
+    cache = ResponseCache(maxsize=10, ttl=60, max_body_bytes=100)
+    cache.set_body(("posts", "tags"), "/posts/", "a", b"posts")
+    cache.set_body(("tags",), "/tags/", "b", b"tags")
+    cache.set_body(("comments",), "/comments/", "c", b"comments")
+    cache.watermarks.set(("primary", "tags"), (None, 1))
+    cache.watermarks.set(("replica", "tags"), (None, 1))
+    cache.watermarks.set(("replica", "posts"), (None, 1))
+
+    cache.invalidate("tags")
+
+    assert cache.get_body(("posts", "tags"), "/posts/", "a") is None
+    assert cache.get_body(("tags",), "/tags/", "b") is None
+    assert cache.get_body(("comments",), "/comments/", "c") == b"comments"
+    assert cache.watermarks.get(("primary", "tags")) is None
+    assert cache.watermarks.get(("replica", "tags")) is None
+    assert cache.watermarks.get(("replica", "posts")) == (None, 1)
+    assert cache.generations == {"tags": 1}
+
+
+def test_large_bodies_are_not_stored():
+    cache = ResponseCache(maxsize=10, ttl=60, max_body_bytes=4)
+    cache.set_body(("tags",), "/tags/", "a", b"12345")
+    assert cache.get_body(("tags",), "/tags/", "a") is None
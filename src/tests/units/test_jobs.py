@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.jobs import JobQueue, retry_delay
+from src.models.models import background_job_table
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+def make_queue(engine, clock: Clock, **options) -> JobQueue:
+    return JobQueue(async_sessionmaker(engine, class_=AsyncSession), clock=clock, **options)
+
+
+def test_retry_delay_doubles_up_to_the_maximum():
+    assert [retry_delay(attempts, 1, 5) for attempts in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+async def test_failed_job_is_retried_with_backoff_until_it_succeeds(engine, clock: Clock):
+    queue = make_queue(engine, clock, retry_base=10)
+    calls = []
+
+    @queue.handler("flaky")
+    async def flaky(session, payload):
+        calls.append(payload["n"])
+        if len(calls) < 3:
+            raise RuntimeError("boom")
+
+    await queue.enqueue("flaky", {"n": 1})
+    assert (await queue.depth())["due"] == 1
+    await queue._run(*await queue._claim())
+    # Hasta que pasa la espera no se puede reclamar otra vez
+    assert await queue._claim() is None
+    clock.now += timedelta(seconds=10)
+    assert (await queue.depth())["lag_seconds"] == 0
+    await queue._run(*await queue._claim())
+    clock.now += timedelta(seconds=20)
+    await queue._run(*await queue._claim())
+    assert (await queue.depth())["pending"] == 0
+    assert queue.stats()["retried"] == 2 and queue.stats()["succeeded"] == 1
+    assert calls == [1, 1, 1]
+
+
+async def test_job_fails_after_max_attempts_and_keeps_the_error(engine, clock: Clock):
+    queue = make_queue(engine, clock, max_attempts=2, retry_base=0)
+
+    @queue.handler("broken")
+    async def broken(session, payload):
+        raise ValueError("bad payload")
+
+    await queue.enqueue("broken", {})
+    for _ in range(2):
+        await queue._run(*await queue._claim())
+    depth = await queue.depth()
+    assert (depth["pending"], depth["failed"]) == (0, 1)
+    async with queue.sessionmaker() as session:
+        job = (await session.execute(background_job_table.select())).one()
+    assert job.status == "failed" and job.attempts == 2 and "bad payload" in job.last_error
+
+
+async def test_job_abandoned_by_a_worker_is_claimed_again_after_the_lock_timeout(engine, clock: Clock):
+    queue = make_queue(engine, clock, lock_timeout=60)
+    queue.handler("noop")(lambda session, payload: asyncio.sleep(0))
+    await queue.enqueue("noop", {})
+    assert await queue._claim() is not None
+    assert await queue._claim() is None
+    clock.now += timedelta(seconds=61)
+    assert (await queue._claim())[3] == 2
+
+
+async def test_workers_run_enqueued_jobs(engine, clock: Clock):
+    queue = make_queue(engine, clock, workers=2, poll_interval=5)
+    done = []
+    queue.handler("record")(lambda session, payload: asyncio.sleep(0, done.append(payload["n"])))
+    queue.start()
+    for n in range(5):
+        await queue.enqueue("record", {"n": n})
+    for _ in range(100):
+        if len(done) == 5:
+            break
+        await asyncio.sleep(0.01)
+    await queue.stop()
+    assert sorted(done) == [0, 1, 2, 3, 4]
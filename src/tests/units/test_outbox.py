@@ -0,0 +1,61 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.notifier import Notifier
+from src.models.models import outbox_table
+from src.repositories.outbox import RepositoryOutboxPostgres, outbox_notifier, record_events
+
+
+async def test_notifier_does_not_lose_a_notification_between_read_and_wait():
+    notifier = Notifier()
+    version = notifier.version
+    notifier.notify()
+    assert await notifier.wait(10, version) is True
+    assert await notifier.wait(0.01, notifier.version) is False
+    waiter = asyncio.create_task(notifier.wait(10, notifier.version))
+    await asyncio.sleep(0)
+    notifier.notify()
+    assert await waiter is True
+
+
+async def test_events_are_committed_with_the_transaction_and_read_in_order(session: AsyncSession):
+    version = outbox_notifier.version
+    await record_events(session, "post", "created", [(1, {"title": "a"})])
+    await session.rollback()
+    assert outbox_notifier.version == version
+
+    await record_events(session, "post", "created", [(1, {"title": "a"}), (2, {"title": "b"})])
+    await record_events(session, "tag", "deleted", [(7, {"name": "x"})])
+    await session.commit()
+    assert outbox_notifier.version == version + 1
+
+    repository = RepositoryOutboxPostgres(session)
+    events = await repository.get_after(0, 10)
+    assert [(event.entity, event.entity_id, event.action) for event in events] == [
+        ("post", 1, "created"),
+        ("post", 2, "created"),
+        ("tag", 7, "deleted"),
+    ]
+    assert [event.id for event in await repository.get_after(events[0].id, 1)] == [events[1].id]
+
+
+async def test_reading_skips_the_ids_of_rolled_back_transactions(session: AsyncSession):
+    now = datetime.now(timezone.utc)
+
+    def event(id: int) -> dict:
+        return {"id": id, "entity": "post", "entity_id": id, "action": "created", "data": {}, "created_at": now}
+
+    # Los ids se confirman en orden: el 2 que falta es de una transacción descartada
+    await session.execute(insert(outbox_table), [event(1), event(3)])
+    await session.commit()
+    repository = RepositoryOutboxPostgres(session)
+    assert [row.id for row in await repository.get_after(0, 10)] == [1, 3]
+    assert [row.id for row in await repository.get_after(1, 10)] == [3]
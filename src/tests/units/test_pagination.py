@@ -0,0 +1,29 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from schemas.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 11, 3, 10, 0, 0, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 146)
+    assert decode_cursor(cursor, datetime, int) == (created_at, 146)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2025, 11, 3, 10, 0, 0), 146)
+    assert "=" not in cursor
+    assert "/" not in cursor
+    assert "+" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["zzz", "", encode_cursor(1), encode_cursor("not a date", 1)])
+def test_invalid_cursor(cursor: str):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, datetime, int)
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+from typing import Awaitable, Callable, TypeVar
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import Cache, MemoryCacheBackend
+from src.models.models import User
+from src.repositories.comment.repository_comment_postgres import RepositoryCommentPostgres
+from src.repositories.post.repository_post_postgres import RepositoryPostPostgres
+from src.schemas.comment import CommentIn
+from src.schemas.post import PostDetailOut, PostIn
+from src.services.use_cases_comment import UseCasesComment
+from src.services.use_cases_post import UseCasesPost
+
+T = TypeVar("T")
+
+
+@pytest.fixture
+async def users(session: AsyncSession) -> list[User]:
+    users = [
+        User(id=1, username="ana", fullname="Ana", email="ana@x.com", password="x"),
+        User(id=2, username="bea", fullname="Bea", email="bea@x.com", password="x"),
+    ]
+    session.add_all(users)
+    await session.commit()
+    return users
+
+
+async def test_detail_embeds_latest_comments_with_total_and_authors(session: AsyncSession, users: list[User]):
+    post = await RepositoryPostPostgres(session).create(PostIn(title="a", content="x", tags=["python"]), user_id=1)
+    comments = RepositoryCommentPostgres(session)
+    for number in range(5):
+        await comments.create(CommentIn(content=f"c{number}"), user_id=1 + number % 2, post_id=post.id)
+
+    detail = await UseCasesPost(RepositoryPostPostgres(session)).get_post_with_comments(post.id, comments_size=2)
+
+    assert detail.author.username == "ana"
+    assert [tag.name for tag in detail.tags] == ["python"]
+    # La página son los más recientes; el total cuenta todos, no sólo los de la página
+    assert [comment.content for comment in detail.comments.items] == ["c4", "c3"]
+    assert [comment.user.username for comment in detail.comments.items] == ["ana", "bea"]
+    assert (detail.comments.total, detail.comments.size, detail.comments.pages) == (5, 2, 3)
+
+
+async def test_detail_without_comments(session: AsyncSession, users: list[User]):
+    post = await RepositoryPostPostgres(session).create(PostIn(title="a", content="x"), user_id=2)
+
+    detail = await UseCasesPost(RepositoryPostPostgres(session)).get_post_with_comments(post.id)
+
+    assert detail.author.username == "bea"
+    assert detail.comments.items == []
+    assert (detail.comments.total, detail.comments.pages) == (0, 0)
+
+
+async def test_comment_writes_invalidate_post_reads(engine, session: AsyncSession, users: list[User]):
+    post = await RepositoryPostPostgres(session).create(PostIn(title="a", content="x"), user_id=1)
+    cache = Cache(MemoryCacheBackend(maxsize=10, ttl=60))
+    use_cases_comment = UseCasesComment(RepositoryCommentPostgres(session), cache=cache)
+
+    # Cada lectura con su propia sesión, como cada petición
+    async def read(get: Callable[[UseCasesPost], Awaitable[T]]) -> T:
+        async with AsyncSession(engine) as reader:
+            return await get(UseCasesPost(RepositoryPostPostgres(reader), cache=cache))
+
+    assert (await read(lambda use_cases: use_cases.get_cached_post(post.id))).comment_count == 0
+
+    # Una lectura del detalle que empezó antes del comentario
+    release = asyncio.Event()
+
+    async def blocked(use_cases: UseCasesPost) -> PostDetailOut:
+        get_by_id_with_comments = use_cases.repository.get_by_id_with_comments
+
+        async def wait_and_get(id: int, comments_size: int):
+            await release.wait()
+            return await get_by_id_with_comments(id, comments_size)
+
+        use_cases.repository.get_by_id_with_comments = wait_and_get
+        return await use_cases.get_post_with_comments(post.id)
+
+    in_flight = asyncio.create_task(read(blocked))
+    await asyncio.sleep(0)
+
+    await use_cases_comment.create_comment(CommentIn(content="hola"), user_id=2, post_id=post.id)
+
+    # Las lecturas posteriores no se unen a la que ya estaba en curso ni usan la entrada cacheada
+    detail = await asyncio.wait_for(read(lambda use_cases: use_cases.get_post_with_comments(post.id)), 1)
+    assert [comment.content for comment in detail.comments.items] == ["hola"]
+    assert detail.comment_count == 1
+    assert (await read(lambda use_cases: use_cases.get_cached_post(post.id))).comment_count == 1
+    release.set()
+    await in_flight
@@ -0,0 +1,45 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.exceptions import RepositoryException
+from repositories.post.post_search import MARK_END, MARK_START, PostSearchIndex, fts5_query, highlight, SQLITE_DDL
+
+
+def test_fts5_query_quotes_every_term():
+    assert fts5_query('python AND "x" (NEAR') == '"python" "AND" "x" "NEAR"'
+    assert fts5_query('" - *') is None
+
+
+def test_highlight_escapes_the_content():
+    assert highlight(f"<b>{MARK_START}python{MARK_END}</b>") == "&lt;b&gt;<mark>python</mark>&lt;/b&gt;"
+
+
+def test_unsupported_dialect_fails_on_creation():
+    session = SimpleNamespace(bind=SimpleNamespace(dialect=mysql.dialect()))
+    with pytest.raises(RepositoryException, match="not available for mysql"):
+        PostSearchIndex(session)
+
+
+async def test_sqlite_search_ranks_and_paginates(session: AsyncSession):
+    for statement in SQLITE_DDL:
+        await session.execute(text(statement))
+    index = PostSearchIndex(session)
+    await index.index([(1, "Recetas", "python"), (2, "Python", "python python"), (3, "Otro", "nada")])
+    await index.index([(3, "Otro", "python al final")])
+    await index.remove([1])
+
+    first = await index.search("python", 1)
+    assert [hit.id for hit in first] == [2]
+    assert "<mark>python</mark>" in first[0].snippet
+    rest = await index.search("python", 10, (first[0].rank, first[0].id))
+    assert [hit.id for hit in rest] == [3]
@@ -0,0 +1,42 @@
+import os
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from core.prefix_index import PrefixIndex, RefreshingPrefixIndex
+
+
+def test_search_is_case_insensitive_and_sorted():
+    index = PrefixIndex([("Python", 1), ("pytest", 2), ("Rust", 3), ("py", 4)])
+    assert index.search("PY", 10) == [("py", 4), ("pytest", 2), ("Python", 1)]
+    assert index.search("py", 2) == [("py", 4), ("pytest", 2)]
+    assert index.search("go", 10) == []
+
+
+async def test_reloads_after_invalidate_or_ttl():
+    now = [0.0]
+    index: RefreshingPrefixIndex[int] = RefreshingPrefixIndex(max_entries=10, ttl=30, clock=lambda: now[0])
+    names = [("python", 1)]
+
+    async def load(limit: int):
+        return list(names)
+
+    assert (await index.get(load)).search("p", 10) == [("python", 1)]
+    names.append(("pytest", 2))
+    assert len(await index.get(load)) == 1
+    index.invalidate()
+    assert len(await index.get(load)) == 2
+    names.append(("pydantic", 3))
+    now[0] = 31
+    assert len(await index.get(load)) == 3
+    assert index.loads == 3
+
+
+async def test_too_many_entries_disables_the_index():
+    index: RefreshingPrefixIndex[int] = RefreshingPrefixIndex(max_entries=1, ttl=30)
+
+    async def load(limit: int):
+        return [("a", 1), ("b", 2)][:limit]
+
+    assert await index.get(load) is None
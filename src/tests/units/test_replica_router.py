@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+
+import pytest  # type: ignore
+from sqlalchemy import text
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from core.database import ReplicaRouter, create_engine_from_url
+
+
+@pytest.fixture
+async def engines():
+    """Dos ficheros SQLite que hacen de primario y réplica"""
+    directory = tempfile.mkdtemp()
+    engines = []
+    for name in ("primary", "replica"):
+        engine = create_engine_from_url(f"sqlite+aiosqlite:///{os.path.join(directory, name)}.db")
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE node (name TEXT)"))
+            await conn.execute(text("INSERT INTO node VALUES (:name)"), {"name": name})
+        engines.append(engine)
+    yield engines
+    for engine in engines:
+        await engine.dispose()
+
+
+async def read_node(router: ReplicaRouter, key: str | None = None) -> str:
+    engine = router.choose_engine(key)
+    async with router.sessionmaker(engine)() as session:
+        return await session.scalar(text("SELECT name FROM node"))
+
+
+async def test_reads_go_to_replica(engines):
+    primary, replica = engines
+    router = ReplicaRouter(primary, [replica])
+    assert await read_node(router) == "replica"
+    assert await read_node(router) == "replica"
+
+
+async def test_without_replicas_reads_go_to_primary(engines):
+    primary, _ = engines
+    router = ReplicaRouter(primary, [])
+    assert await read_node(router) == "primary"
+
+
+async def test_round_robin(engines):
+    primary, replica = engines
+    router = ReplicaRouter(primary, [replica, primary])
+    assert [router.choose_engine() for _ in range(4)] == [replica, primary, replica, primary]
+
+
+async def test_ejected_replica_is_skipped(engines):
+    primary, replica = engines
+    router = ReplicaRouter(primary, [replica], eject_seconds=60)
+    router.eject(replica)
+    assert await read_node(router) == "primary"
+    assert router.stats()["ejected"] == 1
+
+
+async def test_read_your_writes(engines):
+    primary, replica = engines
+    router = ReplicaRouter(primary, [replica], read_your_writes_seconds=60)
+    router.mark_write("Bearer writer")
+    assert await read_node(router, "Bearer writer") == "primary"
+    assert await read_node(router, "Bearer reader") == "replica"
+
+
+async def test_read_your_writes_window_expires(engines):
+    primary, replica = engines
+    now = [0.0]
+    router = ReplicaRouter(primary, [replica], read_your_writes_seconds=5, clock=lambda: now[0])
+    router.mark_write("Bearer writer")
+    now[0] = 4.9
+    assert await read_node(router, "Bearer writer") == "primary"
+    now[0] = 5.1
+    assert await read_node(router, "Bearer writer") == "replica"
+
+
+async def test_replica_sessions_are_marked(engines):
+    primary, replica = engines
+    router = ReplicaRouter(primary, [replica])
+    async with router.sessionmaker(replica)() as session:
+        assert session.info["replica"] is True
+    async with router.sessionmaker(primary)() as session:
+        assert session.info["replica"] is False
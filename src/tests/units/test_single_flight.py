@@ -0,0 +1,83 @@
+import asyncio
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from core.single_flight import SingleFlight
+
+
+async def test_shares_result_and_exception():
+    group = SingleFlight()
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*[group.do("key", fn) for _ in range(5)], return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(group) == 0
+
+
+async def test_waiter_retries_when_leader_is_cancelled():
+    group = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "value"
+
+    leader = asyncio.create_task(group.do("key", slow))
+    await started.wait()
+    waiter = asyncio.create_task(group.do("key", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_counts_coalesced_calls():
+    group = SingleFlight("posts")
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        return 1
+
+    await asyncio.gather(*[group.do("a", fn) for _ in range(3)], group.do("b", fn))
+
+    assert group.stats() == {"in_flight": 0, "calls": 4, "coalesced": 2}
+
+
+async def test_forget_starts_a_new_call():
+    group = SingleFlight()
+    release = asyncio.Event()
+    values = iter(["before write", "after write"])
+
+    async def fn():
+        value = next(values)
+        await release.wait()
+        return value
+
+    first = asyncio.create_task(group.do("key", fn))
+    await asyncio.sleep(0)
+    group.forget()
+    second = asyncio.create_task(group.do("key", fn))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == "before write"
+    assert await second == "after write"
+    assert len(group) == 0
@@ -0,0 +1,46 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from api.streaming import csv_rows, iter_ndjson_lines, ndjson_line, ndjson_rows
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_lines_split_across_chunks():
+    lines = [line async for line in iter_ndjson_lines(chunks(b'{"a": 1}\n{"a"', b": 2}\n\n", b'{"a": 3}'))]
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"a": 2}'), (4, b'{"a": 3}')]
+
+
+async def test_line_too_long():
+    with pytest.raises(ValueError):
+        [line async for line in iter_ndjson_lines(chunks(b"x" * 10, b"x" * 10), max_line_bytes=15)]
+
+
+def test_ndjson_line():
+    assert ndjson_line({"line": 1, "status": "created"}) == b'{"line":1,"status":"created"}\n'
+
+
+async def partitions(*parts: list[dict]):
+    for part in parts:
+        yield part
+
+
+async def test_ndjson_rows():
+    rows = [{"id": 1, "created_at": datetime(2024, 1, 2, 3, 4, 5)}], [{"id": 2, "created_at": None}]
+    body = b"".join([chunk async for chunk in ndjson_rows(partitions(*rows))])
+    assert body == b'{"id":1,"created_at":"2024-01-02T03:04:05"}\n{"id":2,"created_at":null}\n'
+
+
+async def test_csv_rows_header_once():
+    rows = [{"id": 1, "content": 'a,"b"'}], [{"id": 2, "content": "c"}]
+    chunks = [chunk async for chunk in csv_rows(partitions(*rows))]
+    assert chunks == [b'id,content\r\n1,"a,""b"""\r\n', b"2,c\r\n"]
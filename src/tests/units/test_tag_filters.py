@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Post, User
+from src.repositories.counting import count_cache
+from src.repositories.post.repository_post_postgres import RepositoryPostPostgres, tag_criteria
+from src.schemas.post import PostIn
+
+
+@pytest.fixture
+async def posts(session: AsyncSession) -> dict[str, int]:
+    session.add(User(id=1, username="ana", fullname="Ana", email="ana@x.com", password="x"))
+    await session.commit()
+    repository = RepositoryPostPostgres(session)
+    tags = {"p1": ["python", "sql"], "p2": ["python"], "p3": ["sql"], "p4": ["go"], "p5": []}
+    ids = {}
+    for title, names in tags.items():
+        ids[title] = (await repository.create(PostIn(title=title, content="x", tags=names), user_id=1)).id
+    yield ids
+    count_cache.clear()
+
+
+async def titles(session: AsyncSession, *args, **kwargs) -> list[str]:
+    query = select(Post.title).where(*tag_criteria(*args, **kwargs)).order_by(Post.id.desc())
+    return list((await session.scalars(query)).all())
+
+
+async def test_all_requires_every_tag(session: AsyncSession, posts: dict[str, int]):
+    assert await titles(session, ["python", "sql"], "all") == ["p1"]
+    # Los nombres repetidos cuentan una vez
+    assert await titles(session, ["python", "python"], "all") == ["p2", "p1"]
+    # Una tag que no existe no puede estar en ningún post
+    assert await titles(session, ["python", "missing"], "all") == []
+    assert await titles(session, ["missing"], "all") == []
+
+
+async def test_any_and_exclude(session: AsyncSession, posts: dict[str, int]):
+    assert await titles(session, ["python", "sql"], "any") == ["p3", "p2", "p1"]
+    assert await titles(session, ["python", "missing"], "any") == ["p2", "p1"]
+    assert await titles(session, exclude=["python"]) == ["p5", "p4", "p3"]
+    assert await titles(session, ["python", "go"], "any", exclude=["sql"]) == ["p4", "p2"]
+    assert await titles(session, exclude=["missing"]) == ["p5", "p4", "p3", "p2", "p1"]
+
+
+async def test_offset_pages_with_tag_filters(session: AsyncSession, posts: dict[str, int]):
+    repository = RepositoryPostPostgres(session)
+
+    first, total, count = await repository.get_all(1, 2, tags=["python", "sql"], mode="any")
+    assert ([post.title for post in first], total, count) == (["p3", "p2"], 3, "exact")
+    second, total, _ = await repository.get_all(2, 2, tags=["python", "sql"], mode="any")
+    assert ([post.title for post in second], total) == (["p1"], 3)
+
+    # Un filtro sin resultados es una página vacía, no un 404
+    empty, total, _ = await repository.get_all(1, 2, tags=["python", "missing"])
+    assert (empty, total) == ([], 0)
+    excluded, total, _ = await repository.get_all(1, 10, exclude=["python", "go"])
+    assert ([post.title for post in excluded], total) == (["p5", "p3"], 2)
+
+
+async def test_cursor_pages_with_tag_filters(session: AsyncSession, posts: dict[str, int]):
+    repository = RepositoryPostPostgres(session)
+
+    first, total, has_more = await repository.get_all_keyset(2, with_total=True, tags=["python", "sql"], mode="any")
+    assert ([post.title for post in first], total, has_more) == (["p3", "p2"], 3, True)
+    last = first[-1]
+    second, total, has_more = await repository.get_all_keyset(
+        2, (last.created_at, last.id), with_total=True, tags=["python", "sql"], mode="any"
+    )
+    assert ([post.title for post in second], total, has_more) == (["p1"], 3, False)
+
+    only_both, _, has_more = await repository.get_all_keyset(10, tags=["sql", "python"], mode="all", exclude=["go"])
+    assert ([post.title for post in only_both], has_more) == (["p1"], False)
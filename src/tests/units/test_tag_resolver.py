@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import User
+from src.repositories.exceptions import RepositoryAlreadyExistsException
+from src.repositories.outbox import RepositoryOutboxPostgres
+from src.repositories.tag.repository_tag_postgres import RepositoryTagPostgres
+from src.repositories.tag.tag_name_index import tag_name_index
+from src.repositories.tag.tag_resolver import TagResolver
+from src.schemas.tags import TagIn
+
+
+@pytest.fixture
+async def user(session: AsyncSession) -> User:
+    user = User(id=1, username="ana", fullname="Ana", email="ana@x.com", password="x")
+    session.add(user)
+    await session.commit()
+    return user
+
+
+async def test_tag_names_are_invalidated_after_commit(session: AsyncSession, user: User):
+    tags = RepositoryTagPostgres(session)
+    await tag_name_index.get(tags.get_names)
+
+    # Antes del commit una recarga no vería la tag nueva: el índice sigue vigente
+    await TagResolver(session).resolve(["go"], user_id=1)
+    assert tag_name_index.stats()["fresh"]
+    await session.commit()
+    assert not tag_name_index.stats()["fresh"]
+    assert [name for name, _ in (await tag_name_index.get(tags.get_names)).search("g", 10)] == ["go"]
+
+    # Lo descartado no invalida
+    await TagResolver(session).resolve(["rust"], user_id=1)
+    await session.rollback()
+    assert tag_name_index.stats()["fresh"]
+
+
+async def test_create_revives_a_deleted_tag_and_rejects_an_active_one(session: AsyncSession, user: User):
+    tags = RepositoryTagPostgres(session)
+    tag_id = (await tags.create(TagIn(name="python"), user_id=1)).id
+    with pytest.raises(RepositoryAlreadyExistsException):
+        await tags.create(TagIn(name="python"), user_id=1)
+
+    await tags.delete(tag_id, user_id=1)
+    await tag_name_index.get(tags.get_names)
+    revived = await tags.create(TagIn(name="python"), user_id=1)
+
+    assert revived.id == tag_id and revived.deleted_at is None
+    assert [name for name, _ in (await tag_name_index.get(tags.get_names)).search("py", 10)] == ["python"]
+    events = await RepositoryOutboxPostgres(session).get_after(0, 10)
+    assert [(event.entity_id, event.action) for event in events] == [
+        (tag_id, "created"),
+        (tag_id, "deleted"),
+        (tag_id, "restored"),
+    ]
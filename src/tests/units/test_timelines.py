@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest  # type: ignore
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from sqlalchemy import inspect, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import User
+from src.repositories.comment.repository_comment_postgres import RepositoryCommentPostgres
+from src.repositories.exceptions import RepositoryNotFoundException
+from src.repositories.post.repository_post_postgres import RepositoryPostPostgres
+from src.schemas.comment import CommentIn
+from src.schemas.post import PostIn
+
+
+@pytest.fixture
+async def timeline(engine, session: AsyncSession):
+    session.add_all(
+        [
+            User(id=1, username="ana", fullname="Ana", email="ana@x.com", password="x"),
+            User(id=2, username="bea", fullname="Bea", email="bea@x.com", password="x"),
+        ]
+    )
+    await session.commit()
+    posts = RepositoryPostPostgres(session)
+    comments = RepositoryCommentPostgres(session)
+    for number in range(3):
+        post = await posts.create(PostIn(title=f"p{number}", content="x", tags=["python"]), user_id=1)
+        await comments.create(CommentIn(content=f"c{number}"), user_id=1, post_id=post.id)
+    other = await posts.create(PostIn(title="other", content="x"), user_id=2)
+    await comments.create(CommentIn(content="other"), user_id=2, post_id=other.id)
+    await posts.delete(post.id, user_id=1)
+
+    # Las lecturas con otra sesión, sin los objetos que dejaron las escrituras en el mapa de identidad
+    async with AsyncSession(engine) as reader:
+        yield reader
+
+
+async def test_user_posts_pages_by_cursor(timeline: AsyncSession):
+    posts = RepositoryPostPostgres(timeline)
+
+    first, total, has_more = await posts.get_by_user_keyset(1, 1)
+    assert ([post.title for post in first], total, has_more) == (["p1"], 2, True)
+    assert first[0].user.username == "ana"
+    assert [tag.name for tag in first[0].tags] == ["python"]
+
+    second, total, has_more = await posts.get_by_user_keyset(1, 1, (first[0].created_at, first[0].id))
+    assert ([post.title for post in second], total, has_more) == (["p0"], 2, False)
+
+
+async def test_user_comments_pages_by_cursor(timeline: AsyncSession):
+    comments = RepositoryCommentPostgres(timeline)
+
+    first, total, has_more = await comments.get_by_user_keyset(1, 2)
+    assert ([comment.content for comment in first], total, has_more) == (["c2", "c1"], 3, True)
+
+    second, total, has_more = await comments.get_by_user_keyset(1, 2, (first[-1].created_at, first[-1].id))
+    assert ([comment.content for comment in second], total, has_more) == (["c0"], 3, False)
+
+
+async def test_summary_reads_only_the_summary_columns(timeline: AsyncSession):
+    posts, _, _ = await RepositoryPostPostgres(timeline).get_by_user_keyset(1, 10, summary=True)
+    assert [post.title for post in posts] == ["p1", "p0"]
+    assert {"content", "user", "tags"} <= inspect(posts[0]).unloaded
+
+    comments, _, _ = await RepositoryCommentPostgres(timeline).get_by_user_keyset(1, 10, summary=True)
+    assert [comment.post_id for comment in comments] == [3, 2, 1]
+    assert "content" in inspect(comments[0]).unloaded
+
+
+async def test_total_is_the_user_counter(timeline: AsyncSession):
+    # El total no se cuenta en cada página: es el contador del usuario
+    await timeline.execute(update(User).where(User.id == 1).values(post_count=40, comment_count=50))
+
+    _, total, _ = await RepositoryPostPostgres(timeline).get_by_user_keyset(1, 1)
+    assert total == 40
+    _, total, _ = await RepositoryCommentPostgres(timeline).get_by_user_keyset(1, 1)
+    assert total == 50
+
+    with pytest.raises(RepositoryNotFoundException):
+        await RepositoryPostPostgres(timeline).get_by_user_keyset(3, 1)
+    with pytest.raises(RepositoryNotFoundException):
+        await RepositoryCommentPostgres(timeline).get_by_user_keyset(3, 1)